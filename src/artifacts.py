@@ -0,0 +1,96 @@
+"""Compressed, size-capped store of per-run claude output"""
+
+import gzip
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ARTIFACT_SUFFIX = ".log.gz"
+
+
+def new_run_id() -> str:
+    """Sortable, practically unique id for one start attempt"""
+    return time.strftime('%Y%m%d-%H%M%S') + '-' + os.urandom(2).hex()
+
+
+class ArtifactStore:
+    """One gzip file per run holding its metadata, stdout and stderr
+
+    Writing an artifact evicts the oldest ones until the store is back
+    under ``max_bytes``; the artifact just written is always kept.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def path(self, run_id: str) -> Path:
+        return self.directory / f"{run_id}{ARTIFACT_SUFFIX}"
+
+    def save(self, run_id: str, meta: Dict[str, object], stdout: str = "", stderr: str = "") -> Path:
+        """Write the artifact for a run and trim the store"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lines = [f"{key}: {value}" for key, value in meta.items()]
+        lines += ["--- stdout ---", stdout.rstrip("\n"), "--- stderr ---", stderr.rstrip("\n")]
+        path = self.path(run_id)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp_path, 'wt', compresslevel=6) as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+        self.trim(keep=path)
+        return path
+
+    def runs(self) -> List[str]:
+        """Stored run ids, newest first"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted((name[:-len(ARTIFACT_SUFFIX)] for name in names if name.endswith(ARTIFACT_SUFFIX)),
+                      reverse=True)
+
+    def resolve(self, run_id: str) -> Optional[str]:
+        """Full run id for an id or unique prefix of one"""
+        matches = [run for run in self.runs() if run.startswith(run_id)]
+        if run_id in matches:
+            return run_id
+        return matches[0] if len(matches) == 1 else None
+
+    def read(self, run_id: str) -> Optional[str]:
+        """Decompressed artifact text, or None if the run is unknown"""
+        resolved = self.resolve(run_id)
+        if resolved is None:
+            return None
+        try:
+            with gzip.open(self.path(resolved), 'rt') as f:
+                return f.read()
+        except (OSError, EOFError):
+            return None
+
+    def trim(self, keep: Optional[Path] = None) -> int:
+        """Evict the oldest artifacts until under max_bytes; returns bytes freed"""
+        entries = []
+        total = 0
+        for run_id in self.runs():
+            path = self.path(run_id)
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue
+            entries.append((run_id, size, path))
+            total += size
+
+        freed = 0
+        # Run ids sort by time, so the oldest come last in runs()
+        for _, size, path in reversed(entries):
+            if total - freed <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+                freed += size
+            except OSError:
+                pass
+        return freed
@@ -0,0 +1,129 @@
+"""Derive dated window starts from an ICS calendar, re-deriving only changed days"""
+
+import hashlib
+import json
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.ics import iter_events
+from src.logger import get_logger
+from src.session import SESSION_WINDOW_HOURS
+
+Block = Tuple[datetime, datetime]
+
+
+def busy_blocks(lines, start: datetime, end: datetime) -> Dict[date, List[Block]]:
+    """Busy (start, end) blocks per local start day for events overlapping [start, end)
+
+    Cancelled, free (TRANSP:TRANSPARENT) and all-day events are skipped.
+    Modified occurrences (RECURRENCE-ID) replace the occurrence they
+    override wherever they appear in the file. Memory grows with the
+    number of occurrences inside the horizon, not with the file.
+    """
+    occurrences: Dict[Tuple[str, datetime], Optional[Block]] = {}
+    overridden = set()
+    for index, event in enumerate(iter_events(lines)):
+        if event.all_day:
+            continue
+        if event.recurrence_id is not None:
+            key = (event.uid, event.recurrence_id)
+            overridden.add(key)
+            occurrences[key] = None
+            if event.status != 'CANCELLED' and not event.transparent:
+                for block in event.occurrences(start, end):
+                    occurrences[key] = block
+            continue
+        if event.status == 'CANCELLED' or event.transparent:
+            continue
+        for block in event.occurrences(start, end):
+            key = (event.uid or f"#{index}", block[0])
+            if key not in overridden:
+                occurrences[key] = block
+
+    days: Dict[date, List[Block]] = {}
+    for block in occurrences.values():
+        if block is not None and block[0] >= start:
+            days.setdefault(block[0].date(), []).append(block)
+    return days
+
+
+def window_starts(blocks: List[Block], window: timedelta = timedelta(hours=SESSION_WINDOW_HOURS)) -> List[datetime]:
+    """Fewest top-of-the-hour starts whose windows cover every block, greedily"""
+    starts = []
+    covered_until = None
+    for block_start, block_end in sorted(blocks):
+        while covered_until is None or block_end > covered_until:
+            point = block_start if covered_until is None or block_start > covered_until else covered_until
+            start = point.replace(minute=0, second=0, microsecond=0)
+            starts.append(start)
+            covered_until = start + window
+    return starts
+
+
+def day_hash(blocks: List[Block]) -> str:
+    content = "\n".join(f"{s.isoformat()}/{e.isoformat()}" for s, e in sorted(blocks))
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+class CalendarSync:
+    """Keeps per-day window starts derived from a calendar file
+
+    State (``calendar.json``) stores each day's busy-block hash with the
+    starts derived from it, so a re-sync only re-derives days whose events
+    changed and leaves the installed schedule alone when nothing did.
+    """
+
+    def __init__(self, state_path: Path, horizon_days: int = 14,
+                 window_hours: int = SESSION_WINDOW_HOURS):
+        self.logger = get_logger()
+        self.state_path = Path(state_path)
+        self.horizon_days = horizon_days
+        self.window_hours = window_hours
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _save_state(self, state: dict):
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def sync(self, ics_path: Path, now: Optional[datetime] = None) -> Dict[str, object]:
+        """Re-read the calendar; returns entries ('YYYY-MM-DD HH:MM') and change counts"""
+        now = now or datetime.now()
+        horizon_start = datetime.combine(now.date(), datetime.min.time())
+        horizon_end = horizon_start + timedelta(days=self.horizon_days)
+        with open(ics_path, 'r', encoding='utf-8', errors='replace') as f:
+            days = busy_blocks(f, horizon_start, horizon_end)
+
+        state = self._load_state()
+        previous = state.get('days', {}) if state.get('window_hours') == self.window_hours else {}
+        window = timedelta(hours=self.window_hours)
+        derived = {}
+        changed = 0
+        for day in sorted(days):
+            key = day.isoformat()
+            digest = day_hash(days[day])
+            cached = previous.get(key)
+            if cached and cached.get('hash') == digest:
+                derived[key] = cached
+                continue
+            starts = window_starts(days[day], window)
+            derived[key] = {'hash': digest, 'starts': [s.strftime('%Y-%m-%d %H:%M') for s in starts]}
+            changed += 1
+        removed = len([key for key in previous if key not in derived and key >= now.date().isoformat()])
+
+        self._save_state({'source': str(ics_path), 'window_hours': self.window_hours, 'days': derived})
+        entries = [entry for key in sorted(derived) for entry in derived[key]['starts']
+                   if entry > now.strftime('%Y-%m-%d %H:%M')]
+        self.logger.info(f"Calendar sync: {len(days)} busy days, {changed} re-derived, {removed} cleared, "
+                         f"{len(entries)} upcoming starts")
+        return {'entries': entries, 'days': len(days), 'changed': changed, 'removed': removed}
@@ -0,0 +1,116 @@
+"""Find every claude installation and pin the fastest-starting one"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import time
+from typing import Any, Dict, List, Optional
+
+
+def nvm_bin_dirs() -> List[str]:
+    """bin directories of the NVM-managed node versions, in a stable order"""
+    nvm_dir = os.environ.get('NVM_DIR', os.path.expanduser('~/.nvm'))
+    versions_dir = os.path.join(nvm_dir, 'versions', 'node')
+    try:
+        versions = sorted(os.listdir(versions_dir))
+    except OSError:
+        return []
+    return [os.path.join(versions_dir, version, 'bin') for version in versions]
+
+
+def common_bin_dirs() -> List[str]:
+    return ['/usr/local/bin', '/opt/homebrew/bin', os.path.expanduser('~/.local/bin')]
+
+
+def find_candidates() -> List[Dict[str, Optional[str]]]:
+    """Every distinct claude on this machine with the node bin dir it runs under
+
+    The npm-installed claude is a node script, so the node next to it is
+    the one that should run it; a native build has no node of its own.
+    """
+    paths = []
+    on_path = shutil.which('claude')
+    if on_path:
+        paths.append(on_path)
+    for directory in nvm_bin_dirs() + common_bin_dirs():
+        paths.append(os.path.join(directory, 'claude'))
+
+    candidates = []
+    seen = set()
+    for path in paths:
+        if not os.path.isfile(path) or not os.access(path, os.X_OK):
+            continue
+        bin_dir = os.path.dirname(path)
+        node = os.path.join(bin_dir, 'node')
+        node_bin = bin_dir if os.path.exists(node) else None
+        key = (os.path.realpath(path), node_bin and os.path.realpath(node))
+        if key in seen:
+            continue
+        seen.add(key)
+        candidates.append({'claude_path': path, 'node_bin': node_bin})
+    return candidates
+
+
+def fingerprint(candidates: List[Dict[str, Optional[str]]]) -> str:
+    """Hash of the candidate set; changes when an installation is added, removed or upgraded"""
+    digest = hashlib.sha1()
+    for candidate in sorted(candidates, key=lambda c: c['claude_path']):
+        for path in (candidate['claude_path'], candidate['node_bin'] and os.path.join(candidate['node_bin'], 'node')):
+            if not path:
+                continue
+            real = os.path.realpath(path)
+            try:
+                mtime = os.stat(real).st_mtime_ns
+            except OSError:
+                mtime = 0
+            digest.update(f"{path}\0{real}\0{mtime}\n".encode())
+    return digest.hexdigest()
+
+
+def candidate_env(candidate: Dict[str, Optional[str]], base_env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Environment that makes the candidate's own node the first on PATH"""
+    env = dict(base_env if base_env is not None else os.environ)
+    if candidate.get('node_bin'):
+        env['PATH'] = f"{candidate['node_bin']}:{env.get('PATH', '')}"
+    return env
+
+
+def time_candidate(candidate: Dict[str, Optional[str]], runs: int = 3,
+                   timeout: float = 30) -> Optional[float]:
+    """Median wall time of `claude --version`, or None if the candidate is broken"""
+    env = candidate_env(candidate)
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        try:
+            result = subprocess.run([candidate['claude_path'], '--version'], capture_output=True,
+                                    timeout=timeout, env=env)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            return None
+        timings.append(time.perf_counter() - started)
+    import statistics
+    return statistics.median(timings)
+
+
+def calibrate(runs: int = 3, candidates: Optional[List[Dict[str, Optional[str]]]] = None) -> Dict[str, Any]:
+    """Time every candidate and return the pin for the fastest healthy one
+
+    The pin is None when no candidate ran successfully.
+    """
+    candidates = find_candidates() if candidates is None else candidates
+    timings = {}
+    for candidate in candidates:
+        timings[candidate['claude_path']] = time_candidate(candidate, runs=runs)
+
+    healthy = [c for c in candidates if timings[c['claude_path']] is not None]
+    fastest = min(healthy, key=lambda c: timings[c['claude_path']]) if healthy else None
+    return {
+        'claude_path': fastest and fastest['claude_path'],
+        'node_bin': fastest and fastest['node_bin'],
+        'fingerprint': fingerprint(candidates),
+        'timings': timings,
+        'calibrated_at': time.time(),
+    }
@@ -0,0 +1,110 @@
+"""Size-bounded Node compile cache shared by spawned claude processes"""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+# Read by Node >= 22.1 to persist V8 code cache for loaded modules
+NODE_COMPILE_CACHE_ENV = "NODE_COMPILE_CACHE"
+
+KEY_FILE = ".key"
+
+NODE_SCRIPT_SUFFIXES = ('.js', '.mjs', '.cjs')
+
+
+def is_node_script(path: str) -> bool:
+    """Whether path (after symlinks) is run by node rather than a native binary"""
+    real = os.path.realpath(path)
+    if real.endswith(NODE_SCRIPT_SUFFIXES):
+        return True
+    try:
+        with open(real, 'rb') as f:
+            first = f.readline(256)
+    except OSError:
+        return False
+    return first.startswith(b'#!') and b'node' in first
+
+
+def _identity(path: Optional[str]) -> str:
+    """Realpath and mtime of a binary; changes on upgrade or switch"""
+    if not path:
+        return "-"
+    real = os.path.realpath(path)
+    try:
+        mtime = os.stat(real).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return f"{real}\0{mtime}"
+
+
+class CompileCache:
+    """Directory handed to node through NODE_COMPILE_CACHE
+
+    The cache is wiped when the claude or node binary changes, and trimmed
+    back under ``max_bytes`` by evicting the least recently used files.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def prepare(self, claude_path: str, node_path: Optional[str]) -> str:
+        """Validate the cache for this claude/node pair; returns 'warm', 'cold' or 'off'
+
+        'off' means node is not involved (no node found, or claude is a
+        native binary), so nothing would ever be cached and the directory
+        is left alone.
+        """
+        if not node_path or not is_node_script(claude_path):
+            return 'off'
+        key = hashlib.sha1(f"{_identity(claude_path)}\n{_identity(node_path)}".encode()).hexdigest()
+        key_file = self.directory / KEY_FILE
+        try:
+            current = key_file.read_text().strip()
+        except OSError:
+            current = None
+
+        if current == key and self._has_entries():
+            return 'warm'
+        if current != key and self.directory.exists():
+            shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        key_file.write_text(key)
+        return 'cold'
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that enable the cache in the child"""
+        return {NODE_COMPILE_CACHE_ENV: str(self.directory)}
+
+    def _has_entries(self) -> bool:
+        return any(path.name != KEY_FILE for path in self.directory.iterdir())
+
+    def trim(self) -> int:
+        """Evict least recently used files until under max_bytes; returns bytes freed"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if name == KEY_FILE and root == str(self.directory):
+                    continue
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                # atime may not be maintained (noatime/relatime); mtime covers writes
+                entries.append((max(st.st_atime, st.st_mtime), st.st_size, path))
+                total += st.st_size
+
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                freed += size
+            except OSError:
+                pass
+        return freed
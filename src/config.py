@@ -39,6 +39,19 @@ class ConfigManager:
         except IOError as e:
             raise RuntimeError(f"Failed to save config: {e}")
     
+    def get_setting(self, key: str, default: Any = None) -> Any:
+        """Get a single setting from the configuration file"""
+        try:
+            return self.load_config().get(key, default)
+        except RuntimeError:
+            return default
+    
+    def set_setting(self, key: str, value: Any):
+        """Set a single setting in the configuration file"""
+        config = self.load_config()
+        config[key] = value
+        self.save_config(config)
+    
     def get_schedules(self) -> List[str]:
         """Get list of scheduled times"""
         config = self.load_config()
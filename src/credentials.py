@@ -0,0 +1,131 @@
+"""Pre-flight check of Claude Code credentials without spawning claude"""
+
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from src.logger import get_logger
+
+
+KEYCHAIN_SERVICE = "Claude Code-credentials"
+
+# `security` exit status when the keychain cannot be unlocked non-interactively
+KEYCHAIN_LOCKED_STATUS = 36
+
+# Statuses that make a spawn pointless
+DOOMED = ('expired', 'locked', 'unavailable')
+
+
+class CredentialChecker:
+    """Reads the OAuth metadata Claude Code stores locally and checks its expiry
+
+    Results are cached in a small file for a short time so retries and
+    back-to-back invocations don't repeat the keychain lookup. When the
+    credentials can't be read at all, a cheap ``claude --version`` probe
+    decides whether a spawn is worth attempting.
+    """
+
+    def __init__(self, cache_path: Path, claude_path: str = 'claude',
+                 ttl: float = 60, env: Optional[Dict[str, str]] = None):
+        self.logger = get_logger()
+        self.cache_path = Path(cache_path)
+        self.claude_path = claude_path
+        self.ttl = ttl
+        self.env = env
+
+    def check(self) -> Tuple[str, str]:
+        """Return (status, message); status is ok, expired, locked or unavailable"""
+        if os.environ.get('ANTHROPIC_API_KEY'):
+            return 'ok', "Using ANTHROPIC_API_KEY"
+
+        cached = self._load_cache()
+        if cached:
+            return cached
+
+        status, message = self._check_uncached()
+        self._save_cache(status, message)
+        return status, message
+
+    def _check_uncached(self) -> Tuple[str, str]:
+        credentials, read_status = self._read_credentials()
+        if read_status == 'locked':
+            return 'locked', ("Keychain is locked, claude cannot read its credentials. "
+                              "Unlock it with 'security unlock-keychain' or log in to the desktop session.")
+        if credentials is None:
+            return self._probe()
+
+        oauth = credentials.get('claudeAiOauth') or {}
+        expires_at = oauth.get('expiresAt')
+        if not expires_at:
+            return 'ok', "Credentials found (no expiry recorded)"
+
+        expires = expires_at / 1000.0 if expires_at > 1e11 else float(expires_at)
+        if expires > time.time():
+            return 'ok', f"Credentials valid until {time.strftime('%Y-%m-%d %H:%M', time.localtime(expires))}"
+        if oauth.get('refreshToken'):
+            # claude refreshes an expired access token itself
+            return 'ok', "Access token expired, claude will refresh it"
+        return 'expired', ("Claude credentials expired at "
+                           f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(expires))}. "
+                           "Run 'claude' and use /login to re-authenticate.")
+
+    def _read_credentials(self) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Credentials as stored by claude: keychain on macOS, JSON file elsewhere"""
+        config_dir = os.environ.get('CLAUDE_CONFIG_DIR')
+        credentials_file = (Path(config_dir) if config_dir else Path.home() / ".claude") / ".credentials.json"
+        if credentials_file.exists():
+            try:
+                return json.loads(credentials_file.read_text()), 'read'
+            except (OSError, json.JSONDecodeError):
+                return None, 'unreadable'
+
+        import platform
+        if platform.system() != 'Darwin':
+            return None, 'missing'
+
+        try:
+            result = subprocess.run(
+                ['security', 'find-generic-password', '-s', KEYCHAIN_SERVICE, '-w'],
+                capture_output=True, text=True, timeout=5
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None, 'unreadable'
+        if result.returncode == KEYCHAIN_LOCKED_STATUS:
+            return None, 'locked'
+        if result.returncode != 0:
+            return None, 'missing'
+        try:
+            return json.loads(result.stdout), 'read'
+        except json.JSONDecodeError:
+            return None, 'unreadable'
+
+    def _probe(self) -> Tuple[str, str]:
+        """Fallback when credentials can't be inspected: make sure claude runs at all"""
+        try:
+            result = subprocess.run([self.claude_path, '--version'], capture_output=True,
+                                    text=True, timeout=15, env=self.env)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            return 'unavailable', f"claude probe failed: {e}"
+        if result.returncode != 0:
+            return 'unavailable', f"claude probe exited with code {result.returncode}"
+        return 'ok', "Credentials not readable, claude probe succeeded"
+
+    def _load_cache(self) -> Optional[Tuple[str, str]]:
+        try:
+            with open(self.cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() - cached.get('checked_at', 0) > self.ttl:
+            return None
+        return cached.get('status'), cached.get('message')
+
+    def _save_cache(self, status: str, message: str):
+        try:
+            with open(self.cache_path, 'w') as f:
+                json.dump({'checked_at': time.time(), 'status': status, 'message': message}, f)
+        except OSError:
+            pass
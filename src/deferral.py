@@ -0,0 +1,99 @@
+"""Deferred starts for when Claude's usage limit has been reached"""
+
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# "Claude AI usage limit reached|1749924000"
+_EPOCH_RE = re.compile(r'limit reached\|(\d{9,})')
+# "5-hour limit reached ∙ resets 3pm", "Your limit will reset at 3:30pm (Europe/Berlin)"
+_RESET_RE = re.compile(r'resets?(?:\s+at)?\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)?(?:\s*\(([^)]+)\))?',
+                       re.IGNORECASE)
+
+# Specific phrases only: a bare "limit reached" also appears in transient rate-limit errors
+USAGE_LIMIT_MARKERS = ('usage limit reached', 'hour limit reached', 'weekly limit reached', 'hit your limit')
+
+
+def is_usage_limit(text: str) -> bool:
+    """Whether claude's output says the usage limit has been reached"""
+    lowered = text.lower()
+    return any(marker in lowered for marker in USAGE_LIMIT_MARKERS)
+
+
+def parse_reset_time(text: str, now: Optional[float] = None) -> Optional[float]:
+    """Extract the usage limit reset time from claude's output as a Unix timestamp"""
+    now = time.time() if now is None else now
+    match = _EPOCH_RE.search(text)
+    if match:
+        return float(match.group(1))
+
+    match = _RESET_RE.search(text)
+    if not match:
+        return None
+    hour = int(match.group(1))
+    minute = int(match.group(2) or 0)
+    meridiem = (match.group(3) or '').lower()
+    if meridiem == 'pm' and hour < 12:
+        hour += 12
+    elif meridiem == 'am' and hour == 12:
+        hour = 0
+    if hour > 23 or minute > 59:
+        return None
+
+    tz = None
+    if match.group(4):
+        try:
+            from zoneinfo import ZoneInfo
+            tz = ZoneInfo(match.group(4).strip())
+        except (ImportError, ValueError, KeyError):
+            tz = None
+
+    current = datetime.fromtimestamp(now, tz)
+    reset = current.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if reset <= current:
+        reset += timedelta(days=1)
+    return reset.timestamp()
+
+
+class DeferredStart:
+    """A single pending start persisted as JSON so it outlives the process"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """The pending deferral, or None"""
+        try:
+            with open(self.path, 'r') as f:
+                deferred = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return deferred if isinstance(deferred.get('at'), (int, float)) else None
+
+    def save(self, at: float, reason: str) -> Dict[str, Any]:
+        """Persist a deferral atomically, replacing any previous one"""
+        deferred = {'at': at, 'reason': reason, 'created': time.time()}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(deferred, f)
+        os.replace(tmp_path, self.path)
+        return deferred
+
+    def clear(self):
+        """Remove the pending deferral"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def pending_until(self, now: Optional[float] = None) -> Optional[float]:
+        """Reset time while it still lies in the future, else None"""
+        deferred = self.load()
+        now = time.time() if now is None else now
+        if deferred and deferred['at'] > now:
+            return deferred['at']
+        return None
@@ -0,0 +1,86 @@
+"""Run history storage for Claude Code Automation"""
+
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Return the nearest-rank percentile of values, or None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def rolling_means(entries: List[Dict[str, Any]], fields: List[str]) -> Dict[str, Optional[float]]:
+    """Mean of each numeric field over entries (None where no entry has it)"""
+    means = {}
+    for field in fields:
+        values = [entry[field] for entry in entries if isinstance(entry.get(field), (int, float))]
+        means[field] = round(sum(values) / len(values), 3) if values else None
+    return means
+
+
+class RunHistory:
+    """Compact rolling history of session start attempts (JSON lines)"""
+
+    def __init__(self, path: Path, max_entries: int = 200):
+        self.path = Path(path)
+        self.max_entries = max_entries
+
+    def record(self, **fields: Any) -> Dict[str, Any]:
+        """Append one attempt record and compact the file when it grows too large"""
+        entry = {"timestamp": time.time()}
+        entry.update(fields)
+        try:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+            self._compact()
+        except IOError:
+            pass
+        return entry
+
+    def load(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Load recorded attempts, oldest first"""
+        if not self.path.exists():
+            return []
+
+        entries = []
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if since is not None and entry.get("timestamp", 0) < since:
+                        continue
+                    entries.append(entry)
+        except IOError:
+            return []
+        return entries
+
+    def latencies(self, limit: int = 50) -> List[float]:
+        """Durations (seconds) of the most recent successful starts"""
+        durations = [
+            entry["duration"] for entry in self.load()
+            if entry.get("ok") and isinstance(entry.get("duration"), (int, float))
+        ]
+        return durations[-limit:]
+
+    def _compact(self):
+        """Rewrite the file with the newest entries once it holds twice the cap"""
+        with open(self.path, 'r') as f:
+            lines = f.readlines()
+        if len(lines) <= self.max_entries * 2:
+            return
+
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, 'w') as f:
+            f.writelines(lines[-self.max_entries:])
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,116 @@
+"""Pre/post-start hooks run concurrently under per-hook time budgets"""
+
+import importlib
+import os
+import re
+import shlex
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from src.logger import get_logger
+from src.supervisor import ProcessSupervisor
+
+DEFAULT_HOOK_TIMEOUT = 10
+
+# "package.module:function"
+_FUNCTION_RE = re.compile(r'^[A-Za-z_][\w.]*:[A-Za-z_]\w*$')
+
+
+class Hook:
+    """One configured hook: a command line or a module:function reference"""
+
+    def __init__(self, spec: Union[str, Dict[str, Any]], default_timeout: float = DEFAULT_HOOK_TIMEOUT):
+        if isinstance(spec, str):
+            spec = {'function': spec} if _FUNCTION_RE.match(spec) else {'command': spec}
+        if not isinstance(spec, dict) or not (spec.get('command') or spec.get('function')):
+            raise ValueError(f"Invalid hook: {spec!r}")
+        self.command = spec.get('command')
+        self.function = spec.get('function')
+        self.timeout = float(spec.get('timeout', default_timeout))
+        self.name = self.function or self.command
+
+    def run(self, context: Dict[str, Any]) -> Any:
+        """Run to completion; commands are killed (with their group) at the timeout"""
+        if self.function:
+            module_name, func_name = self.function.split(':')
+            func: Callable = getattr(importlib.import_module(module_name), func_name)
+            return func(context)
+
+        env = os.environ.copy()
+        env.update({f"CCA_{key.upper()}": str(value) for key, value in context.items() if value is not None})
+        returncode, _, stderr = ProcessSupervisor(grace_period=1).run(
+            shlex.split(self.command), timeout=self.timeout,
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, env=env
+        )
+        if returncode != 0:
+            raise RuntimeError(f"exited with code {returncode}: {stderr.strip()[:200]}")
+        return returncode
+
+
+class HookRun:
+    """A batch of hooks started together and waited on as a group
+
+    Each hook runs on its own daemon thread rather than a ThreadPoolExecutor
+    so a function hook that overruns its budget can be abandoned without
+    blocking interpreter exit.
+    """
+
+    def __init__(self, event: str, hooks: List[Hook], context: Optional[Dict[str, Any]] = None):
+        self.logger = get_logger()
+        self.event = event
+        self.hooks = hooks
+        self.context = dict(context or {}, event=event)
+        self._threads = []
+        self._results: Dict[int, Any] = {}
+        self._started = None
+
+    def start(self) -> 'HookRun':
+        self._started = time.monotonic()
+        for index, hook in enumerate(self.hooks):
+            thread = threading.Thread(target=self._run_one, args=(index, hook),
+                                      name=f"hook-{self.event}-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def _run_one(self, index: int, hook: Hook):
+        started = time.monotonic()
+        try:
+            hook.run(self.context)
+            self._results[index] = ('ok', time.monotonic() - started, None)
+        except subprocess.TimeoutExpired:
+            self._results[index] = ('timeout', time.monotonic() - started, None)
+        except Exception as e:
+            self._results[index] = ('error', time.monotonic() - started, e)
+
+    def wait(self) -> Dict[str, int]:
+        """Wait for each hook until its own deadline; returns counts per outcome"""
+        counts = {'ok': 0, 'error': 0, 'timeout': 0}
+        for index, (hook, thread) in enumerate(zip(self.hooks, self._threads)):
+            thread.join(max(0.0, self._started + hook.timeout - time.monotonic()))
+            outcome, elapsed, error = self._results.get(index, ('timeout', hook.timeout, None))
+            counts[outcome] += 1
+            if outcome == 'ok':
+                self.logger.info(f"Hook {self.event} '{hook.name}' finished in {elapsed:.2f}s")
+            elif outcome == 'timeout':
+                self.logger.warning(f"Hook {self.event} '{hook.name}' exceeded its {hook.timeout:g}s budget")
+            else:
+                self.logger.warning(f"Hook {self.event} '{hook.name}' failed after {elapsed:.2f}s: {error}")
+        if self.hooks:
+            self.logger.info(f"{self.event} hooks done in {time.monotonic() - self._started:.2f}s")
+        return counts
+
+
+def load_hooks(config: Dict[str, Any], event: str) -> List[Hook]:
+    """Hooks configured for an event; invalid entries are skipped with a warning"""
+    hooks = []
+    default_timeout = config.get('timeout', DEFAULT_HOOK_TIMEOUT)
+    for spec in config.get(event, []):
+        try:
+            hooks.append(Hook(spec, default_timeout))
+        except ValueError as e:
+            get_logger().warning(str(e))
+    return hooks
@@ -0,0 +1,300 @@
+"""Streaming iCalendar (RFC 5545) event reader with recurrence expansion"""
+
+import calendar
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9: TZID times are read as local wall-clock times
+    ZoneInfo = None
+
+WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+
+# Guards rules whose filters never match (e.g. BYMONTHDAY=30 with BYMONTH=2)
+MAX_PERIODS = 100000
+
+
+def unfold(lines: Iterable[str]) -> Iterator[str]:
+    """Join folded continuation lines (those starting with a space or tab)"""
+    current = None
+    for raw in lines:
+        line = raw.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def parse_property(line: str) -> Tuple[str, Dict[str, str], str]:
+    """Split 'NAME;PARAM=x:value' into (NAME, {PARAM: x}, value)"""
+    quoted = False
+    for index, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ':' and not quoted:
+            head, value = line[:index], line[index + 1:]
+            break
+    else:
+        head, value = line, ''
+    name, *params = head.split(';')
+    parameters = {}
+    for param in params:
+        key, _, param_value = param.partition('=')
+        parameters[key.upper()] = param_value.strip('"')
+    return name.upper(), parameters, value
+
+
+def _zone(name: Optional[str]) -> Optional[tzinfo]:
+    if not name or ZoneInfo is None:
+        return None
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        # Non-IANA names (e.g. Windows zone names) fall back to local time
+        return None
+
+
+def parse_datetime(value: str, params: Dict[str, str]):
+    """Parse a DATE or DATE-TIME value into (wall-clock value, tzinfo or None)
+
+    DATE values come back as ``date``; floating and unknown-zone times have
+    no tzinfo and are taken as local time.
+    """
+    value = value.strip()
+    if params.get('VALUE') == 'DATE' or len(value) == 8:
+        return datetime.strptime(value[:8], '%Y%m%d').date(), None
+    if value.endswith('Z'):
+        return datetime.strptime(value[:-1], '%Y%m%dT%H%M%S'), timezone.utc
+    return datetime.strptime(value[:15], '%Y%m%dT%H%M%S'), _zone(params.get('TZID'))
+
+
+def to_local(value: datetime, zone: Optional[tzinfo]) -> datetime:
+    """Naive local time for a wall-clock time in zone"""
+    if zone is None:
+        return value
+    return value.replace(tzinfo=zone).astimezone().replace(tzinfo=None)
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse an RFC 5545 duration such as PT1H30M or P1D"""
+    sign = -1 if value.startswith('-') else 1
+    number = ''
+    seconds = 0
+    units = {'W': 604800, 'D': 86400, 'H': 3600, 'M': 60, 'S': 1}
+    for char in value.lstrip('+-'):
+        if char.isdigit():
+            number += char
+        elif char in units and number:
+            seconds += int(number) * units[char]
+            number = ''
+    return timedelta(seconds=sign * seconds)
+
+
+def parse_rrule(value: str) -> Dict[str, str]:
+    return dict(part.split('=', 1) for part in value.upper().split(';') if '=' in part)
+
+
+class Event:
+    """The parts of a VEVENT that matter for busy time"""
+
+    def __init__(self):
+        self.uid = ''
+        self.start = None
+        self.end = None
+        self.zone: Optional[tzinfo] = None
+        self.duration: Optional[timedelta] = None
+        self.rrule: Optional[Dict[str, str]] = None
+        self.exdates: Set[Any] = set()
+        self.recurrence_id: Optional[datetime] = None
+        self.status = ''
+        self.transparent = False
+
+    @property
+    def all_day(self) -> bool:
+        return not isinstance(self.start, datetime)
+
+    @property
+    def length(self) -> timedelta:
+        if self.end is not None and type(self.end) is type(self.start):
+            return self.end - self.start
+        return self.duration if self.duration is not None else timedelta(0)
+
+    def add(self, name: str, params: Dict[str, str], value: str):
+        if name == 'UID':
+            self.uid = value
+        elif name == 'DTSTART':
+            self.start, self.zone = parse_datetime(value, params)
+        elif name == 'DTEND':
+            self.end = parse_datetime(value, params)[0]
+        elif name == 'DURATION':
+            self.duration = parse_duration(value)
+        elif name == 'RRULE':
+            self.rrule = parse_rrule(value)
+        elif name == 'EXDATE':
+            for item in value.split(','):
+                moment, zone = parse_datetime(item, params)
+                self.exdates.add(to_local(moment, zone) if isinstance(moment, datetime) else moment)
+        elif name == 'RECURRENCE-ID':
+            moment, zone = parse_datetime(value, params)
+            if isinstance(moment, datetime):
+                self.recurrence_id = to_local(moment, zone)
+        elif name == 'STATUS':
+            self.status = value.upper()
+        elif name == 'TRANSP':
+            self.transparent = value.upper() == 'TRANSPARENT'
+
+    def occurrences(self, window_start: datetime, window_end: datetime) -> Iterator[Tuple[datetime, datetime]]:
+        """(start, end) in local time of each occurrence starting before window_end
+        that ends after window_start"""
+        length = self.length
+        starts = expand(self.start, self.rrule, window_start - length, window_end,
+                        self.zone) if self.rrule else iter([self.start])
+        for start in starts:
+            local = to_local(start, self.zone)
+            if local >= window_end:
+                break
+            if local in self.exdates or local.date() in self.exdates:
+                continue
+            end = to_local(start + length, self.zone)
+            if end > window_start:
+                yield local, end
+
+
+def iter_events(lines: Iterable[str]) -> Iterator[Event]:
+    """Yield each VEVENT as soon as it ends; only one event is held in memory"""
+    event = None
+    nested = 0  # VALARM and other components inside the event
+    for line in unfold(lines):
+        name, params, value = parse_property(line)
+        if name == 'BEGIN':
+            if value.upper() == 'VEVENT' and event is None:
+                event = Event()
+            elif event is not None:
+                nested += 1
+        elif name == 'END':
+            if event is None:
+                continue
+            if nested:
+                nested -= 1
+            elif value.upper() == 'VEVENT':
+                if event.start is not None:
+                    yield event
+                event = None
+        elif event is not None and not nested:
+            try:
+                event.add(name, params, value)
+            except ValueError:
+                continue
+
+
+def _month_days(year: int, month: int, rule: Dict[str, str], default_day: int) -> List[int]:
+    """Days of a month selected by BYMONTHDAY / BYDAY (with optional ordinals)"""
+    last = calendar.monthrange(year, month)[1]
+    days = set()
+    for item in filter(None, rule.get('BYMONTHDAY', '').split(',')):
+        day = int(item)
+        day = day if day > 0 else last + day + 1
+        if 1 <= day <= last:
+            days.add(day)
+    for item in filter(None, rule.get('BYDAY', '').split(',')):
+        weekday = WEEKDAYS.get(item[-2:])
+        if weekday is None:
+            continue
+        matching = [day for day in range(1, last + 1) if date(year, month, day).weekday() == weekday]
+        ordinal = item[:-2]
+        if ordinal:
+            index = int(ordinal)
+            if -len(matching) <= index <= len(matching) and index != 0:
+                days.add(matching[index - 1 if index > 0 else index])
+        else:
+            days.update(matching)
+    if not rule.get('BYMONTHDAY') and not rule.get('BYDAY') and default_day <= last:
+        days.add(default_day)
+    return sorted(days)
+
+
+def _period_dates(start: date, freq: str, interval: int, index: int, rule: Dict[str, str]) -> List[date]:
+    """Candidate dates of the index-th period of a rule"""
+    if freq == 'DAILY':
+        return [start + timedelta(days=index * interval)]
+    if freq == 'WEEKLY':
+        week = start - timedelta(days=start.weekday()) + timedelta(weeks=index * interval)
+        weekdays = [WEEKDAYS[item[-2:]] for item in rule.get('BYDAY', '').split(',') if item[-2:] in WEEKDAYS]
+        return [week + timedelta(days=weekday) for weekday in sorted(set(weekdays or [start.weekday()]))]
+    if freq == 'MONTHLY':
+        months = start.month - 1 + index * interval
+        year, month = start.year + months // 12, months % 12 + 1
+        return [date(year, month, day) for day in _month_days(year, month, rule, start.day)]
+    year = start.year + index * interval
+    months = [int(m) for m in rule.get('BYMONTH', '').split(',') if m] or [start.month]
+    return [date(year, month, day) for month in sorted(months) for day in _month_days(year, month, rule, start.day)]
+
+
+def _first_period(start: date, freq: str, interval: int, target: date) -> int:
+    """A period index at or before the one containing target"""
+    if target <= start:
+        return 0
+    if freq == 'DAILY':
+        periods = (target - start).days // interval
+    elif freq == 'WEEKLY':
+        periods = (target - start).days // 7 // interval
+    elif freq == 'MONTHLY':
+        periods = ((target.year - start.year) * 12 + target.month - start.month) // interval
+    else:
+        periods = (target.year - start.year) // interval
+    return max(0, periods - 1)
+
+
+def expand(start, rule: Dict[str, str], window_start: datetime, window_end: datetime,
+           zone: Optional[tzinfo] = None) -> Iterator[datetime]:
+    """Occurrence start times (wall-clock, in the event's zone) of a recurrence rule
+
+    Supports FREQ DAILY/WEEKLY/MONTHLY/YEARLY with INTERVAL, COUNT, UNTIL,
+    BYDAY (with ordinals for monthly/yearly), BYMONTHDAY and BYMONTH.
+    Without COUNT, periods before window_start are skipped arithmetically
+    so old, open-ended series cost nothing to expand.
+    """
+    freq = rule.get('FREQ')
+    if freq not in ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY') or not isinstance(start, datetime):
+        yield start
+        return
+    interval = max(1, int(rule.get('INTERVAL', 1)))
+    count = int(rule['COUNT']) if 'COUNT' in rule else None
+    until = None
+    if 'UNTIL' in rule:
+        value, until_zone = parse_datetime(rule['UNTIL'], {})
+        if not isinstance(value, datetime):
+            value = datetime.combine(value, datetime.max.time())
+        until = to_local(value, until_zone)
+    months = {int(m) for m in rule.get('BYMONTH', '').split(',') if m}
+    weekdays = {WEEKDAYS[item[-2:]] for item in rule.get('BYDAY', '').split(',') if item[-2:] in WEEKDAYS}
+
+    index = 0 if count is not None else _first_period(start.date(), freq, interval, window_start.date())
+    emitted = 0
+    for index in range(index, index + MAX_PERIODS):
+        dates = _period_dates(start.date(), freq, interval, index, rule)
+        if not dates:
+            continue
+        if to_local(datetime.combine(dates[0], start.time()), zone) >= window_end:
+            return
+        for day in dates:
+            if freq == 'DAILY' and ((weekdays and day.weekday() not in weekdays)
+                                    or (months and day.month not in months)):
+                continue
+            occurrence = datetime.combine(day, start.time())
+            if occurrence < start:
+                continue
+            local = to_local(occurrence, zone)
+            if until is not None and local > until:
+                return
+            yield occurrence
+            emitted += 1
+            if count is not None and emitted >= count:
+                return
+            if local >= window_end:
+                return
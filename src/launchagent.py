@@ -3,57 +3,53 @@
 import os
 import subprocess
 import plistlib
+import time
+from datetime import date
 from pathlib import Path
 from typing import List, Optional
-from src.logger import get_logger
+from src.schedule import format_entry, parse_entry
+from src.scheduler import SchedulerBackend
 
 
-class LaunchAgentManager:
+class LaunchAgentManager(SchedulerBackend):
     """Manages LaunchAgent for Claude Code automation on macOS"""
     
+    definition_name = "plist"
+    
     def __init__(self):
-        self.logger = get_logger()
+        super().__init__()
         self.label = "com.claude-code-automation"
         self.plist_filename = f"{self.label}.plist"
         self.launch_agents_dir = Path.home() / "Library" / "LaunchAgents"
         self.plist_path = self.launch_agents_dir / self.plist_filename
+        self.deferred_label = f"{self.label}.deferred"
+        self.deferred_plist_path = self.launch_agents_dir / f"{self.deferred_label}.plist"
+        self.prewarm_label = f"{self.label}.prewarm"
+        self.prewarm_plist_path = self.launch_agents_dir / f"{self.prewarm_label}.plist"
         
     def create_plist(self, schedule_times: List[str]) -> dict:
         """Create plist configuration"""
         # Convert HH:MM or HHMM to hour and minute integers
         intervals = []
         for time_str in schedule_times:
-            if ':' in time_str:
-                hour, minute = map(int, time_str.split(':'))
-            else:
-                # Handle HHMM format
-                if len(time_str) == 4:
-                    hour = int(time_str[:2])
-                    minute = int(time_str[2:])
-                else:
-                    raise ValueError(f"Invalid time format: {time_str}")
-            intervals.append({
+            day, hour, minute = parse_entry(time_str)
+            interval = {
                 'Hour': hour,
                 'Minute': minute
-            })
+            }
+            if day is not None:
+                # launchd has no year field; calendar syncs roll these forward
+                interval.update(Month=day.month, Day=day.day)
+            intervals.append(interval)
         
-        # Get claude-code-automation path
-        try:
-            result = subprocess.run(['which', 'claude-code-automation'], 
-                                  capture_output=True, text=True, check=True)
-            program_path = result.stdout.strip()
-        except subprocess.CalledProcessError:
-            # Fallback to expected Homebrew location
-            program_path = "/usr/local/bin/claude-code-automation"
+        program_arguments = self._program_arguments() + ['start']
         
         plist_dict = {
             'Label': self.label,
-            'ProgramArguments': [program_path, 'start'],
+            'ProgramArguments': program_arguments,
             'StandardOutPath': str(Path.home() / "Library/Logs/claude-code-automation.out.log"),
             'StandardErrorPath': str(Path.home() / "Library/Logs/claude-code-automation.err.log"),
-            'EnvironmentVariables': {
-                'PATH': '/usr/local/bin:/opt/homebrew/bin:/usr/bin:/bin'
-            }
+            'EnvironmentVariables': self._environment('/usr/local/bin:/opt/homebrew/bin:/usr/bin:/bin')
         }
         
         # Add StartCalendarInterval - use single dict for one time, array for multiple
@@ -64,6 +60,32 @@ class LaunchAgentManager:
         
         return plist_dict
     
+    @property
+    def definition_path(self) -> Path:
+        return self.plist_path
+    
+    def get_schedule_times(self) -> List[str]:
+        """Read the installed schedule back from the plist as HH:MM strings"""
+        if not self.plist_path.exists():
+            return []
+        
+        with open(self.plist_path, 'rb') as f:
+            plist = plistlib.load(f)
+        
+        intervals = plist.get('StartCalendarInterval', [])
+        if not isinstance(intervals, list):
+            intervals = [intervals]
+        today = date.today()
+        times = []
+        for i in intervals:
+            day = None
+            if 'Month' in i and 'Day' in i:
+                # The next occurrence of the month/day, counting today
+                year = today.year + ((i['Month'], i['Day']) < (today.month, today.day))
+                day = date(year, i['Month'], i['Day'])
+            times.append(format_entry(day, i.get('Hour', 0), i.get('Minute', 0)))
+        return times
+    
     def install(self, schedule_times: List[str]) -> bool:
         """Install LaunchAgent with given schedule"""
         try:
@@ -77,9 +99,21 @@ class LaunchAgentManager:
             with open(self.plist_path, 'wb') as f:
                 plistlib.dump(plist_dict, f)
             
-            # Unload existing agent (if any) and reload with new configuration
-            self.unload()  # This will fail silently if not loaded
-            self.load()
+            # Page-cache prewarm a few minutes ahead of each start
+            prewarm_times = self._prewarm_times(schedule_times)
+            if prewarm_times:
+                prewarm_dict = self.create_plist(prewarm_times)
+                prewarm_dict['Label'] = self.prewarm_label
+                prewarm_dict['ProgramArguments'][-1] = 'prewarm'
+                with open(self.prewarm_plist_path, 'wb') as f:
+                    plistlib.dump(prewarm_dict, f)
+            else:
+                self._remove_prewarm()
+            
+            if self.deferring:
+                self._reload_pending = True
+            else:
+                self._reload()
             
             self.logger.info(f"LaunchAgent installed at {self.plist_path}")
             return True
@@ -88,11 +122,95 @@ class LaunchAgentManager:
             self.logger.error(f"Failed to install LaunchAgent: {e}")
             return False
     
+    def _reload(self) -> bool:
+        """Unload existing agent (if any) and reload with the written plist"""
+        if self.prewarm_plist_path.exists():
+            self._launchctl('unload', self.prewarm_plist_path)
+            self._launchctl('load', self.prewarm_plist_path)
+        self.unload()  # This will fail silently if not loaded
+        return self.load()
+    
+    def _remove_prewarm(self):
+        if self.prewarm_plist_path.exists():
+            self._launchctl('unload', self.prewarm_plist_path)
+            self.prewarm_plist_path.unlink()
+    
+    def create_deferred_plist(self, at: float) -> dict:
+        """Plist for a single 'start --deferred' at the given Unix time"""
+        fire = time.localtime(at)
+        if self.plist_path.exists():
+            # Reuse the launch command of the installed schedule
+            with open(self.plist_path, 'rb') as f:
+                program_arguments = plistlib.load(f)['ProgramArguments'][:-1]
+        else:
+            program_arguments = self._program_arguments()
+        
+        return {
+            'Label': self.deferred_label,
+            'ProgramArguments': program_arguments + ['start', '--deferred'],
+            'StandardOutPath': str(Path.home() / "Library/Logs/claude-code-automation.out.log"),
+            'StandardErrorPath': str(Path.home() / "Library/Logs/claude-code-automation.err.log"),
+            'EnvironmentVariables': {
+                'PATH': '/usr/local/bin:/opt/homebrew/bin:/usr/bin:/bin'
+            },
+            # launchd has no one-shot calendar jobs; the date pins it to a single day
+            'StartCalendarInterval': {
+                'Month': fire.tm_mon,
+                'Day': fire.tm_mday,
+                'Hour': fire.tm_hour,
+                'Minute': fire.tm_min,
+            },
+        }
+    
+    def install_deferred(self, at: float) -> bool:
+        """Install (or move) the one-shot deferred start"""
+        try:
+            plist_dict = self.create_deferred_plist(at)
+            if self.deferred_plist_path.exists():
+                with open(self.deferred_plist_path, 'rb') as f:
+                    if plistlib.load(f) == plist_dict:
+                        return True
+            
+            self.launch_agents_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.deferred_plist_path, 'wb') as f:
+                plistlib.dump(plist_dict, f)
+            self._launchctl('unload', self.deferred_plist_path)
+            self._launchctl('load', self.deferred_plist_path)
+            self.logger.info(f"Deferred start installed at {self.deferred_plist_path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to install deferred start: {e}")
+            return False
+    
+    def remove_deferred(self, unload: bool = True):
+        """Remove the one-shot deferred start
+        
+        Unloading a job from inside that job would terminate it, so the
+        deferred run itself only deletes the plist; the job is gone from
+        launchd at the next login and 'start --deferred' ignores stray fires.
+        """
+        if not self.deferred_plist_path.exists():
+            return
+        if unload:
+            self._launchctl('unload', self.deferred_plist_path)
+        self.deferred_plist_path.unlink()
+        self.logger.info("Deferred start removed")
+    
+    def _launchctl(self, action: str, plist_path: Path) -> bool:
+        try:
+            subprocess.run(['launchctl', action, str(plist_path)], check=True, capture_output=True)
+            return True
+        except (subprocess.CalledProcessError, OSError):
+            return False
+    
     def uninstall(self) -> bool:
         """Uninstall LaunchAgent"""
         try:
             # Unload first
+            self._reload_pending = False
             self.unload()
+            self.remove_deferred()
+            self._remove_prewarm()
             
             # Remove plist file
             if self.plist_path.exists():
@@ -131,28 +249,28 @@ class LaunchAgentManager:
         """Stop the service"""
         return self.unload()
     
-    def status(self) -> str:
-        """Get service status"""
+    def status_info(self) -> dict:
+        """Get structured service status"""
+        info = {
+            'installed': self.plist_path.exists(),
+            'loaded': False,
+            'pid': None,
+            'last_exit_status': None,
+            'error': None,
+        }
         try:
             result = subprocess.run(['launchctl', 'list'], 
                                   capture_output=True, text=True, check=True)
-            if self.label in result.stdout:
-                # Parse the status
-                for line in result.stdout.splitlines():
-                    if self.label in line:
-                        parts = line.split()
-                        if len(parts) >= 3:
-                            pid = parts[0]
-                            status = parts[1]
-                            if pid != '-':
-                                return f"✓ Service is running (PID: {pid})"
-                            else:
-                                return f"✗ Service is loaded but not running (status: {status})"
-                return "✓ Service is loaded"
-            else:
-                if self.plist_path.exists():
-                    return "✗ Service is not loaded (plist exists)"
-                else:
-                    return "✗ Service is not installed"
-        except subprocess.CalledProcessError:
-            return "✗ Unable to check service status"
\ No newline at end of file
+        except (subprocess.CalledProcessError, OSError) as e:
+            info['error'] = str(e)
+            return info
+        
+        for line in result.stdout.splitlines():
+            # "PID Status Label"; exact match, as the .deferred/.prewarm labels share the prefix
+            parts = line.split()
+            if len(parts) >= 3 and parts[2] == self.label:
+                info['loaded'] = True
+                info['pid'] = int(parts[0]) if parts[0].isdigit() else None
+                info['last_exit_status'] = parts[1]
+                break
+        return info
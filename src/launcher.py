@@ -0,0 +1,104 @@
+"""Self-contained zipapp launcher for scheduled runs
+
+The console script pulls in site-packages, .pth processing and the
+entry-point machinery on every launchd fire. A zipapp holding the
+package with precompiled bytecode can instead be run with an isolated
+interpreter (``python3 -I -S launcher.pyz start``).
+"""
+
+import os
+import py_compile
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipapp
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+MAIN_SOURCE = '''"""Entry point for the claude-code-automation zipapp"""
+
+from src.simple_cli import main
+
+main()
+'''
+
+
+def resolve_interpreter() -> str:
+    """Absolute path of the running interpreter, with symlinks resolved"""
+    return os.path.realpath(sys.executable)
+
+
+def build_zipapp(target: Path, interpreter: Optional[str] = None) -> Path:
+    """Build a zipapp of the package with bytecode compiled for this interpreter
+
+    Bytecode is written next to each source file (the layout zipimport
+    reads), so the archive imports without compiling anything at runtime.
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as staging:
+        staging_path = Path(staging)
+        package = staging_path / "src"
+        package.mkdir()
+        for source in sorted(PACKAGE_DIR.glob("*.py")):
+            shutil.copy2(source, package / source.name)
+            # Unchecked hash-based pycs skip the source mtime comparison, which
+            # the 2-second resolution of zip timestamps would otherwise upset
+            py_compile.compile(str(package / source.name), cfile=str(package / (source.stem + ".pyc")),
+                               doraise=True,
+                               invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+        (staging_path / "__main__.py").write_text(MAIN_SOURCE)
+
+        tmp_target = target.with_name(target.name + ".tmp")
+        zipapp.create_archive(staging_path, tmp_target, interpreter=interpreter)
+        os.replace(tmp_target, target)
+    return target
+
+
+def zipapp_command(archive: Path, interpreter: Optional[str] = None) -> List[str]:
+    """Program arguments that run the zipapp with an isolated interpreter"""
+    return [interpreter or resolve_interpreter(), '-I', '-S', str(archive)]
+
+
+def measure_startup(commands: Dict[str, List[str]], runs: int = 10) -> Dict[str, float]:
+    """Median wall time (seconds) of running each command with 'help'"""
+    results = {}
+    for name, command in commands.items():
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run(command + ['help'], stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, check=True)
+            timings.append(time.perf_counter() - started)
+        results[name] = statistics.median(timings)
+    return results
+
+
+def main(argv: List[str]):
+    """Build the zipapp or compare startup time of both launch paths"""
+    if len(argv) >= 2 and argv[0] == 'build':
+        archive = build_zipapp(Path(argv[1]))
+        print(f"✓ Built {archive} for {resolve_interpreter()}")
+    elif len(argv) >= 2 and argv[0] == 'bench':
+        archive = Path(argv[1])
+        commands = {"zipapp (-I -S)": zipapp_command(archive)}
+        console_script = shutil.which('claude-code-automation')
+        if console_script:
+            commands["console script"] = [console_script]
+        else:
+            commands["python -m src.simple_cli"] = [sys.executable, '-m', 'src.simple_cli']
+        for name, seconds in measure_startup(commands).items():
+            print(f"  {name:<28} {seconds * 1000:7.1f} ms (median)")
+    else:
+        print("Usage: python -m src.launcher build <target.pyz> | bench <target.pyz>")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,9 +1,215 @@
 """Logging configuration for Claude Code Automation"""
 
+import gzip
+import locale
 import logging
 import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
 from logging.handlers import RotatingFileHandler
+from typing import List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Not on POSIX: single-process locking only
+    fcntl = None
+
+
+DEFAULT_ROTATION = {
+    "max_bytes": 1024 * 1024,  # 1MB per file
+    "backup_count": 50,        # compressed backups are ~10x smaller than the old 5 plain ones
+    "daily": False,
+    "compress": True,
+}
+
+
+class CompressedRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that gzips backups off the logging thread
+    
+    Rolls over on size and, optionally, at local midnight. A rollover only
+    renames the current file; compression of the renamed file happens in a
+    background thread so emitting records never stalls on gzip.
+    
+    Safe to share one log file between processes (a launchd run and a
+    manual ``status``, say). Each record is a single ``O_APPEND`` write,
+    made under a shared ``flock`` on ``<log>.lock`` after checking the
+    path still names the file we hold. A rollover takes that lock
+    exclusively and re-stats the file first, so only one process rotates
+    and nobody writes into a file that has just been renamed away.
+    Compression holds ``<log>.compress.lock`` so backups are never
+    shifted while another process is still gzipping one.
+    """
+    
+    def __init__(self, filename, maxBytes: int = 0, backupCount: int = 0,
+                 daily: bool = False, compress: bool = True, encoding=None):
+        # The stream of the base class is never opened; records go through _fd
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount,
+                         encoding=encoding, delay=True)
+        self.daily = daily
+        self.compress = compress
+        # FileHandler records an unspecified encoding as "locale" on 3.10+
+        self._encoding = (self.encoding if self.encoding not in (None, 'locale')
+                          else locale.getpreferredencoding(False))
+        self.lock_path = self.baseFilename + ".lock"
+        self.compress_lock_path = self.baseFilename + ".compress.lock"
+        self._compressor = None
+        self._fd = None
+        self._identity = None
+        self.rollover_at = 0.0
+        self._reopen_if_replaced()
+        if compress:
+            self.namer = lambda name: name + ".gz"
+            self.rotator = self._rotate_and_compress
+            # Finish a compression interrupted by a previous process exit
+            leftover = self.baseFilename + ".1"
+            if os.path.exists(leftover) and backupCount > 0:
+                self._start_compression(leftover, leftover + ".gz")
+    
+    @staticmethod
+    def _next_midnight(timestamp: float) -> float:
+        day = datetime.fromtimestamp(timestamp).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (day + timedelta(days=1)).timestamp()
+    
+    def _reopen_if_replaced(self):
+        """(Re)open the log file if another process rotated or removed it"""
+        try:
+            current = os.stat(self.baseFilename)
+            if self._fd is not None and (current.st_dev, current.st_ino) == self._identity:
+                return
+        except FileNotFoundError:
+            pass
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = os.open(self.baseFilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        opened = os.fstat(self._fd)
+        self._identity = (opened.st_dev, opened.st_ino)
+        # A file started by another process's rollover belongs to its day
+        self.rollover_at = self._next_midnight(opened.st_mtime)
+    
+    def shouldRollover(self, record, length: int = 0) -> bool:
+        if self.backupCount <= 0 or self._fd is None:
+            return False
+        if self.daily and record.created >= self.rollover_at:
+            return True
+        if self.maxBytes <= 0:
+            return False
+        size = os.fstat(self._fd).st_size
+        return size > 0 and size + length >= self.maxBytes
+    
+    def emit(self, record):
+        try:
+            data = (self.format(record) + self.terminator).encode(self._encoding, 'backslashreplace')
+            if self.shouldRollover(record, len(data)):
+                with _flocked(self.lock_path, exclusive=True):
+                    # Another process may have rotated while we waited
+                    self._reopen_if_replaced()
+                    if self.shouldRollover(record, len(data)):
+                        self.doRollover()
+            with _flocked(self.lock_path, exclusive=False):
+                self._reopen_if_replaced()
+                os.write(self._fd, data)
+        except Exception:
+            self.handleError(record)
+    
+    def doRollover(self):
+        # Backups are renamed during rollover; the previous one must be complete
+        if self._compressor is not None:
+            self._compressor.join()
+            self._compressor = None
+        with _flocked(self.compress_lock_path, exclusive=True):
+            leftover = self.baseFilename + ".1"
+            if self.compress and os.path.exists(leftover):
+                # Left by a process that exited mid-compression; it would be overwritten
+                _gzip_file(leftover, leftover + ".gz")
+            super().doRollover()
+        self._reopen_if_replaced()
+    
+    def close(self):
+        self.acquire()
+        try:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+        finally:
+            self.release()
+        super().close()
+    
+    def _rotate_and_compress(self, source: str, dest: str):
+        """Rename the live file aside and gzip it in the background"""
+        pending = dest[:-len(".gz")]
+        os.rename(source, pending)
+        self._start_compression(pending, dest)
+    
+    def _start_compression(self, source: str, dest: str):
+        self._compressor = threading.Thread(
+            target=_gzip_file, args=(source, dest, self.compress_lock_path), name="log-compressor"
+        )
+        self._compressor.start()
+
+
+@contextmanager
+def _flocked(path: str, exclusive: bool):
+    """Hold an flock on path; a no-op where fcntl is unavailable"""
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _gzip_file(source: str, dest: str, lock_path: Optional[str] = None):
+    """Compress source into dest atomically and remove source
+    
+    With lock_path, waits for the compression lock first; another process
+    may meanwhile have compressed source itself, which leaves nothing to do.
+    """
+    if lock_path is not None:
+        with _flocked(lock_path, exclusive=True):
+            _gzip_file(source, dest)
+        return
+    tmp_dest = dest + ".tmp"
+    try:
+        with open(source, 'rb') as src, gzip.open(tmp_dest, 'wb') as dst:
+            while True:
+                chunk = src.read(64 * 1024)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        os.replace(tmp_dest, dest)
+        os.remove(source)
+    except OSError:
+        # Leave the uncompressed backup in place; it is still readable
+        pass
+
+
+def read_backup_lines(log_path: Path, count: int) -> List[str]:
+    """Return up to count most recent lines from rotated backups (oldest first)
+    
+    Both compressed (.N.gz) and plain (.N) backups are read, newest backup first,
+    until enough lines have been collected.
+    """
+    collected: List[str] = []
+    index = 1
+    while len(collected) < count:
+        plain = Path(f"{log_path}.{index}")
+        compressed = Path(f"{plain}.gz")
+        if compressed.exists():
+            with gzip.open(compressed, 'rt', errors='replace') as f:
+                lines = f.read().splitlines()
+        elif plain.exists():
+            with open(plain, 'r', errors='replace') as f:
+                lines = f.read().splitlines()
+        else:
+            break
+        collected = lines[-(count - len(collected)):] + collected
+        index += 1
+    return collected
 
 
 def setup_logger(name: str = "claude-code-automation", level: int = logging.INFO) -> logging.Logger:
@@ -26,10 +232,18 @@ def setup_logger(name: str = "claude-code-automation", level: int = logging.INFO
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
-    # File handler with rotation
+    # File handler with compressed size/daily rotation
+    from src.config import ConfigManager
+    rotation = dict(DEFAULT_ROTATION)
+    rotation.update(ConfigManager().get_setting('log_rotation', {}) or {})
+    
     log_file = log_dir / "claude-code-automation.log"
-    file_handler = RotatingFileHandler(
-        log_file, maxBytes=1024*1024, backupCount=5  # 1MB per file, keep 5 backups
+    file_handler = CompressedRotatingFileHandler(
+        log_file,
+        maxBytes=rotation["max_bytes"],
+        backupCount=rotation["backup_count"],
+        daily=rotation["daily"],
+        compress=rotation["compress"],
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
@@ -0,0 +1,58 @@
+"""Command output as human-readable text or a single JSON document"""
+
+import json
+import sys
+from typing import Any, Optional
+
+# Stable exit codes, one per failure class (documented in docs/USAGE.md)
+EXIT_OK = 0
+EXIT_ERROR = 1              # General error or invalid arguments
+EXIT_NOT_INSTALLED = 3      # No LaunchAgent / scheduler entry installed
+EXIT_NOT_LOADED = 4         # Installed but not loaded by the scheduler
+EXIT_CLAUDE_MISSING = 5     # claude binary not found or not runnable
+EXIT_AUTH_FAILURE = 6       # Credentials expired, keychain locked or login required
+EXIT_TIMEOUT = 7            # claude did not finish within the spawn timeout
+EXIT_USAGE_LIMIT = 8        # Usage limit reached; a start was deferred to the reset time
+EXIT_RATE_LIMITED = 9       # Start rejected by the start rate limiter
+
+
+class CommandOutput:
+    """Collects a command's result and renders it as text or JSON
+
+    In text mode ``print`` writes through immediately, exactly like the
+    plain print() calls it replaces. In JSON mode text is suppressed and
+    the fields gathered with ``update`` are emitted as one document when
+    the command finishes or fails.
+    """
+
+    def __init__(self, command: str, json_mode: bool = False):
+        self.command = command
+        self.json_mode = json_mode
+        self.data = {}
+        self.emitted = False
+
+    def print(self, *args, **kwargs):
+        """Print human-readable output (suppressed in JSON mode)"""
+        if not self.json_mode:
+            print(*args, **kwargs)
+
+    def update(self, **fields: Any):
+        """Add fields to the JSON document"""
+        self.data.update(fields)
+
+    def finish(self, exit_code: int = EXIT_OK, error: Optional[str] = None):
+        """Emit the JSON document (once) and exit with exit_code if non-zero"""
+        if self.json_mode and not self.emitted:
+            document = {"command": self.command, "ok": exit_code == EXIT_OK, "exit_code": exit_code}
+            if error:
+                document["error"] = error
+            document.update(self.data)
+            print(json.dumps(document, ensure_ascii=False, default=str))
+            self.emitted = True
+        if exit_code != EXIT_OK:
+            sys.exit(exit_code)
+
+    def fail(self, message: str, exit_code: int = EXIT_ERROR):
+        """Report an error and exit"""
+        self.print(message)
+        self.finish(exit_code, error=message)
@@ -0,0 +1,94 @@
+"""Built-in cProfile / tracemalloc support for any command"""
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+# Set to "1" (default location) or an output path; used by launchd via the plist
+PROFILE_ENV = "CLAUDE_CODE_AUTOMATION_PROFILE"
+TRACEMALLOC_ENV = "CLAUDE_CODE_AUTOMATION_TRACEMALLOC"
+
+TOP_N = 25
+
+
+def extract_profile_options(args: List[str]) -> Tuple[List[str], Optional[str], bool]:
+    """Strip --profile[=path] and --tracemalloc from args, honouring the environment
+
+    Returns (remaining args, profile path or '' for the default location or
+    None when profiling is off, whether to trace memory).
+    """
+    remaining = []
+    profile = None
+    trace_memory = False
+    for arg in args:
+        if arg == '--profile':
+            profile = ''
+        elif arg.startswith('--profile='):
+            profile = arg.split('=', 1)[1]
+        elif arg == '--tracemalloc':
+            trace_memory = True
+        else:
+            remaining.append(arg)
+
+    env_profile = os.environ.get(PROFILE_ENV)
+    if profile is None and env_profile:
+        profile = '' if env_profile == '1' else env_profile
+    if os.environ.get(TRACEMALLOC_ENV) in ('1', 'true', 'yes'):
+        trace_memory = True
+    if trace_memory and profile is None:
+        profile = ''
+    return remaining, profile, trace_memory
+
+
+def default_profile_path(command: str) -> Path:
+    """Profile output next to the application logs"""
+    log_dir = Path.home() / ".config" / "claude-code-automation" / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return log_dir / f"profile-{command}-{time.strftime('%Y%m%d-%H%M%S')}.pstats"
+
+
+def run_profiled(func: Callable[[], None], output: Path, trace_memory: bool = False,
+                 top: int = TOP_N):
+    """Run func under cProfile (and tracemalloc), writing .pstats and a text summary
+
+    Output is written even when func exits via SystemExit or raises.
+    """
+    # Imported here: the profilers cost every CLI invocation ~20ms otherwise
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    summary_path = output.with_suffix('.txt')
+
+    if trace_memory:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        func()
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        profiler.dump_stats(str(output))
+
+        stream = io.StringIO()
+        stream.write(f"Wall time: {elapsed:.3f}s\n\n")
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats('cumulative').print_stats(top)
+
+        if trace_memory:
+            stream.write(f"\nMemory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n")
+            stream.write(f"Top {top} allocation sites:\n")
+            for stat in snapshot.statistics('lineno')[:top]:
+                stream.write(f"  {stat}\n")
+
+        summary_path.write_text(stream.getvalue())
@@ -0,0 +1,58 @@
+"""Persistent token bucket shared by every invocation of the tool"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Not on POSIX: single-process locking only
+    fcntl = None
+
+
+class TokenBucket:
+    """File-backed token bucket; state is read and written under an exclusive lock
+
+    Tokens refill continuously at ``rate_per_hour`` up to ``burst``. Because
+    the state lives in a file, the ceiling holds across processes however
+    the tool is launched.
+    """
+
+    def __init__(self, path: Path, rate_per_hour: float, burst: float):
+        self.path = Path(path)
+        self.rate = rate_per_hour / 3600.0
+        self.burst = burst
+
+    def acquire(self, now: Optional[float] = None) -> Tuple[bool, float]:
+        """Take one token; returns (allowed, seconds until a token is available)"""
+        now = time.time() if now is None else now
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            tokens, updated = self._read(fd, now)
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            wait = 0.0 if allowed or self.rate <= 0 else (1 - tokens) / self.rate
+
+            state = json.dumps({'tokens': tokens, 'updated': now}).encode()
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, state)
+            return allowed, wait
+        finally:
+            os.close(fd)  # releases the lock
+
+    def _read(self, fd: int, now: float) -> Tuple[float, float]:
+        """Stored (tokens, updated); a missing or corrupt state starts full"""
+        raw = os.read(fd, 4096)
+        try:
+            state = json.loads(raw)
+            return float(state['tokens']), float(state['updated'])
+        except (ValueError, KeyError, TypeError):
+            return float(self.burst), now
@@ -0,0 +1,71 @@
+"""Schedule time parsing and next-fire calculation"""
+
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+
+def parse_time(time_str: str) -> Tuple[int, int]:
+    """Parse HH:MM or HHMM into (hour, minute)"""
+    if ':' in time_str:
+        parts = time_str.split(':')
+        if len(parts) != 2 or not all(p.isdigit() for p in parts):
+            raise ValueError(f"Invalid time format: {time_str}")
+        hour, minute = int(parts[0]), int(parts[1])
+    elif len(time_str) == 4 and time_str.isdigit():
+        hour, minute = int(time_str[:2]), int(time_str[2:])
+    else:
+        raise ValueError(f"Invalid time format: {time_str}")
+
+    if not (0 <= hour <= 23) or not (0 <= minute <= 59):
+        raise ValueError(f"Invalid time format: {time_str}")
+    return hour, minute
+
+
+def parse_entry(entry: str) -> Tuple[Optional[date], int, int]:
+    """Parse a daily 'HH:MM'/'HHMM' or a one-day 'YYYY-MM-DD HH:MM' schedule entry
+    into (day or None, hour, minute)"""
+    day_str, sep, time_str = entry.strip().partition(' ')
+    if not sep:
+        return (None,) + parse_time(entry)
+    try:
+        day = datetime.strptime(day_str, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"Invalid time format: {entry}")
+    return (day,) + parse_time(time_str.strip())
+
+
+def format_entry(day: Optional[date], hour: int, minute: int) -> str:
+    """Inverse of parse_entry"""
+    prefix = f"{day.isoformat()} " if day else ""
+    return f"{prefix}{hour:02d}:{minute:02d}"
+
+
+def shift_entry(entry: str, minutes: int) -> str:
+    """Move a schedule entry by minutes, wrapping daily entries around midnight"""
+    day, hour, minute = parse_entry(entry)
+    if day is None:
+        total = (hour * 60 + minute + minutes) % (24 * 60)
+        return format_entry(None, total // 60, total % 60)
+    moved = datetime(day.year, day.month, day.day, hour, minute) + timedelta(minutes=minutes)
+    return format_entry(moved.date(), moved.hour, moved.minute)
+
+
+def next_fire(schedule_times: List[str], now: Optional[datetime] = None) -> Optional[datetime]:
+    """Return the next datetime at which any of the schedule entries fires"""
+    now = now or datetime.now()
+    candidates = []
+    for time_str in schedule_times:
+        try:
+            day, hour, minute = parse_entry(time_str)
+        except ValueError:
+            continue
+        if day is not None:
+            fire = datetime(day.year, day.month, day.day, hour, minute)
+            if fire > now:
+                candidates.append(fire)
+            continue
+        fire = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if fire <= now:
+            fire += timedelta(days=1)
+        candidates.append(fire)
+    return min(candidates) if candidates else None
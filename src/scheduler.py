@@ -0,0 +1,138 @@
+"""Scheduler backend interface shared by launchd and systemd"""
+
+import subprocess
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config import ConfigManager
+from src.logger import get_logger
+from src.profiling import PROFILE_ENV
+from src.schedule import shift_entry
+
+
+class SchedulerBackend(ABC):
+    """Installs the daily 'start' schedule with the platform's job scheduler
+
+    ``definition_path`` is the file whose existence means a schedule is
+    installed; status views watch it for changes.
+    """
+
+    # Shown as "Service is not loaded (<definition_name> exists)"
+    definition_name = "schedule"
+
+    def __init__(self):
+        self.logger = get_logger()
+        self.config = ConfigManager()
+        self.deferring = False  # Hold reloads until flush() (set by 'batch')
+        self._reload_pending = False
+
+    @property
+    @abstractmethod
+    def definition_path(self) -> Path:
+        """File whose existence means a schedule is installed"""
+
+    def _program_arguments(self) -> List[str]:
+        """Command the scheduler runs, either the console script or the zipapp launcher"""
+        if self.config.get_setting('launcher') == 'zipapp':
+            from src.launcher import build_zipapp, zipapp_command
+            # Built with (and pinned to) the interpreter running the install
+            archive = build_zipapp(self.config.config_dir / "launcher.pyz")
+            return zipapp_command(archive)
+
+        # Get claude-code-automation path
+        try:
+            result = subprocess.run(['which', 'claude-code-automation'],
+                                  capture_output=True, text=True, check=True)
+            program_path = result.stdout.strip()
+        except subprocess.CalledProcessError:
+            # Fallback to expected Homebrew location
+            program_path = "/usr/local/bin/claude-code-automation"
+        return [program_path]
+
+    def _environment(self, path: str) -> Dict[str, str]:
+        """Environment for scheduled runs"""
+        environment = {'PATH': path}
+        # Profile scheduled runs without touching the command line
+        profile = self.config.get_setting('profile_launchd')
+        if profile:
+            environment[PROFILE_ENV] = profile if isinstance(profile, str) else '1'
+        return environment
+
+    def _prewarm_times(self, schedule_times: List[str]) -> List[str]:
+        """Fire times of the 'prewarm' job, prewarm_lead_minutes before each start"""
+        lead = self.config.get_setting('prewarm_lead_minutes') or 0
+        if lead <= 0:
+            return []
+        return list(dict.fromkeys(shift_entry(entry, -int(lead)) for entry in schedule_times))
+
+    @abstractmethod
+    def install(self, schedule_times: List[str]) -> bool:
+        """Install the schedule (and its prewarm job), replacing any previous one"""
+
+    def defer_reload(self):
+        """Write definitions but postpone reloading the scheduler until flush()"""
+        self.deferring = True
+
+    def flush(self) -> bool:
+        """Perform the reload postponed by defer_reload(), if any"""
+        self.deferring = False
+        if not self._reload_pending:
+            return True
+        self._reload_pending = False
+        return self._reload()
+
+    @abstractmethod
+    def _reload(self) -> bool:
+        """Make the scheduler pick up the written definition"""
+
+    @abstractmethod
+    def uninstall(self) -> bool:
+        """Remove the schedule (and any deferred start)"""
+
+    @abstractmethod
+    def get_schedule_times(self) -> List[str]:
+        """Read the installed schedule back as 'HH:MM' / 'YYYY-MM-DD HH:MM' strings"""
+
+    @abstractmethod
+    def install_deferred(self, at: float) -> bool:
+        """Install (or move) a one-shot 'start --deferred' at a Unix time"""
+
+    @abstractmethod
+    def remove_deferred(self, unload: bool = True):
+        """Remove the one-shot deferred start"""
+
+    @abstractmethod
+    def status_info(self) -> dict:
+        """Structured status: installed, loaded, pid, last_exit_status, error"""
+
+    def status(self) -> str:
+        """Get service status"""
+        return self.describe_status(self.status_info())
+
+    def describe_status(self, info: dict) -> str:
+        """Human-readable form of status_info()"""
+        if info['error']:
+            return "✗ Unable to check service status"
+        if info['loaded']:
+            if info['pid'] is not None:
+                return f"✓ Service is running (PID: {info['pid']})"
+            if info['last_exit_status'] is not None:
+                return f"✗ Service is loaded but not running (status: {info['last_exit_status']})"
+            return "✓ Service is loaded"
+        if info['installed']:
+            return f"✗ Service is not loaded ({self.definition_name} exists)"
+        return "✗ Service is not installed"
+
+
+def get_scheduler() -> Optional[SchedulerBackend]:
+    """Scheduler backend for this platform: launchd on macOS, systemd on Linux"""
+    import platform
+    system = platform.system()
+    if system == 'Darwin':
+        from src.launchagent import LaunchAgentManager
+        return LaunchAgentManager()
+    if system == 'Linux':
+        from src.systemd import SystemdTimerManager
+        return SystemdTimerManager()
+    return None
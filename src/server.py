@@ -0,0 +1,269 @@
+"""Localhost-only HTTP endpoint exposing status, history and metrics"""
+
+import asyncio
+import json
+import os
+import platform
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.config import ConfigManager
+from src.history import RunHistory, percentile
+from src.launchagent import LaunchAgentManager
+from src.scheduler import SchedulerBackend, get_scheduler
+from src.logger import get_logger
+from src.schedule import next_fire
+from src.session import parse_session_marker
+
+
+LOOPBACK_HOSTS = ('127.0.0.1', '::1', 'localhost')
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class StatusState:
+    """In-memory view of automation state, refreshed only when its files change"""
+
+    def __init__(self, config: Optional[ConfigManager] = None,
+                 agent: Optional[SchedulerBackend] = None):
+        self.config = config or ConfigManager()
+        self.agent = agent or get_scheduler() or LaunchAgentManager()
+        self.history = RunHistory(self.config.config_dir / "history.jsonl")
+        self.marker_path = self.config.session_dir / ".claude_session_marker"
+
+        self._stamps: Dict[str, Any] = {}
+        self.schedule_times: List[str] = []
+        self.service: Dict[str, Any] = {}
+        self.session: Optional[Dict[str, str]] = None
+        self.entries: List[Dict[str, Any]] = []
+        self.status_body = b""
+        self.metrics_lines: List[str] = []
+        self.refresh()
+
+    def _changed(self, path) -> bool:
+        """Cheap stat-based change detection"""
+        try:
+            st = os.stat(path)
+            stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            stamp = None
+        key = str(path)
+        if key in self._stamps and self._stamps[key] == stamp:
+            return False
+        self._stamps[key] = stamp
+        return True
+
+    def refresh(self) -> bool:
+        """Reload whatever changed on disk; returns True if anything did"""
+        changed = False
+
+        if self._changed(self.agent.definition_path):
+            try:
+                self.schedule_times = self.agent.get_schedule_times()
+            except Exception:
+                self.schedule_times = []
+            self.service = self._query_service()
+            changed = True
+
+        if self._changed(self.marker_path):
+            try:
+                self.session = parse_session_marker(self.marker_path.read_text())
+            except OSError:
+                self.session = None
+            changed = True
+
+        if self._changed(self.history.path):
+            self.entries = self.history.load()
+            self.metrics_lines = self._build_metrics()
+            changed = True
+
+        if changed:
+            self.status_body = _json_body({
+                "service": self.service,
+                "schedule": self.schedule_times,
+                "session": self.session,
+                "last_run": self.entries[-1] if self.entries else None,
+            })
+        return changed
+
+    def _query_service(self) -> Dict[str, Any]:
+        """Ask the scheduler for the service status (only when its definition changed)"""
+        installed = self.agent.definition_path.exists()
+        if platform.system() not in ('Darwin', 'Linux'):
+            return {"installed": installed, "status": None}
+        try:
+            return {"installed": installed, "status": self.agent.status()}
+        except OSError:
+            return {"installed": installed, "status": None}
+
+    def next_fire(self) -> Optional[float]:
+        """Epoch seconds of the next scheduled fire"""
+        fire = next_fire(self.schedule_times)
+        return fire.timestamp() if fire else None
+
+    def _build_metrics(self) -> List[str]:
+        """Prometheus lines derived from the run history"""
+        outcomes = {"success": 0, "failure": 0, "timeout": 0}
+        last_success = 0.0
+        for entry in self.entries:
+            if entry.get("ok"):
+                outcomes["success"] += 1
+                last_success = entry.get("timestamp", last_success)
+            elif entry.get("returncode") is None:
+                outcomes["timeout"] += 1
+            else:
+                outcomes["failure"] += 1
+
+        lines = [
+            "# HELP cca_start_attempts Start attempts in the retained run history.",
+            "# TYPE cca_start_attempts gauge",
+        ]
+        for outcome, count in outcomes.items():
+            lines.append(f'cca_start_attempts{{outcome="{outcome}"}} {count}')
+
+        durations = [e["duration"] for e in self.entries
+                     if e.get("ok") and isinstance(e.get("duration"), (int, float))]
+        lines += [
+            "# HELP cca_start_duration_seconds Duration of successful starts.",
+            "# TYPE cca_start_duration_seconds summary",
+        ]
+        for q in (50, 95):
+            value = percentile(durations, q)
+            lines.append(f'cca_start_duration_seconds{{quantile="{q / 100}"}} '
+                         f'{value if value is not None else "NaN"}')
+        lines.append(f"cca_start_duration_seconds_count {len(durations)}")
+        lines.append(f"cca_start_duration_seconds_sum {sum(durations)}")
+
+        # Spawn-to-first-output by compile cache state, to compare cold and warm starts
+        first_output = {}
+        for entry in self.entries:
+            if isinstance(entry.get("first_output"), (int, float)):
+                first_output.setdefault(entry.get("compile_cache", "off"), []).append(entry["first_output"])
+        lines += [
+            "# HELP cca_first_output_seconds Median time from spawn to claude's first output.",
+            "# TYPE cca_first_output_seconds gauge",
+        ]
+        for state, values in sorted(first_output.items()):
+            lines.append(f'cca_first_output_seconds{{compile_cache="{state}"}} {percentile(values, 50)}')
+
+        lines += [
+            "# HELP cca_last_success_timestamp_seconds Time of the last successful start.",
+            "# TYPE cca_last_success_timestamp_seconds gauge",
+            f"cca_last_success_timestamp_seconds {last_success}",
+        ]
+        return lines
+
+    def metrics(self) -> bytes:
+        """Full Prometheus exposition, including time-dependent gauges"""
+        fire = self.next_fire()
+        lines = self.metrics_lines + [
+            "# HELP cca_scheduled_times Number of scheduled daily start times.",
+            "# TYPE cca_scheduled_times gauge",
+            f"cca_scheduled_times {len(self.schedule_times)}",
+            "# HELP cca_next_fire_timestamp_seconds Time of the next scheduled start.",
+            "# TYPE cca_next_fire_timestamp_seconds gauge",
+            f"cca_next_fire_timestamp_seconds {fire if fire is not None else 'NaN'}",
+        ]
+        return ("\n".join(lines) + "\n").encode()
+
+
+def _json_body(data: Any) -> bytes:
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+class StatusServer:
+    """Minimal HTTP/1.1 server (keep-alive, GET only) on top of asyncio streams"""
+
+    def __init__(self, state: StatusState, host: str = '127.0.0.1', port: int = 8765,
+                 poll_interval: float = 1.0):
+        if host not in LOOPBACK_HOSTS:
+            raise ValueError(f"Refusing to bind non-loopback address: {host}")
+        self.logger = get_logger()
+        self.state = state
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+
+    def route(self, target: str) -> Tuple[int, str, bytes]:
+        """Map a request target to (status, content type, body)"""
+        url = urlsplit(target)
+        if url.path == '/status':
+            return 200, "application/json", self.state.status_body
+        if url.path == '/next':
+            return 200, "application/json", _json_body({"next_fire": self.state.next_fire()})
+        if url.path == '/history':
+            since = parse_qs(url.query).get('since', [None])[0]
+            try:
+                since_ts = float(since) if since is not None else None
+            except ValueError:
+                return 400, "application/json", _json_body({"error": "since must be epoch seconds"})
+            entries = self.state.entries
+            if since_ts is not None:
+                entries = [e for e in entries if e.get("timestamp", 0) >= since_ts]
+            return 200, "application/json", _json_body(entries)
+        if url.path == '/metrics':
+            return 200, "text/plain; version=0.0.4", self.state.metrics()
+        return 404, "application/json", _json_body({"error": "not found"})
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode('latin-1').split()
+
+                keep_alive = len(parts) == 3 and parts[2] == 'HTTP/1.1'
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    if name.strip().lower() == 'connection':
+                        token = value.strip().lower()
+                        if token == 'close':
+                            keep_alive = False
+                        elif token == 'keep-alive':
+                            keep_alive = True
+
+                if len(parts) != 3:
+                    status, ctype, body = 400, "application/json", _json_body({"error": "bad request"})
+                    keep_alive = False
+                elif parts[0] not in ('GET', 'HEAD'):
+                    status, ctype, body = 405, "application/json", _json_body({"error": "method not allowed"})
+                else:
+                    status, ctype, body = self.route(parts[1])
+
+                head = (
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: {ctype}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                ).encode()
+                writer.write(head if parts and parts[0] == 'HEAD' else head + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                self.state.refresh()
+            except Exception as e:
+                self.logger.warning(f"Status refresh failed: {e}")
+
+    async def serve_forever(self):
+        """Serve until cancelled"""
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        poller = asyncio.ensure_future(self._poll())
+        self.logger.info(f"HTTP status endpoint listening on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            poller.cancel()
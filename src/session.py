@@ -2,10 +2,72 @@
 
 import subprocess
 import os
+import shutil
 import time
 from pathlib import Path
+from src.artifacts import ArtifactStore, new_run_id
+from src.calibrate import calibrate, common_bin_dirs, find_candidates, fingerprint, nvm_bin_dirs
+from src.compile_cache import CompileCache
 from src.config import ConfigManager
+from src.credentials import DOOMED, CredentialChecker
+from src.deferral import DeferredStart, is_usage_limit, parse_reset_time
+from src.history import RunHistory, percentile
+from src.hooks import HookRun, load_hooks
 from src.logger import get_logger
+from src.prewarm import PrewarmState
+from src.ratelimit import TokenBucket
+from src.stream_result import STREAM_JSON_ARGS, StreamResult
+from src.supervisor import ProcessSupervisor
+
+
+# Length of a Claude usage window; windows start at the top of the hour
+SESSION_WINDOW_HOURS = 5
+
+# Failure classes reported through SessionManager.last_failure
+FAILURE_CLAUDE_MISSING = 'claude_missing'
+FAILURE_AUTH = 'auth'
+FAILURE_TIMEOUT = 'timeout'
+FAILURE_USAGE_LIMIT = 'usage_limit'
+FAILURE_RATE_LIMITED = 'rate_limited'
+FAILURE_ERROR = 'error'
+
+AUTH_ERROR_MARKERS = ('invalid api key', 'please run /login', 'not logged in',
+                      'authentication_error', 'oauth token has expired')
+
+
+# Result details written to the session marker, in order
+MARKER_FIELDS = (
+    ('session_id', 'Session ID'),
+    ('model', 'Model'),
+    ('duration_ms', 'Duration (ms)'),
+    ('num_turns', 'Turns'),
+    ('cost_usd', 'Cost (USD)'),
+    ('input_tokens', 'Input tokens'),
+    ('output_tokens', 'Output tokens'),
+    ('cache_read_tokens', 'Cache read tokens'),
+)
+
+
+def _usage_limit_reset(text: str):
+    """Reset time of a usage-limit message, or None if text is not one (or has none)"""
+    return parse_reset_time(text) if is_usage_limit(text) else None
+
+
+def _text(output) -> str:
+    """Captured output as text; TimeoutExpired may carry bytes or None"""
+    if isinstance(output, bytes):
+        return output.decode(errors='replace')
+    return output or ""
+
+
+def parse_session_marker(text: str) -> dict:
+    """Parse the 'Key: value' lines of a session marker into a dict"""
+    fields = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(': ')
+        if sep:
+            fields[key.strip()] = value.strip()
+    return fields
 
 
 class SessionManager:
@@ -17,10 +79,31 @@ class SessionManager:
         self.session_dir = self.config.session_directory
         self.max_retries = 3
         self.retry_delay = 5  # seconds
+        self.default_timeout = 30  # seconds, used until enough history exists
         self.claude_path = 'claude'  # Will be updated by _check_claude_available
+        self.node_bin = None  # node bin dir of the pinned installation, if any
+        self._pin = None
+        self.use_worker = False  # Send the opener to a resident claude (see src/worker.py)
+        self._worker = None
+        self.last_failure = None  # One of the FAILURE_* classes after a failed start
+        self.history = RunHistory(self.config.config_dir / "history.jsonl")
+        self.stats = RunHistory(self.config.config_dir / "stats.jsonl", max_entries=500)
+        self.prewarm_state = PrewarmState(self.config.config_dir / "prewarm.json")
+        self.deferred = DeferredStart(self.config.config_dir / "deferred.json")
+        self.deferred_until = None  # Set while a usage-limit deferral is pending
+        self.retry_after = None  # Seconds until the start rate limiter admits a start
+        self.artifacts = ArtifactStore(self.config.config_dir / "runs",
+                                       int(self.config.get_setting('artifact_max_mb', 20) * 1024 * 1024))
+        self.last_run_id = None  # Artifact id of the most recent attempt
     
     def _check_claude_available(self) -> bool:
         """Check if claude command is available"""
+        pin = self._pinned_installation()
+        if pin:
+            self.claude_path = pin['claude_path']
+            self.node_bin = pin['node_bin']
+            return True
+        
         # Try to find claude using which command first
         try:
             result = subprocess.run(['which', 'claude'], 
@@ -31,27 +114,15 @@ class SessionManager:
         except subprocess.CalledProcessError:
             pass
         
-        # Common paths where claude might be installed
-        common_dirs = [
-            '/usr/local/bin',
-            '/opt/homebrew/bin',
-            os.path.expanduser('~/.local/bin'),
-        ]
-        
-        # Check NVM paths if NVM_DIR exists
-        nvm_dir = os.environ.get('NVM_DIR', os.path.expanduser('~/.nvm'))
-        if os.path.exists(nvm_dir):
-            # Look for node versions
-            versions_dir = os.path.join(nvm_dir, 'versions', 'node')
-            if os.path.exists(versions_dir):
-                for version in os.listdir(versions_dir):
-                    bin_path = os.path.join(versions_dir, version, 'bin', 'claude')
-                    if os.path.exists(bin_path):
-                        self.claude_path = bin_path
-                        return True
+        # Check NVM paths (sorted, so the choice doesn't depend on directory order)
+        for bin_dir in nvm_bin_dirs():
+            bin_path = os.path.join(bin_dir, 'claude')
+            if os.path.exists(bin_path):
+                self.claude_path = bin_path
+                return True
         
         # Check common paths
-        for dir_path in common_dirs:
+        for dir_path in common_bin_dirs():
             claude_path = os.path.join(dir_path, 'claude')
             if os.path.exists(claude_path):
                 self.claude_path = claude_path
@@ -60,26 +131,55 @@ class SessionManager:
         self.claude_path = 'claude'  # Default fallback
         return False
     
+    def _pinned_installation(self) -> dict:
+        """The calibrated claude pin, recalibrated when the installations changed"""
+        if self._pin is not None:
+            return self._pin
+        pin = self.config.get_setting('claude_pin')
+        if not pin:
+            return None
+        
+        candidates = find_candidates()
+        if pin.get('fingerprint') != fingerprint(candidates):
+            if not self.config.get_setting('auto_calibrate', True):
+                self.logger.warning("claude installations changed since calibration, ignoring pin")
+                return None
+            self.logger.info("claude installations changed, recalibrating")
+            pin = self.calibrate(candidates=candidates)
+        
+        if not pin.get('claude_path') or not os.path.exists(pin['claude_path']):
+            return None
+        self._pin = pin
+        return pin
+    
+    def calibrate(self, runs: int = None, candidates: list = None) -> dict:
+        """Time all claude candidates and pin the fastest healthy one"""
+        runs = runs or self.config.get_setting('calibrate_runs', 3)
+        pin = calibrate(runs=runs, candidates=candidates)
+        self.config.set_setting('claude_pin', pin)
+        if pin['claude_path']:
+            seconds = pin['timings'][pin['claude_path']]
+            self.logger.info(f"Pinned {pin['claude_path']} ({seconds:.2f}s to start)")
+        else:
+            self.logger.warning("Calibration found no working claude installation")
+        self._pin = None
+        return pin
+    
     def _get_node_env(self) -> dict:
         """Get environment with node in PATH for cron execution"""
         env = os.environ.copy()
         
         # Common node installation paths
-        node_paths = [
-            '/usr/local/bin',
-            '/opt/homebrew/bin',
-            os.path.expanduser('~/.local/bin'),
-        ]
+        node_paths = common_bin_dirs()
         
         # Add NVM paths if available
-        nvm_dir = os.environ.get('NVM_DIR', os.path.expanduser('~/.nvm'))
-        if os.path.exists(nvm_dir):
-            versions_dir = os.path.join(nvm_dir, 'versions', 'node')
-            if os.path.exists(versions_dir):
-                for version in os.listdir(versions_dir):
-                    bin_path = os.path.join(versions_dir, version, 'bin')
-                    if os.path.exists(bin_path):
-                        node_paths.insert(0, bin_path)
+        for bin_path in reversed(nvm_bin_dirs()):
+            if os.path.exists(bin_path):
+                node_paths.insert(0, bin_path)
+        
+        # The pinned installation's node comes first
+        if self.node_bin:
+            node_paths.insert(0, self.node_bin)
         
         # Add all potential node paths to PATH
         existing_path = env.get('PATH', '')
@@ -104,63 +204,364 @@ class SessionManager:
         
         return env
     
-    def _start_claude_session(self) -> bool:
+    def compute_timeout(self, attempt: int = 1) -> float:
+        """Derive the spawn timeout from the latency of recent successful starts
+        
+        The base timeout is a multiple of a high percentile of past start
+        durations, clamped to [floor, ceiling]. Each retry multiplies it by the
+        backoff factor so a slow-but-healthy cold start still gets through.
+        Without enough history every attempt gets the fixed default, so a
+        fresh install still fails fast on a hang.
+        """
+        pct = self.config.get_setting('timeout_percentile', 95)
+        multiplier = self.config.get_setting('timeout_multiplier', 2.0)
+        floor = self.config.get_setting('timeout_floor', 10)
+        ceiling = self.config.get_setting('timeout_ceiling', 90)
+        min_samples = self.config.get_setting('timeout_min_samples', 5)
+        backoff = self.config.get_setting('timeout_retry_backoff', 2.0)
+        
+        samples = self.history.latencies()
+        if len(samples) < min_samples:
+            return self.default_timeout
+        
+        timeout = percentile(samples, pct) * multiplier * backoff ** (attempt - 1)
+        return round(min(max(timeout, floor), ceiling), 1)
+    
+    def _get_supervisor(self) -> ProcessSupervisor:
+        """Build the process supervisor from configured limits"""
+        return ProcessSupervisor(
+            grace_period=self.config.get_setting('kill_grace_seconds', 5),
+            rlimit_as_mb=self.config.get_setting('rlimit_as_mb'),
+            rlimit_cpu_seconds=self.config.get_setting('rlimit_cpu_seconds'),
+        )
+    
+    def _start_claude_session(self, timeout: float = None) -> bool:
         """Start a Claude Code session in background"""
         if not self._check_claude_available():
             self.logger.error("claude command not found")
+            self.last_failure = FAILURE_CLAUDE_MISSING
             return False
         
+        cache = None
+        supervisor = None
+        run_id = self.last_run_id = new_run_id()
+        env = {}
         try:
             # Change to session directory
             os.chdir(self.session_dir)
-            self.logger.info(f"Starting Claude Code session in {self.session_dir}")
+            self.logger.info(f"Starting Claude Code session in {self.session_dir} (run {run_id})")
             
             # Get environment with proper PATH for node
             env = self._get_node_env()
+            cache, cache_state = self._prepare_compile_cache(env)
             
             # Start claude with a simple message to initiate a session
             # Using --print to avoid interactive mode but still create a session
-            process = subprocess.Popen(
-                [self.claude_path, '--print', '--dangerously-skip-permissions', 'Session started automatically at ' + time.strftime('%Y-%m-%d %H:%M:%S')],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=self.session_dir,
-                env=env
-            )
+            opener = 'Session started automatically at ' + time.strftime('%Y-%m-%d %H:%M:%S')
+            result = StreamResult()
+            started = time.monotonic()
+            if self.use_worker:
+                returncode, stdout, stderr = self._get_worker(env).send(
+                    opener, timeout=timeout or self.default_timeout, on_line=result.feed
+                )
+            else:
+                supervisor = self._get_supervisor()
+                returncode, stdout, stderr = supervisor.run(
+                    [self.claude_path, '--print', '--dangerously-skip-permissions', *STREAM_JSON_ARGS, opener],
+                    timeout=timeout or self.default_timeout,
+                    on_line=result.feed,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    cwd=self.session_dir,
+                    env=env
+                )
+            duration = time.monotonic() - started
+            first_output = None
+            prewarmed = self.prewarm_state.minutes_since(max_minutes=120)
+            if result.first_line_at is not None:
+                first_output = round(result.first_line_at - started, 3)
+                self.logger.info(f"First output after {first_output:.2f}s (compile cache {cache_state}"
+                                 + (f", prewarmed {prewarmed:g} min earlier)" if prewarmed is not None else ")"))
+            else:
+                # Nothing was streamed through feed(); parse what was captured
+                for line in stdout.splitlines():
+                    result.feed(line)
             
-            # Wait for completion
-            stdout, stderr = process.communicate(timeout=30)
+            failure, message, reset = self._classify_result(returncode, result, stdout, stderr)
+            details = result.summary()
+            if supervisor is not None:
+                self._record_usage(run_id, supervisor.last_usage, returncode=returncode,
+                                   duration=round(duration, 3))
+            self._save_artifact(run_id, env, stdout, stderr, returncode=returncode,
+                                failure=failure, duration=round(duration, 3))
+            self.history.record(ok=failure is None, duration=round(duration, 3),
+                                timeout=timeout, returncode=returncode, first_output=first_output,
+                                compile_cache=cache_state, prewarmed_minutes=prewarmed, run_id=run_id, **details)
             
-            if process.returncode == 0:
-                self.logger.info("Claude Code session initiated successfully")
-                self.logger.info(f"Response: {stdout[:100]}...")  # Log first 100 chars
-                self.create_session_marker()
+            if failure is None:
+                self.logger.info(f"Claude Code session initiated successfully in {duration:.1f}s")
+                if result.session_id:
+                    self.logger.info(f"Session ID: {result.session_id}")
+                self.logger.info(f"Response: {message[:100]}...")  # Log first 100 chars
+                self.create_session_marker(details)
                 return True
-            else:
-                self.logger.error(f"Claude Code session failed with code {process.returncode}")
-                self.logger.error(f"stderr: {stderr}")
-                self.logger.error(f"stdout: {stdout}")
-                self.logger.error(f"PATH: {env.get('PATH', 'NOT SET')}")
-                self.logger.error(f"claude_path: {self.claude_path}")
+            
+            self.last_failure = failure
+            if failure == FAILURE_USAGE_LIMIT:
+                self.logger.warning(f"Usage limit reached: {message.strip()} (run {run_id})")
+                self.defer_start(reset)
                 return False
             
-        except subprocess.TimeoutExpired:
-            self.logger.error("Claude session startup timed out")
-            process.kill()
+            summary = message if result.complete else (stderr.strip() or stdout.strip())
+            self.logger.error(f"Claude Code session failed with code {returncode}"
+                              + (f" ({result.error_type})" if result.error_type else "")
+                              + f": {summary.splitlines()[0][:200] if summary else 'no output'}"
+                              + f" (run {run_id}, see 'logs run {run_id}')")
+            return False
+            
+        except subprocess.TimeoutExpired as e:
+            if supervisor is not None:
+                self._record_usage(run_id, supervisor.last_usage, returncode=None, duration=None)
+            self._save_artifact(run_id, env, _text(e.output), _text(e.stderr), failure=FAILURE_TIMEOUT)
+            self.history.record(ok=False, duration=None, timeout=timeout, returncode=None, run_id=run_id)
+            self.logger.error(f"Claude session startup timed out after {timeout or self.default_timeout}s"
+                              f" (run {run_id})")
+            self.last_failure = FAILURE_TIMEOUT
             return False
         except Exception as e:
             self.logger.error(f"Error starting Claude Code session: {e}")
+            self.last_failure = FAILURE_ERROR
             return False
+        finally:
+            if cache is not None:
+                freed = cache.trim()
+                if freed:
+                    self.logger.debug(f"Evicted {freed / 1024:.0f} KB from the compile cache")
+    
+    def _record_usage(self, run_id: str, usage, **fields):
+        """Log the reaped child's resource usage and append it to stats.jsonl"""
+        if not isinstance(usage, dict):
+            return
+        self.logger.info(f"Resources: {usage['user_cpu']:.2f}s user / {usage['system_cpu']:.2f}s system CPU, "
+                         f"peak RSS {usage['max_rss_mb']:.1f} MB, "
+                         f"{usage['voluntary_ctx']}/{usage['involuntary_ctx']} context switches")
+        self.stats.record(run_id=run_id, **fields, **usage)
+    
+    def _save_artifact(self, run_id: str, env: dict, stdout: str, stderr: str, **meta):
+        """Keep the full output of one attempt in the artifact store"""
+        meta = dict(run=run_id, time=time.strftime('%Y-%m-%d %H:%M:%S'), **meta,
+                    claude_path=self.claude_path, PATH=env.get('PATH', 'NOT SET'))
+        try:
+            self.artifacts.save(run_id, meta, stdout or "", stderr or "")
+        except OSError as e:
+            self.logger.warning(f"Failed to save run artifact {run_id}: {e}")
+    
+    def _get_worker(self, env: dict):
+        """The resident claude worker, created on first use"""
+        if self._worker is None:
+            from src.worker import STREAM_INPUT_ARGS, ClaudeWorker
+
+            self._worker = ClaudeWorker(
+                [self.claude_path, '--print', '--dangerously-skip-permissions',
+                 *STREAM_INPUT_ARGS, *STREAM_JSON_ARGS],
+                env=env,
+                cwd=str(self.session_dir),
+                max_messages=self.config.get_setting('worker_max_messages', 20),
+                max_age=self.config.get_setting('worker_max_hours', 24) * 3600,
+                grace_period=self.config.get_setting('kill_grace_seconds', 5),
+            )
+        return self._worker
+    
+    def warm_worker(self):
+        """Spawn (or respawn) the resident worker ahead of the next start"""
+        if not self._check_claude_available():
+            self.logger.error("claude command not found")
+            return
+        env = self._get_node_env()
+        self._prepare_compile_cache(env)
+        try:
+            self._get_worker(env).ensure()
+        except OSError as e:
+            self.logger.error(f"Failed to spawn worker: {e}")
+    
+    def close_worker(self):
+        """Stop the resident worker"""
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
+    
+    def prewarm(self) -> dict:
+        """Read node and claude's package tree into the page cache ahead of a start"""
+        from src.prewarm import prewarm, prewarm_files
+        if not self._check_claude_available():
+            self.logger.error("claude command not found")
+            return None
+        env = self._get_node_env()
+        node = os.path.join(self.node_bin, 'node') if self.node_bin else shutil.which('node', path=env['PATH'])
+        result = prewarm(prewarm_files(self.claude_path, node),
+                         int(self.config.get_setting('prewarm_max_mb', 256) * 1024 * 1024),
+                         self.config.get_setting('prewarm_method', 'auto'))
+        self.logger.info(f"Prewarmed {result['files']} files ({result['bytes'] / (1024 * 1024):.1f} MB) "
+                         f"via {result['method']} in {result['seconds']:.2f}s")
+        try:
+            self.prewarm_state.save(result)
+        except OSError as e:
+            self.logger.warning(f"Failed to record prewarm: {e}")
+        return result
+    
+    def _prepare_compile_cache(self, env: dict):
+        """Point node at the managed compile cache; returns (cache or None, state)"""
+        if not self.config.get_setting('node_compile_cache', True):
+            return None, 'off'
+        cache = CompileCache(self.config.config_dir / "node-compile-cache",
+                             int(self.config.get_setting('node_compile_cache_mb', 64) * 1024 * 1024))
+        node = os.path.join(self.node_bin, 'node') if self.node_bin else shutil.which('node', path=env['PATH'])
+        try:
+            state = cache.prepare(self.claude_path, node)
+        except OSError as e:
+            self.logger.warning(f"Compile cache unavailable: {e}")
+            return None, 'off'
+        if state == 'off':
+            return None, state
+        env.update(cache.env())
+        return cache, state
+    
+    def _classify_result(self, returncode: int, result: StreamResult, stdout: str, stderr: str):
+        """Return (failure class or None, message, usage-limit reset time or None)
+        
+        The structured result event decides when present; the raw output is
+        only searched when claude produced no JSON at all. A usage limit
+        stops retries, so it is only reported when its reset time can be
+        read; anything else stays a retryable error.
+        """
+        if result.complete:
+            message = result.text
+            if returncode == 0 and not result.is_error:
+                return None, message, None
+            reset = _usage_limit_reset(message)
+            if reset is not None:
+                return FAILURE_USAGE_LIMIT, message, reset
+            if result.result.get('api_error_status') in (401, 403) or \
+                    any(marker in message.lower() for marker in AUTH_ERROR_MARKERS):
+                return FAILURE_AUTH, message, None
+            return FAILURE_ERROR, message, None
+        
+        output = f"{stderr}\n{stdout}"
+        # The limit message may be on either stream; report the one it was read from
+        for text in (stdout, stderr, output):
+            reset = _usage_limit_reset(text)
+            if reset is not None:
+                # claude may exit 0 while only printing the limit message
+                return FAILURE_USAGE_LIMIT, text.strip(), reset
+        if returncode == 0:
+            return None, stdout, None
+        if any(marker in output.lower() for marker in AUTH_ERROR_MARKERS):
+            return FAILURE_AUTH, output, None
+        return FAILURE_ERROR, output, None
+    
+    def check_credentials(self) -> bool:
+        """Fail fast when claude's stored credentials can't possibly work"""
+        if not self.config.get_setting('credential_check', True):
+            return True
+        if not self._check_claude_available():
+            return True  # _start_claude_session reports the missing binary
+        
+        checker = CredentialChecker(
+            self.config.config_dir / "credential_check.json",
+            claude_path=self.claude_path,
+            ttl=self.config.get_setting('credential_cache_seconds', 60),
+            env=self._get_node_env(),
+        )
+        status, message = checker.check()
+        if status in DOOMED:
+            self.logger.error(f"Skipping start: {message}")
+            self.last_failure = FAILURE_CLAUDE_MISSING if status == 'unavailable' else FAILURE_AUTH
+            return False
+        self.logger.debug(f"Credential check: {message}")
+        return True
+    
+    def allow_start(self) -> bool:
+        """Take a token from the persistent start limiter (start_rate_per_hour, start_burst)"""
+        rate = self.config.get_setting('start_rate_per_hour', 6)
+        if not rate:
+            return True
+        bucket = TokenBucket(self.config.config_dir / "start_bucket.json", rate,
+                             self.config.get_setting('start_burst', 3))
+        try:
+            allowed, wait = bucket.acquire()
+        except OSError as e:
+            self.logger.warning(f"Start rate limiter unavailable: {e}")
+            return True
+        if not allowed:
+            self.last_failure = FAILURE_RATE_LIMITED
+            self.retry_after = wait
+            self.logger.warning(f"Start rejected by rate limiter ({rate}/hour), next token in {wait:.0f}s")
+        return allowed
+    
+    def defer_start(self, reset: float):
+        """Persist a one-shot start just after the usage limit resets"""
+        at = reset + self.config.get_setting('usage_limit_margin_seconds', 60)
+        try:
+            self.deferred.save(at, FAILURE_USAGE_LIMIT)
+        except OSError as e:
+            self.logger.warning(f"Failed to persist deferred start: {e}")
+        self.deferred_until = at
+        self.logger.info(f"Deferring next start to {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(at))}")
+    
+    def _check_deferral(self) -> bool:
+        """False while a usage-limit deferral is pending; consumes one that is due"""
+        deferred = self.deferred.load()
+        if deferred is None:
+            return True
+        if deferred['at'] > time.time():
+            self.deferred_until = deferred['at']
+            self.last_failure = FAILURE_USAGE_LIMIT
+            self.logger.info("Usage limit still in effect, skipping start until "
+                             f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(deferred['at']))}")
+            return False
+        self.deferred.clear()
+        self.logger.info("Running deferred start")
+        return True
+    
+    def _run_hooks(self, event: str, **context) -> HookRun:
+        """Start the hooks configured for event in the background"""
+        hooks = load_hooks(self.config.get_setting('hooks') or {}, event)
+        return HookRun(event, hooks, context).start()
     
     def start_session(self) -> bool:
         """Start a Claude session with retry logic"""
+        self.last_failure = None
+        self.deferred_until = None
+        if not self._check_deferral():
+            return False
+        
+        # Pre-start hooks run while the binary, environment and credentials are resolved
+        pre_hooks = self._run_hooks('pre_start')
+        try:
+            self._check_claude_available()
+            if not self.check_credentials():
+                return False
+        finally:
+            pre_hooks.wait()
+        
+        started = False
         for attempt in range(1, self.max_retries + 1):
-            self.logger.info(f"Attempting to start session (attempt {attempt}/{self.max_retries})")
+            timeout = self.compute_timeout(attempt)
+            self.logger.info(f"Attempting to start session (attempt {attempt}/{self.max_retries}, timeout {timeout}s)")
             
-            if self._start_claude_session():
+            if self._start_claude_session(timeout):
                 self.logger.info("Session started successfully")
-                return True
+                started = True
+                break
+            
+            if self.last_failure in (FAILURE_CLAUDE_MISSING, FAILURE_AUTH):
+                # Retrying cannot fix a missing binary or bad credentials
+                self.logger.error("Not retrying: claude is missing or not authenticated")
+                break
+            if self.last_failure == FAILURE_USAGE_LIMIT:
+                # The deferred start takes over once the limit resets
+                break
             
             if attempt < self.max_retries:
                 self.logger.warning(f"Attempt {attempt} failed, retrying in {self.retry_delay} seconds")
@@ -168,28 +569,50 @@ class SessionManager:
             else:
                 self.logger.error("All attempts failed")
         
-        return False
+        post_hooks = self._run_hooks('post_start', ok=started, failure=self.last_failure)
+        if started and self.config.get_setting('gc_after_start', False):
+            self.collect_transcripts()
+        post_hooks.wait()
+        return started
+    
+    def collect_transcripts(self, dry_run: bool = False) -> dict:
+        """Apply the transcript retention policy to the automation session directory"""
+        from src.transcripts import TranscriptStore
+        try:
+            store = TranscriptStore(self.session_dir)
+            return store.collect(self.config.get_setting('transcript_retention'), dry_run=dry_run)
+        except OSError as e:
+            self.logger.warning(f"Transcript gc failed: {e}")
+            return {}
     
-    def create_session_marker(self):
-        """Create a marker file to track session creation"""
+    def create_session_marker(self, details: dict = None):
+        """Create a marker file to track session creation
+        
+        The first two lines are unchanged from the original format; details
+        from claude's result are appended as further 'Key: value' lines.
+        """
         marker_file = self.session_dir / ".claude_session_marker"
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        details = details or {}
         
         try:
             with open(marker_file, 'w') as f:
                 f.write(f"Session started at: {timestamp}\n")
                 f.write(f"Expected end time: {self.calculate_session_end_time()}\n")
+                for key, label in MARKER_FIELDS:
+                    if details.get(key) is not None:
+                        f.write(f"{label}: {details[key]}\n")
             self.logger.info(f"Created session marker: {marker_file}")
         except IOError as e:
             self.logger.warning(f"Failed to create session marker: {e}")
     
-    def calculate_session_end_time(self) -> str:
+    def calculate_session_end_time(self, now=None) -> str:
         """Calculate expected session end time (5 hours from start)"""
         from datetime import datetime, timedelta
         # Session starts at the beginning of the hour
-        now = datetime.now()
+        now = now or datetime.now()
         session_start = now.replace(minute=0, second=0, microsecond=0)
-        session_end = session_start + timedelta(hours=5)
+        session_end = session_start + timedelta(hours=SESSION_WINDOW_HOURS)
         return session_end.strftime("%Y-%m-%d %H:%M:%S")
     
     def check_session_health(self) -> bool:
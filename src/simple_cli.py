@@ -2,196 +2,631 @@
 """Simple CLI interface for Claude Code Session Automation"""
 
 import sys
-import platform
-from src.session import SessionManager
-from src.logger import setup_logger
-from src.launchagent import LaunchAgentManager
+from pathlib import Path
+from src.output import (
+    CommandOutput, EXIT_AUTH_FAILURE, EXIT_CLAUDE_MISSING, EXIT_ERROR,
+    EXIT_NOT_INSTALLED, EXIT_NOT_LOADED, EXIT_OK, EXIT_RATE_LIMITED, EXIT_TIMEOUT,
+    EXIT_USAGE_LIMIT,
+)
+from src.profiling import default_profile_path, extract_profile_options, run_profiled
+from src.session import (
+    FAILURE_AUTH, FAILURE_CLAUDE_MISSING, FAILURE_TIMEOUT, FAILURE_USAGE_LIMIT, SessionManager,
+    parse_session_marker,
+)
+from src.history import RunHistory, rolling_means
+from src.logger import setup_logger, read_backup_lines
+from src.scheduler import get_scheduler
 
 
 def main():
     """Main entry point"""
-    if len(sys.argv) < 2:
-        print_help()
+    args, profile, trace_memory = extract_profile_options(sys.argv[1:])
+    if profile is None:
+        _dispatch()
         return
     
-    command = sys.argv[1].lower()
+    sys.argv = sys.argv[:1] + args
+    command = args[0].lower() if args else 'help'
+    output = Path(profile) if profile else default_profile_path(command)
+    try:
+        run_profiled(_dispatch, output, trace_memory=trace_memory)
+    finally:
+        print(f"Profile written to {output} (summary: {output.with_suffix('.txt')})", file=sys.stderr)
+
+
+def _dispatch():
+    """Route sys.argv to the command handlers"""
+    json_mode = '--json' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--json']
+    
+    if not args:
+        out = CommandOutput('help', json_mode)
+        print_help(out)
+        out.finish()
+        return
     
+    command = args[0].lower()
+    out = CommandOutput(command, json_mode)
+    _run_command(command, args[1:], out)
+    out.finish()
+
+
+def _run_command(command, args, out):
+    """Run one command's handler"""
     if command == 'schedule':
-        handle_schedule(sys.argv[2:])
+        handle_schedule(args, out)
     elif command == 'list':
-        handle_list()
+        handle_list(out)
     elif command == 'clear':
-        handle_clear()
+        handle_clear(out)
     elif command == 'start':
-        handle_start()
+        handle_start(args, out)
     elif command == 'status':
-        handle_status()
+        handle_status(args, out)
+    elif command == 'simulate':
+        handle_simulate(args, out)
+    elif command == 'serve':
+        handle_serve(args, out)
+    elif command == 'gc':
+        handle_gc(args, out)
     elif command == 'logs':
-        handle_logs(sys.argv[2:] if len(sys.argv) > 2 else [])
+        handle_logs(args, out)
+    elif command == 'calibrate':
+        handle_calibrate(args, out)
+    elif command == 'worker':
+        handle_worker(args, out)
+    elif command == 'prewarm':
+        handle_prewarm(out)
+    elif command == 'batch':
+        handle_batch(args, out)
     elif command in ['-h', '--help', 'help']:
-        print_help()
+        out.command = 'help'
+        print_help(out)
     else:
-        print(f"Error: Unknown command '{command}'")
-        print_help()
-        sys.exit(1)
+        out.print(f"Error: Unknown command '{command}'")
+        print_help(out)
+        out.finish(EXIT_ERROR, error=f"Unknown command '{command}'")
 
 
-def print_help():
+def print_help(out=None):
     """Print help message"""
-    print("Claude Code Session Automation Tool")
-    print()
-    print("Usage:")
-    print("  claude-code-automation schedule <time1> [time2] ...  Schedule sessions (HH:MM or HHMM)")
-    print("  claude-code-automation list                          List scheduled sessions")
-    print("  claude-code-automation clear                         Clear all scheduled sessions")
-    print("  claude-code-automation start                         Manually start a session")
-    print("  claude-code-automation status                        Show current status")
-    print("  claude-code-automation logs [type] [lines]           Show logs (app, launch, error)")
-    print("  claude-code-automation help                          Show this help")
-    print()
-    print("Examples:")
-    print("  claude-code-automation schedule 14:30 16:00         Schedule at 2:30 PM and 4:00 PM")
-    print("  claude-code-automation schedule 1430 1600           Schedule at 2:30 PM and 4:00 PM")
-    print("  claude-code-automation logs app 50                  Show last 50 lines of app logs")
-    print("  claude-code-automation logs launch                  Show LaunchAgent output logs")
-    print("  claude-code-automation logs error                   Show LaunchAgent error logs")
-
-
-def handle_schedule(times):
+    out = out or CommandOutput('help')
+    help_lines = [
+        "Claude Code Session Automation Tool",
+        "",
+        "Usage:",
+        "  claude-code-automation schedule <time1> [time2] ...  Schedule sessions (HH:MM or HHMM)",
+        "  claude-code-automation schedule --from-ics <file>    Schedule windows covering calendar events",
+        "  claude-code-automation list                          List scheduled sessions",
+        "  claude-code-automation clear                         Clear all scheduled sessions",
+        "  claude-code-automation start                         Manually start a session",
+        "  claude-code-automation start --deferred              Start only if a usage-limit deferral is due",
+        "  claude-code-automation status [--watch]              Show current status (live with --watch)",
+        "  claude-code-automation simulate [times] [options]    Simulate a schedule over N days",
+        "  claude-code-automation serve [--port N]              Serve status/metrics on localhost HTTP",
+        "  claude-code-automation gc [--dry-run]                Compress/prune automation transcripts",
+        "  claude-code-automation logs [type] [lines]           Show logs (app, launch, error)",
+        "  claude-code-automation logs run [id]                 List runs or show one run's full output",
+        "  claude-code-automation calibrate [--runs N]          Time claude installations, pin the fastest",
+        "  claude-code-automation worker [times]                Keep claude resident, open windows over stdin",
+        "  claude-code-automation prewarm                       Read claude's installation into the page cache",
+        "  claude-code-automation batch [file|-]                Run one command per line in a single process",
+        "  claude-code-automation help                          Show this help",
+        "",
+        "Global options:",
+        "  --json             Emit one JSON document instead of text (see docs for exit codes)",
+        "  --profile[=path]   Profile the command (cProfile .pstats + top-N summary next to the logs)",
+        "  --tracemalloc      Also trace memory allocations (implies --profile)",
+        "",
+        "Examples:",
+        "  claude-code-automation schedule 14:30 16:00         Schedule at 2:30 PM and 4:00 PM",
+        "  claude-code-automation schedule 1430 1600           Schedule at 2:30 PM and 4:00 PM",
+        "  claude-code-automation logs app 50                  Show last 50 lines of app logs",
+        "  claude-code-automation logs launch                  Show LaunchAgent output logs",
+        "  claude-code-automation logs error                   Show LaunchAgent error logs",
+        "  claude-code-automation simulate 06:00 11:00 16:00 --days 365 --fail-prob 0.05 --sleep 00:30-07:30",
+    ]
+    for line in help_lines:
+        out.print(line)
+    out.update(usage=help_lines)
+
+
+# Instances shared by the commands of one 'batch' run; None outside a batch
+_batch_instances = None
+
+
+def _get_scheduler():
+    """Scheduler backend for this platform (see get_scheduler), shared within a batch"""
+    if _batch_instances is not None and 'scheduler' in _batch_instances:
+        return _batch_instances['scheduler']
+    agent = get_scheduler()
+    if _batch_instances is not None:
+        if agent is not None:
+            agent.defer_reload()
+        _batch_instances['scheduler'] = agent
+    return agent
+
+
+def _get_session_manager():
+    """SessionManager for a command, shared within a batch"""
+    if _batch_instances is None:
+        return SessionManager()
+    if 'session_manager' not in _batch_instances:
+        _batch_instances['session_manager'] = SessionManager()
+    return _batch_instances['session_manager']
+
+
+def handle_schedule(times, out=None):
     """Handle schedule command"""
+    out = out or CommandOutput('schedule')
     if not times:
-        print("Error: No times specified")
-        print("Usage: claude-code-automation schedule <time1> [time2] ...")
-        sys.exit(1)
+        out.print("Error: No times specified")
+        out.print("Usage: claude-code-automation schedule <time1> [time2] ...")
+        out.finish(EXIT_ERROR, error="No times specified")
     
-    if platform.system() != 'Darwin':
-        print("Error: Scheduling is only available on macOS")
-        sys.exit(1)
+    agent = _get_scheduler()
+    if agent is None:
+        out.fail("Error: Scheduling is only available on macOS and Linux (systemd)")
     
     setup_logger()
-    agent = LaunchAgentManager()
+    
+    if times[0] == '--from-ics':
+        _schedule_from_ics(agent, times[1:], out)
+        return
     
     # Validate time formats
+    from src.schedule import parse_entry
     for time_str in times:
-        if ':' in time_str:
-            parts = time_str.split(':')
-            if len(parts) != 2 or not all(p.isdigit() for p in parts):
-                print(f"Error: Invalid time format '{time_str}'. Use HH:MM or HHMM")
-                sys.exit(1)
-            hour, minute = int(parts[0]), int(parts[1])
-            if not (0 <= hour <= 23) or not (0 <= minute <= 59):
-                print(f"Error: Invalid time format '{time_str}'. Use HH:MM or HHMM")
-                sys.exit(1)
-        elif len(time_str) == 4 and time_str.isdigit():
-            hour, minute = int(time_str[:2]), int(time_str[2:])
-            if not (0 <= hour <= 23) or not (0 <= minute <= 59):
-                print(f"Error: Invalid time format '{time_str}'. Use HH:MM or HHMM")
-                sys.exit(1)
-        else:
-            print(f"Error: Invalid time format '{time_str}'. Use HH:MM or HHMM")
-            sys.exit(1)
+        try:
+            parse_entry(time_str)
+        except ValueError:
+            out.fail(f"Error: Invalid time format '{time_str}'. Use HH:MM, HHMM or 'YYYY-MM-DD HH:MM'")
     
     # Install LaunchAgent
     if agent.install(times):
-        print(f"✓ Scheduled sessions at: {', '.join(times)}")
-        print("Use 'claude-code-automation list' to view current schedule")
+        out.update(schedule=times)
+        out.print(f"✓ Scheduled sessions at: {', '.join(times)}")
+        out.print("Use 'claude-code-automation list' to view current schedule")
     else:
-        print("✗ Failed to schedule sessions")
-        sys.exit(1)
+        out.fail("✗ Failed to schedule sessions")
 
 
-def handle_list():
-    """Handle list command"""
-    if platform.system() != 'Darwin':
-        print("Error: This command is only available on macOS")
-        sys.exit(1)
+def _schedule_from_ics(agent, args, out):
+    """Install window starts derived from an ICS calendar"""
+    from src.calendar_sync import CalendarSync
+    
+    if not args:
+        out.fail("Error: --from-ics requires a calendar file")
+    horizon = agent.config.get_setting('calendar_horizon_days', 14)
+    if '--horizon' in args:
+        index = args.index('--horizon')
+        try:
+            horizon = int(args[index + 1])
+        except (IndexError, ValueError):
+            out.fail("Error: --horizon requires a number of days")
+    
+    calendar_sync = CalendarSync(agent.config.config_dir / "calendar.json", horizon_days=horizon)
+    try:
+        result = calendar_sync.sync(Path(args[0]).expanduser())
+    except OSError as e:
+        out.fail(f"Error: Cannot read calendar: {e}")
+    entries = result['entries']
+    out.update(schedule=entries, busy_days=result['days'], changed_days=result['changed'],
+               removed_days=result['removed'])
+    if not entries:
+        out.fail("✗ No upcoming busy time in the calendar")
     
-    agent = LaunchAgentManager()
-    status = agent.status()
+    # Only rewrite the schedule when the derived starts differ from it
+    if agent.get_schedule_times() == entries:
+        out.update(installed=False)
+        out.print(f"✓ Calendar unchanged, {len(entries)} starts already scheduled")
+        return
+    if not agent.install(entries):
+        out.fail("✗ Failed to schedule sessions")
+    out.update(installed=True)
+    out.print(f"✓ Scheduled {len(entries)} starts over {horizon} days "
+              f"({result['changed']} days re-derived)")
+    out.print("Use 'claude-code-automation list' to view current schedule")
+
+
+def handle_list(out=None):
+    """Handle list command"""
+    out = out or CommandOutput('list')
+    agent = _get_scheduler()
+    if agent is None:
+        out.fail("Error: This command is only available on macOS and Linux (systemd)")
+    info = agent.status_info()
+    out.update(service=info, schedule=[])
     
     # Check if plist exists
-    if not agent.plist_path.exists():
-        print("No sessions scheduled")
+    if not agent.definition_path.exists():
+        out.print("No sessions scheduled")
         return
     
     # Read plist to get schedule
     try:
-        import plistlib
-        with open(agent.plist_path, 'rb') as f:
-            plist = plistlib.load(f)
-        
-        intervals = plist.get('StartCalendarInterval', [])
-        if not isinstance(intervals, list):
-            intervals = [intervals]
-        
-        print("Scheduled sessions:")
-        for interval in intervals:
-            hour = interval.get('Hour', 0)
-            minute = interval.get('Minute', 0)
-            print(f"  - {hour:02d}:{minute:02d}")
-        
-        print(f"\nService status: {status}")
+        schedule_times = agent.get_schedule_times()
     except Exception as e:
-        print(f"Error reading schedule: {e}")
-        sys.exit(1)
+        out.fail(f"Error reading schedule: {e}")
+    
+    out.update(schedule=schedule_times)
+    out.print("Scheduled sessions:")
+    for time_str in schedule_times:
+        out.print(f"  - {time_str}")
+    
+    out.print(f"\nService status: {agent.describe_status(info)}")
 
 
-def handle_clear():
+def handle_clear(out=None):
     """Handle clear command"""
-    if platform.system() != 'Darwin':
-        print("Error: This command is only available on macOS")
-        sys.exit(1)
-    
-    agent = LaunchAgentManager()
+    out = out or CommandOutput('clear')
+    agent = _get_scheduler()
+    if agent is None:
+        out.fail("Error: This command is only available on macOS and Linux (systemd)")
     if agent.uninstall():
-        print("✓ Cleared all scheduled sessions")
+        out.update(cleared=True)
+        out.print("✓ Cleared all scheduled sessions")
     else:
-        print("✗ Failed to clear sessions")
-        sys.exit(1)
+        out.fail("✗ Failed to clear sessions")
 
 
-def handle_start():
+# Exit code for each SessionManager failure class
+START_FAILURE_EXIT_CODES = {
+    FAILURE_CLAUDE_MISSING: EXIT_CLAUDE_MISSING,
+    FAILURE_AUTH: EXIT_AUTH_FAILURE,
+    FAILURE_TIMEOUT: EXIT_TIMEOUT,
+    FAILURE_USAGE_LIMIT: EXIT_USAGE_LIMIT,
+}
+
+
+def handle_start(args=None, out=None):
     """Handle start command"""
+    args = args or []
+    out = out or CommandOutput('start')
     setup_logger()
-    session_manager = SessionManager()
+    session_manager = _get_session_manager()
+    deferred_run = '--deferred' in args
+    
+    if deferred_run and session_manager.deferred.load() is None:
+        # Stray fire of the one-shot LaunchAgent; checked first so it costs no start token
+        out.update(started=False, failure=None)
+        out.print("No deferred start pending")
+        return
+    
+    # A pending usage-limit deferral skips the start (exit 8) without spawning,
+    # so it must not cost a token either
+    if session_manager.deferred.pending_until() is None and not session_manager.allow_start():
+        out.update(started=False, failure=session_manager.last_failure,
+                   retry_after=round(session_manager.retry_after))
+        out.fail(f"✗ Too many starts, next start allowed in {session_manager.retry_after:.0f}s",
+                 EXIT_RATE_LIMITED)
     
     success = session_manager.start_session()
+    out.update(started=bool(success), failure=session_manager.last_failure)
+    
+    deferred_until = None
+    if session_manager.last_failure == FAILURE_USAGE_LIMIT:
+        deferred_until = session_manager.deferred_until
+    
+    agent = _get_scheduler()
+    if agent is not None:
+        if deferred_until:
+            agent.install_deferred(deferred_until)
+        else:
+            agent.remove_deferred(unload=not deferred_run)
+    
+    if deferred_until:
+        from datetime import datetime
+        at = datetime.fromtimestamp(deferred_until)
+        out.update(deferred_until=at.isoformat(timespec='seconds'))
+        out.fail(f"⏸ Usage limit reached, next start deferred to {at.strftime('%Y-%m-%d %H:%M')}",
+                 EXIT_USAGE_LIMIT)
     if success:
-        print("✓ Claude Code session started successfully")
+        out.print("✓ Claude Code session started successfully")
     else:
-        print("✗ Failed to start Claude Code session")
-        sys.exit(1)
+        exit_code = START_FAILURE_EXIT_CODES.get(session_manager.last_failure, EXIT_ERROR)
+        out.fail("✗ Failed to start Claude Code session", exit_code)
 
 
-def handle_status():
-    """Handle status command"""
-    if platform.system() != 'Darwin':
-        print("Error: This command is only available on macOS")
-        sys.exit(1)
+def _status_document(info, schedule_times, marker_file):
+    """Structured status shared by text, JSON and watch output"""
+    from datetime import datetime
+    from src.deferral import DeferredStart
+    from src.schedule import next_fire
+    
+    fire = next_fire(schedule_times)
+    deferred = DeferredStart(marker_file.parent.parent / "deferred.json").pending_until()
+    resources = _resource_summary(RunHistory(marker_file.parent.parent / "stats.jsonl").load())
+    session = None
+    if marker_file.exists():
+        with open(marker_file, 'r') as f:
+            session = parse_session_marker(f.read())
+    return {
+        "service": info,
+        "schedule": schedule_times,
+        "next_start": fire.isoformat(timespec='minutes') if fire else None,
+        "deferred_until": datetime.fromtimestamp(deferred).isoformat(timespec='seconds') if deferred else None,
+        "session": session,
+        "resources": resources,
+    }
+
+
+# Per-run claude resource usage fields averaged by 'status'
+RESOURCE_FIELDS = ['user_cpu', 'system_cpu', 'max_rss_mb', 'voluntary_ctx', 'involuntary_ctx']
+
+
+def _resource_summary(entries, window=10):
+    """Rolling averages of the last window runs and the window before them"""
+    if not entries:
+        return None
+    earlier = entries[-2 * window:-window]
+    return {
+        "runs": len(entries[-window:]),
+        "averages": rolling_means(entries[-window:], RESOURCE_FIELDS),
+        "previous": rolling_means(earlier, RESOURCE_FIELDS) if earlier else None,
+    }
+
+
+def _change(current, previous):
+    if not current or not previous:
+        return ""
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+def _status_exit_code(info):
+    """Exit code for the service state"""
+    if not info['installed']:
+        return EXIT_NOT_INSTALLED
+    if not info['loaded']:
+        return EXIT_NOT_LOADED if not info['error'] else EXIT_ERROR
+    return EXIT_OK
+
+
+def _render_status(service_status, document, marker_file):
+    """Build the status text shown by 'status' and 'status --watch'"""
+    from datetime import datetime
     
-    # Show LaunchAgent status
-    agent = LaunchAgentManager()
-    print(f"Service: {agent.status()}")
+    lines = [f"Service: {service_status}"]
     
-    # Show current session status
-    import os
-    from pathlib import Path
-    marker_file = Path.home() / ".config/claude-code-automation/session/.claude_session_marker"
+    if document["next_start"]:
+        fire = datetime.fromisoformat(document["next_start"])
+        minutes = int((fire - datetime.now()).total_seconds() // 60) + 1
+        lines.append(f"Next start: {fire.strftime('%H:%M')} (in {minutes // 60}h {minutes % 60:02d}m)")
     
-    if marker_file.exists():
+    if document["deferred_until"]:
+        deferred = datetime.fromisoformat(document["deferred_until"])
+        lines.append(f"Deferred start: {deferred.strftime('%Y-%m-%d %H:%M')} (usage limit)")
+    
+    resources = document.get("resources")
+    if resources and resources["averages"]["max_rss_mb"] is not None:
+        averages = resources["averages"]
+        cpu = (averages["user_cpu"] or 0) + (averages["system_cpu"] or 0)
+        lines.append(f"Resources (avg of last {resources['runs']} runs): "
+                     f"CPU {averages['user_cpu']:.2f}s user / {averages['system_cpu']:.2f}s system, "
+                     f"peak RSS {averages['max_rss_mb']:.0f} MB, "
+                     f"{(averages['voluntary_ctx'] or 0) + (averages['involuntary_ctx'] or 0):.0f} context switches")
+        previous = resources["previous"]
+        if previous and previous["max_rss_mb"] is not None:
+            previous_cpu = (previous["user_cpu"] or 0) + (previous["system_cpu"] or 0)
+            lines.append(f"  vs previous runs: CPU {_change(cpu, previous_cpu)}, "
+                         f"RSS {_change(averages['max_rss_mb'], previous['max_rss_mb'])}")
+    
+    # Show current session status
+    if document["session"] is not None:
         with open(marker_file, 'r') as f:
             content = f.read()
-        print(f"\nCurrent session:")
-        print(content)
+        lines.append("\nCurrent session:")
+        lines.append(content)
     else:
-        print("\nNo active session")
+        lines.append("\nNo active session")
+    return "\n".join(lines)
+
+
+def handle_status(args=None, out=None):
+    """Handle status command"""
+    args = args or []
+    out = out or CommandOutput('status')
+    agent = _get_scheduler()
+    if agent is None:
+        out.fail("Error: This command is only available on macOS and Linux (systemd)")
+    marker_file = Path.home() / ".config/claude-code-automation/session/.claude_session_marker"
+    
+    if '--watch' in args:
+        _watch_status(agent, marker_file, out)
+        return
+    
+    info = agent.status_info()
+    document = _status_document(info, agent.get_schedule_times(), marker_file)
+    out.update(**document)
+    out.print(_render_status(agent.describe_status(info), document, marker_file))
+    out.finish(_status_exit_code(info))
+
+
+def _last_line(path, chunk=4096):
+    """Last line of a file, reading only its tail"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, 2)
+            f.seek(max(0, f.tell() - chunk))
+            lines = f.read().decode(errors='replace').splitlines()
+    except OSError:
+        return None
+    return lines[-1] if lines else None
+
+
+def _watch_status(agent, marker_file, out):
+    """Redraw status when watched files change or the countdown ticks
+    
+    With --json, one JSON document is written per change (JSON lines).
+    """
+    import json
+    import time
+    from src.watch import FileWatcher
+    
+    log_file = agent.config.config_dir / "logs" / "claude-code-automation.log"
+    watcher = FileWatcher([agent.definition_path, marker_file, agent.config.config_file, log_file])
+    info = agent.status_info()
+    schedule_times = agent.get_schedule_times()
+    frame = None
+    out.emitted = True  # documents are streamed below
+    
+    try:
+        while True:
+            document = _status_document(info, schedule_times, marker_file)
+            document["last_log"] = _last_line(log_file)
+            if out.json_mode:
+                new_frame = json.dumps(document, ensure_ascii=False)
+            else:
+                new_frame = _render_status(agent.describe_status(info), document, marker_file)
+                if document["last_log"]:
+                    new_frame += f"\nLast log: {document['last_log']}"
+            
+            if new_frame != frame:
+                frame = new_frame
+                if out.json_mode:
+                    print(frame, flush=True)
+                else:
+                    print("\033[H\033[2J" + frame, flush=True)
+                    print("\n(watching for changes, Ctrl+C to exit)", flush=True)
+            
+            # Wake up for file changes, or at the next minute for the countdown
+            changed = watcher.wait(60 - time.time() % 60)
+            if agent.definition_path in changed:
+                # launchctl is only asked again when the plist changed
+                info = agent.status_info()
+                schedule_times = agent.get_schedule_times()
+    except KeyboardInterrupt:
+        out.print()
+    finally:
+        watcher.close()
+
+
+def handle_simulate(args, out=None):
+    """Handle simulate command"""
+    from src.history import percentile
+    from src.simulator import DEFAULT_ATTEMPT_SECONDS, ScheduleSimulator
+    
+    out = out or CommandOutput('simulate')
+    options = {'--days': '30', '--fail-prob': '0', '--work': '09:00-18:00', '--seed': None}
+    sleep_windows = []
+    times = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in options or arg == '--sleep':
+            if i + 1 >= len(args):
+                out.fail(f"Error: {arg} requires a value")
+            if arg == '--sleep':
+                sleep_windows.append(args[i + 1])
+            else:
+                options[arg] = args[i + 1]
+            i += 2
+        else:
+            times.append(arg)
+            i += 1
+    
+    if not times:
+        agent = _get_scheduler()
+        times = agent.get_schedule_times() if agent else []
+    if not times:
+        out.fail("Error: No times specified and no schedule installed")
+    
+    session_manager = _get_session_manager()
+    # Attempts take as long as recent successful starts did
+    latencies = session_manager.history.latencies()
+    attempt_seconds = max(1, round(percentile(latencies, 50))) if latencies else DEFAULT_ATTEMPT_SECONDS
+    try:
+        simulator = ScheduleSimulator(
+            times,
+            days=int(options['--days']),
+            failure_probability=float(options['--fail-prob']),
+            max_retries=session_manager.max_retries,
+            retry_delay=session_manager.retry_delay,
+            attempt_seconds=attempt_seconds,
+            sleep_windows=sleep_windows,
+            working_hours=options['--work'],
+            seed=int(options['--seed']) if options['--seed'] is not None else None,
+        )
+    except ValueError as e:
+        out.fail(f"Error: {e}")
+    
+    import time
+    started = time.perf_counter()
+    result = simulator.run()
+    elapsed = time.perf_counter() - started
+    out.update(schedule=times, elapsed_seconds=round(elapsed, 4), attempt_seconds=attempt_seconds,
+               result=result)
+    
+    out.print(f"Simulated {result['days']} days of schedule {', '.join(times)} in {elapsed:.3f}s")
+    out.print(f"  Working-hours coverage:   {result['working_coverage'] * 100:.1f}%")
+    out.print(f"  Uncovered minutes/day:    {result['uncovered_working_minutes_per_day']:.0f}")
+    out.print(f"  Windows per working day:  {result['windows_per_working_day']:.2f}")
+    out.print(f"  Quota per working day:    {result['quota_availability']:.2f} windows")
+    out.print(f"  Windows opened:           {result['windows']}")
+    out.print(f"  Wasted (overlapping):     {result['wasted_starts']}")
+    out.print(f"  Failed after retries:     {result['failed_starts']}")
+    out.print(f"  Deferred by sleep:        {result['deferred_by_sleep']} (coalesced: {result['coalesced']})")
+    out.print(f"  Start attempt length:     {attempt_seconds}s"
+              + (" (median of recent starts)" if latencies else " (default, no start history)"))
 
 
-def handle_logs(args):
+def handle_serve(args, out=None):
+    """Handle serve command"""
+    import asyncio
+    from src.config import ConfigManager
+    from src.server import StatusServer, StatusState
+    
+    out = out or CommandOutput('serve')
+    setup_logger()
+    config = ConfigManager()
+    port = config.get_setting('http_port', 8765)
+    if '--port' in args:
+        index = args.index('--port')
+        try:
+            port = int(args[index + 1])
+        except (IndexError, ValueError):
+            out.fail("Error: --port requires a number")
+    
+    server = StatusServer(StatusState(config=config), port=port)
+    out.update(url=f"http://127.0.0.1:{port}")
+    out.print(f"✓ Serving status on http://127.0.0.1:{port} (Ctrl+C to stop)")
+    # Announce before blocking so pollers can read the URL
+    out.finish()
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        out.emitted = False
+        out.fail(f"✗ Failed to start HTTP server: {e}")
+
+
+def handle_gc(args, out=None):
+    """Handle gc command"""
+    out = out or CommandOutput('gc')
+    dry_run = '--dry-run' in args
+    setup_logger()
+    session_manager = _get_session_manager()
+    
+    stats = session_manager.collect_transcripts(dry_run=dry_run)
+    if not stats:
+        out.fail("✗ Failed to collect transcripts")
+    
+    out.update(dry_run=dry_run, **stats)
+    prefix = "Would free" if dry_run else "Freed"
+    out.print(f"✓ Transcripts kept: {stats['kept']}, compressed: {stats['compressed']}, deleted: {stats['deleted']}")
+    out.print(f"  {prefix} {stats['bytes_freed'] / 1024:.1f} KB")
+
+
+def handle_logs(args, out=None):
     """Handle logs command"""
-    import os
     import subprocess
-    from pathlib import Path
+    
+    out = out or CommandOutput('logs')
+    
+    if args and args[0].lower() == 'run':
+        handle_logs_run(args[1:], out)
+        return
     
     # Default values
     log_type = 'app'  # app, launch, error
@@ -204,14 +639,13 @@ def handle_logs(args):
         try:
             lines = int(args[1])
         except ValueError:
-            print(f"Error: Invalid line count '{args[1]}'")
-            sys.exit(1)
+            out.fail(f"Error: Invalid line count '{args[1]}'")
     
     # Validate log type
     if log_type not in ['app', 'launch', 'error']:
-        print(f"Error: Invalid log type '{log_type}'")
-        print("Valid types: app, launch, error")
-        sys.exit(1)
+        out.print(f"Error: Invalid log type '{log_type}'")
+        out.print("Valid types: app, launch, error")
+        out.finish(EXIT_ERROR, error=f"Invalid log type '{log_type}'")
     
     # Determine log file path
     if log_type == 'app':
@@ -224,13 +658,14 @@ def handle_logs(args):
         log_path = Path.home() / "Library/Logs/claude-code-automation.err.log"
         log_name = "LaunchAgent error logs"
     
-    print(f"📋 {log_name} (last {lines} lines)")
-    print("=" * 60)
+    out.update(log_type=log_type, path=str(log_path), exists=log_path.exists(), lines=[])
+    out.print(f"📋 {log_name} (last {lines} lines)")
+    out.print("=" * 60)
     
     # Check if log file exists
     if not log_path.exists():
-        print(f"⚠️  Log file not found: {log_path}")
-        print("   No logs have been created yet or the service hasn't run.")
+        out.print(f"⚠️  Log file not found: {log_path}")
+        out.print("   No logs have been created yet or the service hasn't run.")
         return
     
     # Show logs using tail
@@ -242,20 +677,208 @@ def handle_logs(args):
             check=True
         )
         
-        if result.stdout.strip():
-            print(result.stdout)
+        output = result.stdout
+        
+        # Fill up from rotated (possibly compressed) backups
+        if log_type == 'app':
+            shown = len(output.splitlines())
+            if shown < lines:
+                older = read_backup_lines(log_path, lines - shown)
+                if older:
+                    output = "\n".join(older) + "\n" + output
+        
+        out.update(lines=output.splitlines())
+        if output.strip():
+            out.print(output)
         else:
-            print("📝 Log file is empty")
+            out.print("📝 Log file is empty")
             
     except subprocess.CalledProcessError as e:
-        print(f"❌ Failed to read log file: {e}")
-        sys.exit(1)
+        out.fail(f"❌ Failed to read log file: {e}")
     except FileNotFoundError:
-        print("❌ 'tail' command not found")
-        sys.exit(1)
+        out.fail("❌ 'tail' command not found")
     
-    print("\n" + "=" * 60)
-    print(f"💡 To follow logs in real-time: tail -f {log_path}")
+    out.print("\n" + "=" * 60)
+    out.print(f"💡 To follow logs in real-time: tail -f {log_path}")
+
+
+def handle_logs_run(args, out):
+    """Show the stored output of one start attempt, or list recent attempts"""
+    from src.artifacts import ArtifactStore
+    from src.config import ConfigManager
+    
+    config = ConfigManager()
+    store = ArtifactStore(config.config_dir / "runs", 0)
+    if not args:
+        runs = store.runs()
+        out.update(runs=runs)
+        if not runs:
+            out.print("No run artifacts stored yet")
+            return
+        out.print("📦 Stored runs (newest first)")
+        for run_id in runs:
+            out.print(f"  {run_id}")
+        out.print("\n💡 Show one with: claude-code-automation logs run <id>")
+        return
+    
+    run_id = store.resolve(args[0])
+    text = store.read(run_id) if run_id else None
+    if text is None:
+        out.fail(f"Error: No artifact for run '{args[0]}'")
+    out.update(run_id=run_id, path=str(store.path(run_id)), lines=text.splitlines())
+    out.print(text.rstrip("\n"))
+
+
+def handle_calibrate(args, out=None):
+    """Handle calibrate command"""
+    out = out or CommandOutput('calibrate')
+    runs = None
+    if '--runs' in args:
+        index = args.index('--runs')
+        try:
+            runs = int(args[index + 1])
+        except (IndexError, ValueError):
+            out.fail("Error: --runs requires a number")
+    
+    setup_logger()
+    session_manager = _get_session_manager()
+    out.print("Timing claude installations...")
+    pin = session_manager.calibrate(runs=runs)
+    out.update(pinned=pin['claude_path'], node_bin=pin['node_bin'], timings=pin['timings'])
+    
+    for path, seconds in sorted(pin['timings'].items(), key=lambda item: (item[1] is None, item[1] or 0)):
+        timing = f"{seconds * 1000:8.0f} ms" if seconds is not None else "  failed"
+        marker = "*" if path == pin['claude_path'] else " "
+        out.print(f" {marker} {timing}  {path}")
+    
+    if not pin['claude_path']:
+        out.fail("✗ No working claude installation found", EXIT_CLAUDE_MISSING)
+    out.print(f"✓ Pinned {pin['claude_path']}")
+
+
+def handle_prewarm(out=None):
+    """Handle prewarm command"""
+    out = out or CommandOutput('prewarm')
+    setup_logger()
+    session_manager = _get_session_manager()
+    result = session_manager.prewarm()
+    if result is None:
+        out.fail("✗ claude command not found", EXIT_CLAUDE_MISSING)
+    out.update(**result)
+    out.print(f"✓ Prewarmed {result['files']} files ({result['bytes'] / (1024 * 1024):.1f} MB) "
+              f"via {result['method']} in {result['seconds']:.2f}s")
+
+
+def handle_worker(args, out=None):
+    """Handle worker command"""
+    from src.schedule import parse_time
+    from src.worker import serve
+    
+    out = out or CommandOutput('worker')
+    times = list(args)
+    for time_str in times:
+        try:
+            parse_time(time_str)
+        except ValueError:
+            out.fail(f"Error: Invalid time format '{time_str}'. Use HH:MM or HHMM")
+    agent = _get_scheduler() if not times else None
+    if agent is not None:
+        times = agent.get_schedule_times()
+    if not times:
+        out.fail("Error: No times specified and no schedule installed")
+    
+    setup_logger()
+    session_manager = SessionManager()
+    session_manager.use_worker = True
+    out.update(schedule=times)
+    out.print(f"✓ Worker running for {', '.join(times)} (Ctrl+C to stop)")
+    out.finish()
+    try:
+        serve(session_manager, times)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        session_manager.close_worker()
+
+
+# Commands that run until interrupted and so cannot be part of a batch
+BATCH_EXCLUDED = ('batch', 'serve', 'worker')
+
+
+def handle_batch(args, out=None):
+    """Handle batch command: run newline-delimited commands in one process"""
+    global _batch_instances
+    out = out or CommandOutput('batch')
+    stop_on_error = '--stop-on-error' in args
+    sources = [arg for arg in args if arg != '--stop-on-error']
+    source = sources[0] if sources else '-'
+    try:
+        if source == '-':
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(source, 'r') as f:
+                lines = f.read().splitlines()
+    except OSError as e:
+        out.fail(f"Error: Cannot read batch file: {e}")
+    
+    results = []
+    _batch_instances = {}
+    try:
+        for number, line in enumerate(lines, 1):
+            text = line.strip()
+            if not text or text.startswith('#'):
+                continue
+            out.print(f"▶ [{number}] {text}")
+            exit_code = _run_batch_line(number, text, out.json_mode)
+            results.append({'line': number, 'command': text, 'exit_code': exit_code})
+            if exit_code != EXIT_OK:
+                out.print(f"✗ [{number}] exited with code {exit_code}")
+                if stop_on_error:
+                    break
+    finally:
+        agent = _batch_instances.get('scheduler')
+        _batch_instances = None
+    
+    # One scheduler reload for every schedule change in the batch
+    reloaded = agent.flush() if agent is not None else True
+    failed = sum(1 for result in results if result['exit_code'] != EXIT_OK)
+    out.update(results=results, failed=failed, reloaded=reloaded)
+    out.print(f"Batch: {len(results)} commands, {failed} failed")
+    if not reloaded:
+        out.fail("✗ Failed to reload the scheduler")
+    if failed:
+        out.finish(EXIT_ERROR, error=f"{failed} of {len(results)} commands failed")
+
+
+def _run_batch_line(number, text, json_mode):
+    """Run one batch line as a command; returns its exit code"""
+    import shlex
+    
+    try:
+        words = [word for word in shlex.split(text) if word != '--json']
+    except ValueError as e:
+        words = None
+        error = f"Error: {e}"
+    command = words[0].lower() if words else 'batch'
+    out = CommandOutput(command, json_mode)
+    out.update(line=number)
+    try:
+        if words is None:
+            out.fail(error)
+        if command in BATCH_EXCLUDED or (command == 'status' and '--watch' in words):
+            out.fail(f"Error: '{text}' cannot run inside a batch")
+        _run_command(command, words[1:], out)
+        out.finish()
+    except SystemExit as e:
+        if e.code is None:
+            return EXIT_OK
+        return e.code if isinstance(e.code, int) else EXIT_ERROR
+    except Exception as e:
+        try:
+            out.fail(f"Error: {e}")
+        except SystemExit as failed:
+            return failed.code
+    return EXIT_OK
 
 
 if __name__ == '__main__':
@@ -0,0 +1,202 @@
+"""Discrete-event simulation of a start schedule on a virtual clock"""
+
+import heapq
+import random
+from bisect import bisect_right
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.schedule import parse_entry, parse_time
+from src.session import SESSION_WINDOW_HOURS
+
+
+DAY = 86400
+HOUR = 3600
+MINUTE = 60
+
+# Assumed length of one start attempt when no measured latency is available
+DEFAULT_ATTEMPT_SECONDS = 10
+
+Interval = Tuple[int, int]
+
+
+def parse_range(range_str: str) -> Tuple[int, int]:
+    """Parse 'HH:MM-HH:MM' into (start, end) seconds since midnight"""
+    start_str, sep, end_str = range_str.partition('-')
+    if not sep:
+        raise ValueError(f"Invalid time range: {range_str}")
+    start_h, start_m = parse_time(start_str.strip())
+    end_h, end_m = parse_time(end_str.strip())
+    return start_h * HOUR + start_m * MINUTE, end_h * HOUR + end_m * MINUTE
+
+
+def _daily_intervals(ranges: Sequence[Tuple[int, int]], days: int,
+                     weekdays: Optional[Sequence[int]] = None, first_weekday: int = 0) -> List[Interval]:
+    """Expand daily ranges (which may cross midnight) into absolute intervals"""
+    intervals = []
+    for day in range(days):
+        if weekdays is not None and (first_weekday + day) % 7 not in weekdays:
+            continue
+        base = day * DAY
+        for start, end in ranges:
+            if end <= start:
+                end += DAY
+            intervals.append((base + start, base + end))
+    intervals.sort()
+    return intervals
+
+
+def _merge(intervals: List[Interval]) -> List[Interval]:
+    """Merge sorted, possibly overlapping intervals"""
+    merged: List[Interval] = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _overlap(windows: List[Interval], spans: List[Interval]) -> Tuple[int, List[int]]:
+    """Total seconds of spans covered by windows, plus window count touching each span
+
+    Both lists must be sorted; windows never overlap each other.
+    """
+    covered = 0
+    touching = []
+    w = 0
+    for span_start, span_end in spans:
+        while w < len(windows) and windows[w][1] <= span_start:
+            w += 1
+        count = 0
+        i = w
+        while i < len(windows) and windows[i][0] < span_end:
+            covered += min(windows[i][1], span_end) - max(windows[i][0], span_start)
+            count += 1
+            i += 1
+        touching.append(count)
+    return covered, touching
+
+
+class ScheduleSimulator:
+    """Simulates scheduled starts, sleep gaps, failures and retries in virtual time
+
+    Time is counted in seconds from midnight of day 0; all events are
+    quantized to the minute like launchd calendar intervals. Day 0 is
+    ``start_date`` (default today), a ``first_weekday`` weekday (0 = Monday,
+    default that of ``start_date``). Daily 'HH:MM' entries fire every day;
+    dated 'YYYY-MM-DD HH:MM' entries (from a calendar sync) fire once if
+    they fall inside the simulated days.
+    """
+
+    def __init__(self, schedule_times: List[str], days: int = 30,
+                 failure_probability: float = 0.0, max_retries: int = 3,
+                 retry_delay: int = 5, attempt_seconds: float = DEFAULT_ATTEMPT_SECONDS,
+                 sleep_windows: Sequence[str] = (), working_hours: str = "09:00-18:00",
+                 working_days: Sequence[int] = (0, 1, 2, 3, 4), first_weekday: Optional[int] = None,
+                 window_hours: int = SESSION_WINDOW_HOURS, seed: Optional[int] = None,
+                 start_date: Optional[date] = None):
+        start_date = start_date or date.today()
+        if first_weekday is None:
+            first_weekday = start_date.weekday()
+        self.fire_offsets = []
+        self.dated_fires = []
+        for entry in schedule_times:
+            day, hour, minute = parse_entry(entry)
+            offset = hour * HOUR + minute * MINUTE
+            if day is None:
+                self.fire_offsets.append(offset)
+            elif 0 <= (day - start_date).days < days:
+                self.dated_fires.append((day - start_date).days * DAY + offset)
+        self.fire_offsets.sort()
+        self.days = days
+        self.failure_probability = failure_probability
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.attempt_seconds = attempt_seconds
+        self.window_seconds = window_hours * HOUR
+        self.rng = random.Random(seed)
+
+        self.sleep = _merge(_daily_intervals([parse_range(r) for r in sleep_windows], days + 1))
+        self._sleep_starts = [start for start, _ in self.sleep]
+        self.working = _daily_intervals([parse_range(working_hours)], days,
+                                        working_days, first_weekday)
+
+    def _wake_time(self, t: int) -> Optional[int]:
+        """If the machine is asleep at t, return when it wakes up"""
+        i = bisect_right(self._sleep_starts, t) - 1
+        if i >= 0 and self.sleep[i][1] > t:
+            return self.sleep[i][1]
+        return None
+
+    def run(self) -> Dict[str, Any]:
+        """Run the simulation and return summary statistics"""
+        events: List[Tuple[int, int, str, int]] = []
+        seq = 0
+        for day in range(self.days):
+            for offset in self.fire_offsets:
+                events.append((day * DAY + offset, seq, 'fire', 0))
+                seq += 1
+        for fire in self.dated_fires:
+            events.append((fire, seq, 'fire', 0))
+            seq += 1
+        heapq.heapify(events)
+
+        stats = {"scheduled": len(events), "deferred_by_sleep": 0, "coalesced": 0, "attempts": 0,
+                 "failed_starts": 0, "wasted_starts": 0}
+        windows: List[Interval] = []
+        pending_wakes = set()
+        window_end = -1
+
+        while events:
+            t, _, kind, attempt = heapq.heappop(events)
+
+            if kind == 'fire':
+                wake = self._wake_time(t)
+                if wake is not None:
+                    # launchd coalesces calendar fires missed during sleep into one on wake
+                    if wake in pending_wakes:
+                        stats["coalesced"] += 1
+                    else:
+                        stats["deferred_by_sleep"] += 1
+                        pending_wakes.add(wake)
+                        heapq.heappush(events, (wake, seq, 'attempt', 1))
+                        seq += 1
+                    continue
+                kind, attempt = 'attempt', 1
+
+            stats["attempts"] += 1
+            done = t + self.attempt_seconds
+            if self.rng.random() < self.failure_probability:
+                if attempt < self.max_retries:
+                    heapq.heappush(events, (done + self.retry_delay, seq, 'attempt', attempt + 1))
+                    seq += 1
+                else:
+                    stats["failed_starts"] += 1
+                continue
+
+            if done < window_end:
+                # The current window is still open; this start opens nothing new
+                stats["wasted_starts"] += 1
+                continue
+
+            window_start = done - done % HOUR
+            window_end = window_start + self.window_seconds
+            windows.append((window_start, window_end))
+
+        working_seconds = sum(end - start for start, end in self.working)
+        covered, touching = _overlap(windows, self.working)
+        working_days = len(self.working)
+
+        stats.update({
+            "days": self.days,
+            "windows": len(windows),
+            "working_coverage": covered / working_seconds if working_seconds else 0.0,
+            "uncovered_working_minutes_per_day": (
+                (working_seconds - covered) / MINUTE / working_days if working_days else 0.0),
+            "windows_per_working_day": sum(touching) / working_days if working_days else 0.0,
+            # Usable quota per working day, in whole windows: each window counts
+            # by the share of it that falls within working hours
+            "quota_availability": covered / self.window_seconds / working_days if working_days else 0.0,
+        })
+        return stats
@@ -0,0 +1,90 @@
+"""Incremental parser for claude's --output-format stream-json output"""
+
+import json
+import time
+from typing import Any, Dict, Optional
+
+# Arguments that make `claude --print` emit one JSON event per line
+STREAM_JSON_ARGS = ['--output-format', 'stream-json', '--verbose']
+
+
+class StreamResult:
+    """Collects what matters from claude's JSON events as the lines arrive
+
+    The 'system'/'init' event carries the session id and model, and the
+    final 'result' event carries success, timings, cost and token usage.
+    Lines that are not JSON (older claude versions, wrapper noise) are
+    ignored, so callers can fall back to the raw output.
+    """
+
+    def __init__(self):
+        self.session_id: Optional[str] = None
+        self.model: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.events = 0
+        self.first_line_at: Optional[float] = None
+
+    def feed(self, line: str):
+        """Parse one line of stdout"""
+        if self.first_line_at is None:
+            self.first_line_at = time.monotonic()
+        line = line.strip()
+        if not line.startswith('{'):
+            return
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return
+        if not isinstance(event, dict):
+            return
+
+        self.events += 1
+        self.session_id = event.get('session_id') or self.session_id
+        if event.get('type') == 'system' and event.get('subtype') == 'init':
+            self.model = event.get('model')
+        elif event.get('type') == 'result':
+            self.result = event
+
+    @property
+    def complete(self) -> bool:
+        """Whether the final result event was seen"""
+        return self.result is not None
+
+    @property
+    def is_error(self) -> bool:
+        return bool(self.result and (self.result.get('is_error') or self.result.get('subtype') != 'success'))
+
+    @property
+    def text(self) -> str:
+        """The response text (or error message) of the result event"""
+        if not self.result:
+            return ""
+        return str(self.result.get('result') or self.result.get('error') or "")
+
+    @property
+    def error_type(self) -> Optional[str]:
+        """Result subtype of a failed run, e.g. error_max_turns or error_during_execution"""
+        if not self.is_error:
+            return None
+        subtype = self.result.get('subtype')
+        return subtype if subtype and subtype != 'success' else 'error'
+
+    def summary(self) -> Dict[str, Any]:
+        """Flat fields for the run history and the session marker"""
+        if not self.result:
+            return {'session_id': self.session_id} if self.session_id else {}
+        usage = self.result.get('usage') or {}
+        fields = {
+            'session_id': self.session_id,
+            'model': self.model,
+            'duration_ms': self.result.get('duration_ms'),
+            'duration_api_ms': self.result.get('duration_api_ms'),
+            'num_turns': self.result.get('num_turns'),
+            'cost_usd': self.result.get('total_cost_usd', self.result.get('cost_usd')),
+            'input_tokens': usage.get('input_tokens'),
+            'output_tokens': usage.get('output_tokens'),
+            'cache_read_tokens': usage.get('cache_read_input_tokens'),
+            'cache_creation_tokens': usage.get('cache_creation_input_tokens'),
+            'error_type': self.error_type,
+        }
+        return {key: value for key, value in fields.items() if value is not None}
@@ -0,0 +1,232 @@
+"""Process supervision for spawned Claude Code sessions"""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+from src.logger import get_logger
+
+# Run as: python -c _RLIMIT_SHIM <RLIMIT_AS bytes|-> <RLIMIT_CPU seconds|-> command...
+_RLIMIT_SHIM = (
+    "import os, resource, sys\n"
+    "for name, value in zip(('RLIMIT_AS', 'RLIMIT_CPU'), sys.argv[1:3]):\n"
+    "    if value != '-':\n"
+    "        resource.setrlimit(getattr(resource, name), (int(value), int(value)))\n"
+    "os.execvp(sys.argv[3], sys.argv[3:])\n"
+)
+
+
+def _exit_code(status: int) -> int:
+    """Popen-style returncode for a wait status (negative signal number if killed)"""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def usage_fields(usage) -> Dict[str, Any]:
+    """Compact fields from a struct_rusage"""
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    rss_bytes = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    return {
+        'user_cpu': round(usage.ru_utime, 3),
+        'system_cpu': round(usage.ru_stime, 3),
+        'max_rss_mb': round(rss_bytes / (1024 * 1024), 1),
+        'voluntary_ctx': usage.ru_nvcsw,
+        'involuntary_ctx': usage.ru_nivcsw,
+    }
+
+
+class _Reaper:
+    """Reaps one child with os.wait4 on a thread, keeping its resource usage
+
+    Setting ``returncode`` on the Popen makes its own wait()/poll() return
+    without calling waitpid, so the child is reaped exactly once.
+    """
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+        self.usage = None
+        self._thread = threading.Thread(target=self._wait, daemon=True)
+        self._thread.start()
+
+    def _wait(self):
+        try:
+            _, status, self.usage = os.wait4(self.process.pid, 0)
+        except ChildProcessError:
+            return
+        self.process.returncode = _exit_code(status)
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """True once the child has been reaped"""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+
+class ProcessSupervisor:
+    """Runs a command in its own process group and always reaps it
+
+    On timeout or cancellation the whole group receives SIGTERM, then
+    SIGKILL once the grace period has passed, so node's children can't be
+    orphaned and no zombies are left behind in long-lived callers.
+    """
+
+    def __init__(self, grace_period: float = 5.0,
+                 rlimit_as_mb: Optional[int] = None,
+                 rlimit_cpu_seconds: Optional[int] = None):
+        self.logger = get_logger()
+        self.grace_period = grace_period
+        self.rlimit_as_mb = rlimit_as_mb
+        self.rlimit_cpu_seconds = rlimit_cpu_seconds
+        self.last_usage: Optional[Dict[str, Any]] = None  # usage_fields() of the last streamed run
+
+    def _limited_args(self, args: List[str]) -> List[str]:
+        """args wrapped in a shim that sets the resource limits, then execs them
+
+        Limits used to be applied with preexec_fn, which is not safe once
+        other threads exist (hook runners, reapers); the shim sets them in
+        a fresh interpreter instead. exec keeps the pid, so the process
+        group, signals and os.wait4 usage still refer to the real command.
+        """
+        as_bytes = int(self.rlimit_as_mb) * 1024 * 1024 if self.rlimit_as_mb else None
+        cpu_seconds = int(self.rlimit_cpu_seconds) if self.rlimit_cpu_seconds else None
+        limits = [str(value) if value else '-' for value in (as_bytes, cpu_seconds)]
+        return [sys.executable, '-I', '-S', '-c', _RLIMIT_SHIM, *limits, *args]
+
+    def spawn(self, args: List[str], **popen_kwargs) -> subprocess.Popen:
+        """Start a process as the leader of a new session / process group"""
+        if resource is not None and (self.rlimit_as_mb or self.rlimit_cpu_seconds):
+            args = self._limited_args(args)
+        return subprocess.Popen(args, start_new_session=True, **popen_kwargs)
+
+    def run(self, args: List[str], timeout: float,
+            on_line: Optional[Callable[[str], None]] = None, **popen_kwargs) -> Tuple[int, str, str]:
+        """Run a command to completion, returning (returncode, stdout, stderr)
+
+        With on_line, each stdout line is passed to the callback as soon as
+        it is read (requires text mode pipes). Raises subprocess.TimeoutExpired
+        (with any captured output attached) after the process group has been
+        terminated and reaped.
+        """
+        process = self.spawn(args, **popen_kwargs)
+        if on_line is not None:
+            return self._run_streaming(process, timeout, on_line)
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            e.output, e.stderr = self.terminate(process)
+            raise
+        except BaseException:
+            self.terminate(process)
+            raise
+        return process.returncode, stdout, stderr
+
+    def _run_streaming(self, process: subprocess.Popen, timeout: float,
+                       on_line: Callable[[str], None]) -> Tuple[int, str, str]:
+        """Pump stdout line by line (and stderr in bulk) from reader threads
+        
+        The child is reaped with os.wait4 where available so its CPU time,
+        peak RSS and context switches end up in ``last_usage``.
+        """
+        stdout, stderr = [], []
+        self.last_usage = None
+        reaper = _Reaper(process) if hasattr(os, 'wait4') else None
+
+        def pump(stream, sink, callback=None):
+            try:
+                for line in stream:
+                    sink.append(line)
+                    if callback is not None:
+                        callback(line)
+            except (OSError, ValueError):
+                pass  # pipe closed underneath us after a kill
+
+        readers = [threading.Thread(target=pump, args=(process.stdout, stdout, on_line), daemon=True),
+                   threading.Thread(target=pump, args=(process.stderr, stderr), daemon=True)]
+        for reader in readers:
+            reader.start()
+        try:
+            self._wait(process, reaper, timeout)
+        except subprocess.TimeoutExpired as e:
+            self.stop(process, readers, reaper)
+            self._keep_usage(reaper)
+            e.output, e.stderr = "".join(stdout), "".join(stderr)
+            raise
+        except BaseException:
+            self.stop(process, readers, reaper)
+            raise
+        self._join(process, readers)
+        self._keep_usage(reaper)
+        return process.returncode, "".join(stdout), "".join(stderr)
+
+    def _keep_usage(self, reaper: Optional[_Reaper]):
+        if reaper is not None and reaper.usage is not None:
+            self.last_usage = usage_fields(reaper.usage)
+
+    @staticmethod
+    def _wait(process: subprocess.Popen, reaper: Optional[_Reaper], timeout: Optional[float]):
+        if reaper is None:
+            process.wait(timeout=timeout)
+        elif not reaper.wait(timeout):
+            raise subprocess.TimeoutExpired(process.args, timeout)
+
+    def stop(self, process: subprocess.Popen, readers: List[threading.Thread],
+             reaper: Optional[_Reaper] = None):
+        """Terminate the group while reader threads drain the pipes"""
+        self._signal_group(process, signal.SIGTERM)
+        try:
+            self._wait(process, reaper, self.grace_period)
+        except subprocess.TimeoutExpired:
+            self.logger.warning(f"Process group {process.pid} ignored SIGTERM, sending SIGKILL")
+            self._signal_group(process, signal.SIGKILL)
+            self._wait(process, reaper, None)
+        self._join(process, readers)
+
+    def _join(self, process: subprocess.Popen, readers: List[threading.Thread]):
+        """Wait for the readers to hit EOF, then close the pipes
+
+        A descendant that escaped the group can keep a pipe open; its
+        (daemon) reader is then abandoned rather than closed underneath.
+        """
+        for reader in readers:
+            reader.join(self.grace_period)
+        if any(reader.is_alive() for reader in readers):
+            self.logger.warning(f"Output of process {process.pid} still held open by a descendant")
+            return
+        for stream in (process.stdout, process.stderr):
+            if stream:
+                stream.close()
+
+    def _signal_group(self, process: subprocess.Popen, sig: int):
+        """Send a signal to the process group led by process"""
+        try:
+            os.killpg(process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def terminate(self, process: subprocess.Popen) -> Tuple[str, str]:
+        """SIGTERM the group, escalate to SIGKILL after the grace period, and reap"""
+        self._signal_group(process, signal.SIGTERM)
+        try:
+            return process.communicate(timeout=self.grace_period)
+        except subprocess.TimeoutExpired:
+            self.logger.warning(f"Process group {process.pid} ignored SIGTERM, sending SIGKILL")
+
+        self._signal_group(process, signal.SIGKILL)
+        try:
+            return process.communicate(timeout=self.grace_period)
+        except subprocess.TimeoutExpired:
+            # A descendant escaped the group and still holds our pipes open;
+            # close them so the leader can be reaped regardless.
+            for stream in (process.stdout, process.stderr):
+                if stream:
+                    stream.close()
+            process.wait()
+            return "", ""
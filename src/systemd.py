@@ -0,0 +1,270 @@
+"""systemd --user timer backend for Linux"""
+
+import os
+import re
+import shlex
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.schedule import parse_entry
+from src.scheduler import SchedulerBackend
+
+UNIT_NAME = "claude-code-automation"
+
+Runner = Callable[[List[str]], subprocess.CompletedProcess]
+
+
+def run_systemctl(args: List[str]) -> subprocess.CompletedProcess:
+    """Default runner: execute the command and capture its output"""
+    return subprocess.run(args, capture_output=True, text=True)
+
+
+class SystemdTimerManager(SchedulerBackend):
+    """Manages a systemd user timer/service pair for Claude Code automation
+
+    Units are only rewritten, and systemd only reloaded, when their content
+    changes. All systemctl calls go through ``runner`` so tests can fake it.
+    """
+
+    definition_name = "timer unit"
+
+    def __init__(self, runner: Optional[Runner] = None, unit_dir: Optional[Path] = None):
+        super().__init__()
+        self.runner = runner or run_systemctl
+        self.unit_dir = Path(unit_dir) if unit_dir else Path.home() / ".config" / "systemd" / "user"
+        self.service_name = f"{UNIT_NAME}.service"
+        self.timer_name = f"{UNIT_NAME}.timer"
+        self.deferred_service_name = f"{UNIT_NAME}-deferred.service"
+        self.deferred_timer_name = f"{UNIT_NAME}-deferred.timer"
+        self.prewarm_service_name = f"{UNIT_NAME}-prewarm.service"
+        self.prewarm_timer_name = f"{UNIT_NAME}-prewarm.timer"
+        self.timer_path = self.unit_dir / self.timer_name
+        self._units_changed = False  # Units written while a reload is deferred
+
+    @property
+    def definition_path(self) -> Path:
+        return self.timer_path
+
+    def _systemctl(self, *args: str) -> subprocess.CompletedProcess:
+        return self.runner(['systemctl', '--user', *args])
+
+    def create_service(self, extra_args: List[str], description: str) -> str:
+        """Oneshot service running the CLI"""
+        command = " ".join(shlex.quote(arg) for arg in self._program_arguments() + extra_args)
+        environment = self._environment(f"{os.path.expanduser('~/.local/bin')}:/usr/local/bin:/usr/bin:/bin")
+        lines = [
+            "[Unit]",
+            f"Description={description}",
+            "",
+            "[Service]",
+            "Type=oneshot",
+            f"ExecStart={command}",
+        ]
+        lines += [f'Environment="{key}={value}"' for key, value in sorted(environment.items())]
+        return "\n".join(lines) + "\n"
+
+    def create_timer(self, calendars: List[str], service_name: str, description: str) -> str:
+        """Timer firing the service at each OnCalendar expression"""
+        lines = [
+            "[Unit]",
+            f"Description={description}",
+            "",
+            "[Timer]",
+        ]
+        lines += [f"OnCalendar={calendar}" for calendar in calendars]
+        lines += [
+            # The default accuracy is a minute; sessions should open on the second
+            "AccuracySec=1s",
+            # Replay fires missed while suspended or powered off
+            "Persistent=true",
+            f"Unit={service_name}",
+            "",
+            "[Install]",
+            "WantedBy=timers.target",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _write_units(self, units: Dict[str, str]) -> bool:
+        """Write units whose content differs; returns True if any changed"""
+        self.unit_dir.mkdir(parents=True, exist_ok=True)
+        changed = False
+        for name, content in units.items():
+            path = self.unit_dir / name
+            try:
+                if path.read_text() == content:
+                    continue
+            except OSError:
+                pass
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_text(content)
+            os.replace(tmp_path, path)
+            changed = True
+        return changed
+
+    def _activate(self, timer_names: List[str], changed: bool) -> bool:
+        """Reload units if they changed and make sure the timers are enabled and running"""
+        if changed:
+            if self._systemctl('daemon-reload').returncode != 0:
+                return False
+            ok = True
+            for timer_name in timer_names:
+                # restart re-arms a running timer with the new schedule
+                self._systemctl('enable', timer_name)
+                ok = self._systemctl('restart', timer_name).returncode == 0 and ok
+            return ok
+        ok = True
+        for timer_name in timer_names:
+            if self._systemctl('is-active', '--quiet', timer_name).returncode != 0:
+                ok = self._systemctl('enable', '--now', timer_name).returncode == 0 and ok
+        return ok
+
+    def _timers(self) -> List[str]:
+        """The schedule timer, plus the prewarm timer when one is installed"""
+        timers = [self.timer_name]
+        if (self.unit_dir / self.prewarm_timer_name).exists():
+            timers.append(self.prewarm_timer_name)
+        return timers
+
+    @staticmethod
+    def _calendars(schedule_times: List[str]) -> List[str]:
+        calendars = []
+        for time_str in schedule_times:
+            day, hour, minute = parse_entry(time_str)
+            prefix = day.isoformat() if day else "*-*-*"
+            calendars.append(f"{prefix} {hour:02d}:{minute:02d}:00")
+        return calendars
+
+    def install(self, schedule_times: List[str]) -> bool:
+        """Install the timer with given schedule"""
+        try:
+            units = {
+                self.service_name: self.create_service(['start'], "Claude Code session automation"),
+                self.timer_name: self.create_timer(self._calendars(schedule_times), self.service_name,
+                                                   "Claude Code session automation schedule"),
+            }
+            # Page-cache prewarm a few minutes ahead of each start
+            prewarm_times = self._prewarm_times(schedule_times)
+            if prewarm_times:
+                units[self.prewarm_service_name] = self.create_service(['prewarm'], "Claude Code prewarm")
+                units[self.prewarm_timer_name] = self.create_timer(
+                    self._calendars(prewarm_times), self.prewarm_service_name, "Claude Code prewarm schedule")
+            elif (self.unit_dir / self.prewarm_timer_name).exists():
+                self._remove_units(self.prewarm_timer_name, self.prewarm_service_name)
+            changed = self._write_units(units)
+            if self.deferring:
+                self._units_changed |= changed
+                self._reload_pending = True
+            elif not self._activate(self._timers(), changed):
+                self.logger.error("systemctl failed to activate the timer")
+                return False
+            self.logger.info(f"systemd timer installed at {self.timer_path}" if changed
+                             else "systemd timer unchanged")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to install systemd timer: {e}")
+            return False
+
+    def _reload(self) -> bool:
+        changed, self._units_changed = self._units_changed, False
+        return self._activate(self._timers(), changed)
+
+    def _remove_units(self, timer_name: str, service_name: str, stop: bool = True):
+        if stop:
+            self._systemctl('disable', '--now', timer_name)
+        else:
+            self._systemctl('disable', timer_name)
+        for name in (timer_name, service_name):
+            try:
+                (self.unit_dir / name).unlink()
+            except FileNotFoundError:
+                pass
+        self._systemctl('daemon-reload')
+
+    def uninstall(self) -> bool:
+        """Uninstall the timer and service"""
+        try:
+            self._reload_pending = self._units_changed = False
+            self.remove_deferred()
+            if (self.unit_dir / self.prewarm_timer_name).exists():
+                self._remove_units(self.prewarm_timer_name, self.prewarm_service_name)
+            if self.timer_path.exists() or (self.unit_dir / self.service_name).exists():
+                self._remove_units(self.timer_name, self.service_name)
+            self.logger.info("systemd timer uninstalled")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to uninstall systemd timer: {e}")
+            return False
+
+    def get_schedule_times(self) -> List[str]:
+        """Read the installed schedule back from the timer as HH:MM / YYYY-MM-DD HH:MM strings"""
+        try:
+            content = self.timer_path.read_text()
+        except OSError:
+            return []
+        times = []
+        for m in re.finditer(r'^OnCalendar=(\*-\*-\*|\d{4}-\d{2}-\d{2}) (\d{2}):(\d{2})', content, re.MULTILINE):
+            prefix = "" if m.group(1) == "*-*-*" else m.group(1) + " "
+            times.append(f"{prefix}{m.group(2)}:{m.group(3)}")
+        return times
+
+    def install_deferred(self, at: float) -> bool:
+        """Install (or move) the one-shot deferred start"""
+        try:
+            calendar = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(at))
+            changed = self._write_units({
+                self.deferred_service_name: self.create_service(['start', '--deferred'],
+                                                                "Claude Code deferred start"),
+                self.deferred_timer_name: self.create_timer([calendar], self.deferred_service_name,
+                                                            "Claude Code deferred start"),
+            })
+            return self._activate([self.deferred_timer_name], changed)
+        except Exception as e:
+            self.logger.error(f"Failed to install deferred start: {e}")
+            return False
+
+    def remove_deferred(self, unload: bool = True):
+        """Remove the one-shot deferred start
+
+        Stopping a timer does not stop the service it triggered, so this is
+        safe from inside the deferred run; ``unload`` is accepted for parity.
+        """
+        if not (self.unit_dir / self.deferred_timer_name).exists():
+            return
+        self._remove_units(self.deferred_timer_name, self.deferred_service_name)
+        self.logger.info("Deferred start removed")
+
+    def status_info(self) -> dict:
+        """Get structured service status"""
+        info = {
+            'installed': self.timer_path.exists(),
+            'loaded': False,
+            'pid': None,
+            'last_exit_status': None,
+            'error': None,
+        }
+        try:
+            timer = self._show(self.timer_name, 'ActiveState')
+            service = self._show(self.service_name, 'MainPID', 'ExecMainStatus', 'ExecMainStartTimestamp')
+        except (OSError, RuntimeError) as e:
+            info['error'] = str(e)
+            return info
+
+        info['loaded'] = timer.get('ActiveState') == 'active'
+        pid = service.get('MainPID', '0')
+        info['pid'] = int(pid) if pid.isdigit() and pid != '0' else None
+        if service.get('ExecMainStartTimestamp'):
+            info['last_exit_status'] = service.get('ExecMainStatus')
+        return info
+
+    def _show(self, unit: str, *properties: str) -> Dict[str, str]:
+        result = self._systemctl('show', unit, f"--property={','.join(properties)}")
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"systemctl show {unit} failed")
+        values = {}
+        for line in result.stdout.splitlines():
+            key, sep, value = line.partition('=')
+            if sep:
+                values[key] = value
+        return values
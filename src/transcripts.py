@@ -0,0 +1,131 @@
+"""Retention for transcripts Claude Code keeps for the automation session directory"""
+
+import gzip
+import lzma
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.logger import get_logger
+
+
+DEFAULT_RETENTION = {
+    "compress_after_days": 1,
+    "max_age_days": 30,
+    "max_count": 100,
+    "max_total_mb": 50,
+    "compression": "xz",
+}
+
+TRANSCRIPT_SUFFIXES = (".jsonl", ".jsonl.xz", ".jsonl.gz")
+
+
+def claude_projects_root() -> Path:
+    """Directory where Claude Code keeps per-project transcripts"""
+    config_dir = os.environ.get('CLAUDE_CONFIG_DIR')
+    base = Path(config_dir) if config_dir else Path.home() / ".claude"
+    return base / "projects"
+
+
+def project_dir_name(directory: Path) -> str:
+    """Name Claude Code uses for a working directory's transcript folder"""
+    return re.sub(r'[^a-zA-Z0-9]', '-', str(directory))
+
+
+class TranscriptStore:
+    """Applies an age/count/size retention policy to automation transcripts
+
+    Only the transcript folder that belongs to the automation session
+    directory is ever touched; the user's own project transcripts live in
+    sibling folders and are never listed.
+    """
+
+    def __init__(self, session_dir: Path, projects_root: Optional[Path] = None):
+        self.logger = get_logger()
+        self.session_dir = Path(session_dir)
+        self.projects_root = Path(projects_root) if projects_root else claude_projects_root()
+
+    def project_dirs(self) -> List[Path]:
+        """Transcript folders for the session directory (as given and resolved)"""
+        names = {project_dir_name(self.session_dir),
+                 project_dir_name(self.session_dir.resolve())}
+        dirs = []
+        for name in sorted(names):
+            path = self.projects_root / name
+            if path.is_dir() and path.parent == self.projects_root:
+                dirs.append(path)
+        return dirs
+
+    def transcripts(self) -> List[Path]:
+        """All transcript files, newest first"""
+        files = []
+        for project_dir in self.project_dirs():
+            for entry in os.scandir(project_dir):
+                if entry.is_file(follow_symlinks=False) and entry.name.endswith(TRANSCRIPT_SUFFIXES):
+                    files.append(Path(entry.path))
+        return sorted(files, key=lambda p: p.stat().st_mtime, reverse=True)
+
+    def collect(self, policy: Optional[Dict[str, Any]] = None, dry_run: bool = False) -> Dict[str, int]:
+        """Compress older transcripts and delete those past the retention caps"""
+        settings = dict(DEFAULT_RETENTION)
+        settings.update(policy or {})
+        now = time.time()
+        max_age = settings["max_age_days"] * 86400
+        compress_age = settings["compress_after_days"] * 86400
+        max_total = settings["max_total_mb"] * 1024 * 1024
+
+        stats = {"kept": 0, "compressed": 0, "deleted": 0, "bytes_freed": 0}
+        total = 0
+        for index, path in enumerate(self.transcripts()):
+            st = path.stat()
+            age = now - st.st_mtime
+
+            if age > max_age or index >= settings["max_count"]:
+                self._delete(path, st.st_size, stats, dry_run)
+                continue
+
+            size = st.st_size
+            if path.suffix == ".jsonl" and age > compress_age:
+                if not dry_run:
+                    path = self._compress(path, settings["compression"])
+                    size = path.stat().st_size
+                stats["compressed"] += 1
+                stats["bytes_freed"] += st.st_size - size
+
+            if total + size > max_total:
+                self._delete(path, size, stats, dry_run)
+                continue
+
+            total += size
+            stats["kept"] += 1
+
+        self.logger.info(
+            f"Transcript gc: kept {stats['kept']}, compressed {stats['compressed']}, "
+            f"deleted {stats['deleted']}, freed {stats['bytes_freed']} bytes"
+            + (" (dry run)" if dry_run else "")
+        )
+        return stats
+
+    def _delete(self, path: Path, size: int, stats: Dict[str, int], dry_run: bool):
+        """Delete a transcript and account for it"""
+        if not dry_run:
+            path.unlink()
+        stats["deleted"] += 1
+        stats["bytes_freed"] += size
+
+    def _compress(self, path: Path, method: str) -> Path:
+        """Compress a transcript in place, keeping its modification time"""
+        opener, suffix = (gzip.open, ".gz") if method == "gz" else (lzma.open, ".xz")
+        target = path.with_name(path.name + suffix)
+        tmp_target = target.with_name(target.name + ".tmp")
+
+        with open(path, 'rb') as src, opener(tmp_target, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        st = path.stat()
+        os.utime(tmp_target, (st.st_atime, st.st_mtime))
+        os.replace(tmp_target, target)
+        path.unlink()
+        return target
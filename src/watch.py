@@ -0,0 +1,121 @@
+"""Cheap file change detection for live views"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM
+              | IN_MOVED_TO | IN_CREATE | IN_DELETE)
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class _Inotify:
+    """Minimal ctypes binding that wakes a select() when watched directories change"""
+
+    def __init__(self, directories: Iterable[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        watched = 0
+        for directory in directories:
+            if libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK) >= 0:
+                watched += 1
+        if not watched:
+            os.close(self.fd)
+            raise OSError("no directory could be watched")
+
+    def wait(self, timeout: float) -> bool:
+        """Block until an event arrives or timeout passes; drains pending events"""
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Reports which of a set of files changed, using inotify where available
+
+    Elsewhere the files are polled with os.stat, which costs a handful of
+    syscalls per interval. Either way, a change is only reported when the
+    file's inode, size or mtime actually differ from the last look.
+    """
+
+    def __init__(self, paths: Iterable[Path], poll_interval: float = 1.0):
+        self.paths = [Path(p) for p in paths]
+        self.poll_interval = poll_interval
+        self._stamps: Dict[Path, Optional[Tuple[int, int, int]]] = {
+            path: _stat_key(path) for path in self.paths
+        }
+        self._inotify = None
+        if sys.platform.startswith('linux'):
+            directories = {path.parent for path in self.paths if path.parent.is_dir()}
+            try:
+                self._inotify = _Inotify(sorted(directories))
+            except (OSError, AttributeError, TypeError):
+                self._inotify = None
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def changed(self) -> Set[Path]:
+        """Paths whose stat differs from the previous call"""
+        result = set()
+        for path in self.paths:
+            key = _stat_key(path)
+            if key != self._stamps[path]:
+                self._stamps[path] = key
+                result.add(path)
+        return result
+
+    def wait(self, timeout: float) -> Set[Path]:
+        """Wait up to timeout seconds for any watched file to change"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if self._inotify is not None:
+                if not self._inotify.wait(remaining):
+                    return set()
+                changed = self.changed()
+            else:
+                time.sleep(max(0.0, min(self.poll_interval, remaining)))
+                changed = self.changed()
+            if changed or deadline - time.monotonic() <= 0:
+                return changed
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
@@ -0,0 +1,185 @@
+"""Resident claude process fed over stream-json stdin"""
+
+import json
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from src.logger import get_logger
+from src.schedule import next_fire
+from src.supervisor import ProcessSupervisor
+
+# Extra arguments that make `claude --print` read user messages as JSON lines
+STREAM_INPUT_ARGS = ['--input-format', 'stream-json']
+
+
+def user_message(text: str) -> str:
+    """One stream-json input line carrying a user message"""
+    return json.dumps({'type': 'user', 'message': {'role': 'user', 'content': text}}) + "\n"
+
+
+def _is_result(line: str) -> bool:
+    if '"result"' not in line:
+        return False
+    try:
+        return json.loads(line).get('type') == 'result'
+    except (ValueError, AttributeError):
+        return False
+
+
+class ClaudeWorker:
+    """Keeps one claude process alive and exchanges messages with it
+
+    A dead worker is respawned on the next send, a worker that misses the
+    reply deadline is killed as wedged, and a worker is recycled after
+    ``max_messages`` messages or ``max_age`` seconds to bound its memory.
+    """
+
+    def __init__(self, args: List[str], env: Optional[dict] = None, cwd: Optional[str] = None,
+                 max_messages: int = 20, max_age: float = 24 * 3600, grace_period: float = 5):
+        self.logger = get_logger()
+        self.args = args
+        self.env = env
+        self.cwd = cwd
+        self.max_messages = max_messages
+        self.max_age = max_age
+        self.supervisor = ProcessSupervisor(grace_period=grace_period)
+        self.process: Optional[subprocess.Popen] = None
+        self.messages = 0
+        self.spawned_at = 0.0
+        self.spawns = 0
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr = deque(maxlen=50)
+        self._readers: List[threading.Thread] = []
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def _spawn(self):
+        self.process = self.supervisor.spawn(
+            self.args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, bufsize=1, cwd=self.cwd, env=self.env
+        )
+        self._lines = queue.Queue()
+        self._stderr = deque(maxlen=50)
+        self._readers = [
+            threading.Thread(target=self._pump, args=(self.process.stdout, self._lines.put, True), daemon=True),
+            threading.Thread(target=self._pump, args=(self.process.stderr, self._stderr.append), daemon=True),
+        ]
+        for reader in self._readers:
+            reader.start()
+        self.messages = 0
+        self.spawned_at = time.monotonic()
+        self.spawns += 1
+        self.logger.info(f"Worker spawned (PID {self.process.pid})")
+
+    @staticmethod
+    def _pump(stream, sink: Callable, mark_eof: bool = False):
+        try:
+            for line in stream:
+                sink(line)
+        except (OSError, ValueError):
+            pass
+        if mark_eof:
+            sink(None)  # lets send() notice a worker that died mid-message
+
+    def ensure(self):
+        """Make sure a fresh-enough worker is running"""
+        if self.process is not None and not self.alive():
+            self.logger.warning(f"Worker exited with code {self.process.returncode}, respawning")
+            self.stop()
+        elif self.alive() and (self.messages >= self.max_messages
+                               or time.monotonic() - self.spawned_at >= self.max_age):
+            self.logger.info(f"Recycling worker after {self.messages} messages")
+            self.stop()
+        if self.process is None:
+            self._spawn()
+
+    def send(self, text: str, timeout: float,
+             on_line: Optional[Callable[[str], None]] = None) -> Tuple[int, str, str]:
+        """Send one user message and wait for its result, like ProcessSupervisor.run
+
+        Returns (returncode, stdout, stderr) where returncode is 0 once a
+        result event arrived, or the worker's exit code if it died first.
+        Raises subprocess.TimeoutExpired after killing a wedged worker.
+        """
+        for attempt in (1, 2):
+            self.ensure()
+            try:
+                self.process.stdin.write(user_message(text))
+                self.process.stdin.flush()
+                break
+            except (BrokenPipeError, OSError, ValueError):
+                self.logger.warning("Worker pipe closed, respawning")
+                self.stop()
+                if attempt == 2:
+                    raise
+        self.messages += 1
+
+        lines = []
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.logger.warning(f"Worker gave no result within {timeout}s, killing it")
+                self.stop()
+                raise subprocess.TimeoutExpired(self.args, timeout, output="".join(lines))
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                returncode = self.process.wait()
+                stderr = "".join(self._stderr)
+                self.stop()
+                return returncode or 1, "".join(lines), stderr
+            lines.append(line)
+            if on_line is not None:
+                on_line(line)
+            if _is_result(line):
+                return 0, "".join(lines), ""
+
+    def stop(self):
+        """Close stdin so claude exits, escalating to the supervisor's kill"""
+        if self.process is None:
+            return
+        process, self.process = self.process, None
+        try:
+            process.stdin.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            process.wait(timeout=self.supervisor.grace_period)
+        except subprocess.TimeoutExpired:
+            self.supervisor.stop(process, self._readers)
+            return
+        for reader in self._readers:
+            reader.join(self.supervisor.grace_period)
+        if not any(reader.is_alive() for reader in self._readers):
+            process.stdout.close()
+            process.stderr.close()
+
+
+def serve(session_manager, schedule_times: List[str], check_interval: float = 60):
+    """Open a window through the worker at each scheduled time, forever"""
+    logger = get_logger()
+    session_manager.warm_worker()
+    while True:
+        fire = next_fire(schedule_times)
+        if fire is None:
+            logger.info("No upcoming scheduled starts, worker exiting")
+            return
+        logger.info(f"Worker idle until {fire.strftime('%Y-%m-%d %H:%M')}")
+        while True:
+            wait = (fire - datetime.now()).total_seconds()
+            if wait <= 0:
+                break
+            time.sleep(min(wait, check_interval))
+            # Respawn a worker that died while idle, so the fire stays fast
+            session_manager.warm_worker()
+        if session_manager.allow_start():
+            session_manager.start_session()
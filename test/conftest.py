@@ -0,0 +1,16 @@
+"""Shared fixtures for the test suite"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path_factory, monkeypatch):
+    """Point HOME (and so Path.home()) at a fresh directory for every test
+
+    SessionManager and ConfigManager keep history, stats, run artifacts and
+    the compile cache under ~/.config/claude-code-automation; without this
+    the suite would write them into the developer's real config.
+    """
+    home = tmp_path_factory.mktemp("home")
+    monkeypatch.setenv("HOME", str(home))
+    return home
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Tests for the per-run artifact store"""
+
+import gzip
+import os
+import pytest
+import sys
+from unittest.mock import patch
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.artifacts import ArtifactStore, new_run_id
+from src.output import CommandOutput
+from src.session import SessionManager
+from src.simple_cli import handle_logs_run
+
+
+class TestArtifactStore:
+    """Test writing, lookup and size-capped eviction"""
+
+    def test_save_and_read(self, tmp_path):
+        """Artifacts are gzip files holding metadata, stdout and stderr"""
+        store = ArtifactStore(tmp_path, max_bytes=1024 * 1024)
+        path = store.save("20250101-090000-abcd", {'returncode': 1}, "out line\n", "err line")
+        with gzip.open(path, 'rt') as f:
+            assert f.read() == "returncode: 1\n--- stdout ---\nout line\n--- stderr ---\nerr line\n"
+        assert store.read("20250101-090000-abcd") == store.read("20250101-09")
+        assert store.read("missing") is None
+
+    def test_ambiguous_prefix(self, tmp_path):
+        """A prefix matching several runs resolves to nothing"""
+        store = ArtifactStore(tmp_path, max_bytes=1024 * 1024)
+        store.save("20250101-090000-aaaa", {})
+        store.save("20250101-090000-bbbb", {})
+        assert store.resolve("20250101") is None
+        assert store.resolve("20250101-090000-b") == "20250101-090000-bbbb"
+        assert store.runs() == ["20250101-090000-bbbb", "20250101-090000-aaaa"]
+
+    def test_evicts_oldest(self, tmp_path):
+        """The oldest runs go first, and the newest run is kept even over the cap"""
+        store = ArtifactStore(tmp_path, max_bytes=1)
+        noise = os.urandom(2000).hex()
+        for run_id in ("20250101-000000-0001", "20250102-000000-0002", "20250103-000000-0003"):
+            store.save(run_id, {}, noise)
+        assert store.runs() == ["20250103-000000-0003"]
+
+    def test_run_ids_sort_by_time(self):
+        with patch('time.strftime', side_effect=['20250101-000000', '20250102-000000']):
+            assert new_run_id() < new_run_id()
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="Uses a shell script stand-in for claude")
+class TestSessionArtifacts:
+    """Test that start attempts write artifacts instead of logging raw output"""
+
+    def test_failure_is_stored(self, tmp_path):
+        """Full output lands in the artifact; the log line names the run"""
+        claude = tmp_path / "claude"
+        claude.write_text('#!/bin/sh\necho "partial output"\necho "boom: something broke" >&2\nexit 2\n')
+        claude.chmod(0o755)
+
+        manager = SessionManager()
+        manager.session_dir = tmp_path
+        manager.claude_path = str(claude)
+        manager.artifacts = ArtifactStore(tmp_path / "runs", 1024 * 1024)
+        with patch.object(manager, '_check_claude_available', return_value=True), \
+             patch.object(manager, '_prepare_compile_cache', return_value=(None, 'off')), \
+             patch.object(manager.history, 'record') as record, \
+             patch.object(manager.logger, 'error') as error, \
+             patch('os.chdir'):
+            assert not manager._start_claude_session(10)
+
+        run_id = record.call_args.kwargs['run_id']
+        assert manager.last_run_id == run_id
+        text = manager.artifacts.read(run_id)
+        assert "returncode: 2" in text
+        assert "partial output" in text
+        assert "boom: something broke" in text
+        assert "PATH: " in text
+        error.assert_called_once()
+        assert f"logs run {run_id}" in error.call_args.args[0]
+
+    def test_logs_run_command(self, tmp_path, capsys):
+        """logs run lists runs and prints one by prefix"""
+        store = ArtifactStore(tmp_path / "runs", 1024 * 1024)
+        store.save("20250101-090000-abcd", {'returncode': 0}, "hello")
+        with patch('src.config.ConfigManager.__init__', lambda self: setattr(self, 'config_dir', tmp_path)):
+            handle_logs_run([], CommandOutput('logs'))
+            handle_logs_run(["20250101"], CommandOutput('logs'))
+            with pytest.raises(SystemExit):
+                handle_logs_run(["nope"], CommandOutput('logs'))
+        captured = capsys.readouterr()
+        assert "20250101-090000-abcd" in captured.out
+        assert "hello" in captured.out
+        assert "No artifact for run 'nope'" in captured.out
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Tests for deriving window starts from a calendar"""
+
+import pytest
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.calendar_sync import CalendarSync, busy_blocks, window_starts
+from src.schedule import next_fire, parse_entry
+
+NOW = datetime(2025, 1, 6, 7, 0)  # Monday morning
+
+
+def write_calendar(path, *events):
+    lines = ["BEGIN:VCALENDAR"]
+    for event in events:
+        lines += ["BEGIN:VEVENT"] + list(event) + ["END:VEVENT"]
+    path.write_text("\r\n".join(lines + ["END:VCALENDAR"]) + "\r\n")
+    return path
+
+
+STANDUP = ["UID:standup", "DTSTART:20250106T093000", "DTEND:20250106T100000",
+           "RRULE:FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR"]
+WORKSHOP = ["UID:workshop", "DTSTART:20250107T130000", "DTEND:20250107T190000"]
+
+
+class TestWindows:
+    """Test busy blocks and window covering"""
+
+    def test_window_starts_cover_blocks(self):
+        day = datetime(2025, 1, 6)
+        blocks = [(day.replace(hour=9, minute=30), day.replace(hour=10)),
+                  (day.replace(hour=13), day.replace(hour=14, minute=30)),
+                  (day.replace(hour=16), day.replace(hour=17))]
+        assert [s.hour for s in window_starts(blocks)] == [9, 14]
+
+    def test_long_block_needs_several_windows(self):
+        day = datetime(2025, 1, 6)
+        assert [s.hour for s in window_starts([(day.replace(hour=8, minute=15), day.replace(hour=20))])] == [8, 13, 18]
+
+    def test_overrides_and_skipped_events(self, tmp_path):
+        """Moved, cancelled, free and all-day events are handled"""
+        path = write_calendar(
+            tmp_path / "cal.ics", STANDUP,
+            ["UID:standup", "RECURRENCE-ID:20250107T093000", "DTSTART:20250107T150000",
+             "DTEND:20250107T153000"],
+            ["UID:standup", "RECURRENCE-ID:20250108T093000", "STATUS:CANCELLED",
+             "DTSTART:20250108T093000", "DTEND:20250108T100000"],
+            ["UID:free", "DTSTART:20250106T180000", "DTEND:20250106T190000", "TRANSP:TRANSPARENT"],
+            ["UID:holiday", "DTSTART;VALUE=DATE:20250109", "DTEND;VALUE=DATE:20250110"],
+        )
+        with open(path) as f:
+            days = busy_blocks(f, datetime(2025, 1, 6), datetime(2025, 1, 10))
+        assert sorted(days) == [date(2025, 1, 6), date(2025, 1, 7), date(2025, 1, 9)]
+        assert days[date(2025, 1, 7)][0][0] == datetime(2025, 1, 7, 15)
+        assert days[date(2025, 1, 9)][0][0] == datetime(2025, 1, 9, 9, 30)
+
+
+class TestCalendarSync:
+    """Test incremental re-sync"""
+
+    def test_sync_and_resync(self, tmp_path):
+        path = write_calendar(tmp_path / "cal.ics", STANDUP, WORKSHOP)
+        sync = CalendarSync(tmp_path / "calendar.json", horizon_days=3)
+        first = sync.sync(path, now=NOW)
+        assert first['entries'] == ['2025-01-06 09:00', '2025-01-07 09:00',
+                                    '2025-01-07 14:00', '2025-01-08 09:00']
+        assert first['changed'] == 3
+
+        again = sync.sync(path, now=NOW)
+        assert again['entries'] == first['entries']
+        assert again['changed'] == 0
+
+        write_calendar(path, STANDUP)
+        with patch('src.calendar_sync.window_starts', wraps=window_starts) as derive:
+            dropped = sync.sync(path, now=NOW)
+        assert derive.call_count == 1  # only the workshop day is re-derived
+        assert dropped['changed'] == 1
+        assert '2025-01-07 14:00' not in dropped['entries']
+
+    def test_past_starts_are_dropped(self, tmp_path):
+        path = write_calendar(tmp_path / "cal.ics", STANDUP)
+        sync = CalendarSync(tmp_path / "calendar.json", horizon_days=2)
+        result = sync.sync(path, now=datetime(2025, 1, 6, 12))
+        assert result['entries'] == ['2025-01-07 09:00']
+
+
+class TestScheduleEntries:
+    """Test dated schedule entries"""
+
+    def test_parse_entry(self):
+        assert parse_entry("14:30") == (None, 14, 30)
+        assert parse_entry("2025-01-07 0900") == (date(2025, 1, 7), 9, 0)
+        with pytest.raises(ValueError):
+            parse_entry("2025-13-07 09:00")
+
+    def test_next_fire_with_dated_entries(self):
+        assert next_fire(["2025-01-06 06:00", "2025-01-07 09:00"], now=NOW) == datetime(2025, 1, 7, 9)
+        assert next_fire(["2025-01-06 06:00"], now=NOW) is None
+        assert next_fire(["2025-01-06 08:00", "12:00"], now=NOW) == datetime(2025, 1, 6, 8)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
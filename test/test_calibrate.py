@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Tests for claude installation calibration"""
+
+import os
+import pytest
+import sys
+from unittest.mock import patch
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.calibrate import calibrate, find_candidates, fingerprint
+from src.session import SessionManager
+
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="Uses shell script stand-ins for claude")
+
+
+def fake_install(root, version, delay, healthy=True):
+    """An NVM version directory with a claude script and a node"""
+    bin_dir = root / ".nvm" / "versions" / "node" / version / "bin"
+    bin_dir.mkdir(parents=True)
+    claude = bin_dir / "claude"
+    claude.write_text(f"#!/bin/sh\nsleep {delay}\nexit {0 if healthy else 1}\n")
+    claude.chmod(0o755)
+    (bin_dir / "node").write_text("")
+    return str(claude)
+
+
+@pytest.fixture
+def nvm(tmp_path, monkeypatch):
+    monkeypatch.setenv('NVM_DIR', str(tmp_path / ".nvm"))
+    monkeypatch.setattr('src.calibrate.common_bin_dirs', lambda: [])
+    monkeypatch.setattr('shutil.which', lambda name: None)
+    return tmp_path
+
+
+class TestCalibrate:
+    """Test discovery, timing and pinning"""
+
+    def test_find_candidates(self, nvm):
+        """Each NVM version is a candidate with its own node"""
+        slow = fake_install(nvm, "v18.0.0", 0)
+        fast = fake_install(nvm, "v20.0.0", 0)
+        candidates = find_candidates()
+        assert [c['claude_path'] for c in candidates] == [slow, fast]
+        assert candidates[0]['node_bin'] == os.path.dirname(slow)
+
+    def test_fastest_healthy_wins(self, nvm):
+        """The quickest candidate that exits 0 is pinned"""
+        fake_install(nvm, "v16.0.0", 0, healthy=False)
+        fake_install(nvm, "v18.0.0", 0.3)
+        fast = fake_install(nvm, "v20.0.0", 0)
+        pin = calibrate(runs=1)
+        assert pin['claude_path'] == fast
+        assert pin['node_bin'] == os.path.dirname(fast)
+        assert None in pin['timings'].values()
+
+    def test_fingerprint_tracks_changes(self, nvm):
+        """Adding an installation changes the fingerprint"""
+        fake_install(nvm, "v18.0.0", 0)
+        before = fingerprint(find_candidates())
+        assert fingerprint(find_candidates()) == before
+        fake_install(nvm, "v20.0.0", 0)
+        assert fingerprint(find_candidates()) != before
+
+
+class TestSessionPin:
+    """Test SessionManager's use of the pin"""
+
+    def setup_method(self):
+        """Setup test environment"""
+        self.manager = SessionManager()
+
+    def _settings(self, settings):
+        def set_setting(key, value):
+            settings[key] = value
+        return (
+            patch.object(self.manager.config, 'get_setting',
+                         side_effect=lambda key, default=None: settings.get(key, default)),
+            patch.object(self.manager.config, 'set_setting', side_effect=set_setting),
+        )
+
+    def test_pin_used_without_recalibration(self, nvm):
+        """A matching pin is used directly and its node goes first on PATH"""
+        fast = fake_install(nvm, "v20.0.0", 0)
+        settings = {'claude_pin': {'claude_path': fast, 'node_bin': os.path.dirname(fast),
+                                   'fingerprint': fingerprint(find_candidates())}}
+        p1, p2 = self._settings(settings)
+        with p1, p2, patch('src.session.calibrate') as mock_calibrate:
+            assert self.manager._check_claude_available()
+            env = self.manager._get_node_env()
+        mock_calibrate.assert_not_called()
+        assert self.manager.claude_path == fast
+        assert env['PATH'].startswith(os.path.dirname(fast) + ":")
+
+    def test_changed_candidates_recalibrate(self, nvm):
+        """A stale fingerprint triggers recalibration and a new pin"""
+        fake_install(nvm, "v18.0.0", 0.3)
+        fast = fake_install(nvm, "v20.0.0", 0)
+        settings = {'claude_pin': {'claude_path': '/gone/claude', 'node_bin': None,
+                                   'fingerprint': 'stale'}, 'calibrate_runs': 1}
+        p1, p2 = self._settings(settings)
+        with p1, p2:
+            assert self.manager._check_claude_available()
+        assert self.manager.claude_path == fast
+        assert settings['claude_pin']['fingerprint'] == fingerprint(find_candidates())
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
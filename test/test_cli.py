@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Test suite for Claude Code Session Automation CLI"""
 
+import io
+import json
 import pytest
 import sys
 import os
@@ -35,8 +37,8 @@ class TestCLI:
 
     @patch('platform.system')
     def test_non_macos_scheduling(self, mock_platform, capsys):
-        """Test scheduling on non-macOS systems"""
-        mock_platform.return_value = 'Linux'
+        """Test scheduling on systems without launchd or systemd"""
+        mock_platform.return_value = 'Windows'
         
         with patch('sys.argv', ['claude-code-automation', 'schedule', '14:30']):
             with pytest.raises(SystemExit) as exc_info:
@@ -112,5 +114,64 @@ class TestTimeValidation:
                     assert not (len(parts) == 2 and all(p.isdigit() for p in parts))
 
 
+class TestBatch:
+    """Test running several commands in one process"""
+
+    def run_batch(self, text, *options):
+        with patch('platform.system', return_value='Darwin'), \
+             patch('src.launchagent.LaunchAgentManager') as manager_class, \
+             patch('src.simple_cli.setup_logger'), \
+             patch('sys.stdin', io.StringIO(text)), \
+             patch('sys.argv', ['claude-code-automation', 'batch', *options]):
+            agent = manager_class.return_value
+            agent.install.return_value = True
+            agent.uninstall.return_value = True
+            agent.flush.return_value = True
+            agent.get_schedule_times.return_value = ['09:00']
+            agent.status_info.return_value = {'installed': True, 'loaded': True, 'pid': None,
+                                              'last_exit_status': None, 'error': None}
+            try:
+                main()
+                code = 0
+            except SystemExit as e:
+                code = e.code
+        return manager_class, agent, code
+
+    def test_shared_scheduler_single_reload(self, capsys):
+        """All lines share one scheduler whose reload is flushed once at the end"""
+        manager_class, agent, code = self.run_batch("# provision\nclear\nschedule 09:00\n\nlist\n")
+        assert code == 0
+        manager_class.assert_called_once()
+        agent.defer_reload.assert_called_once()
+        agent.flush.assert_called_once()
+        agent.install.assert_called_once_with(['09:00'])
+        captured = capsys.readouterr()
+        assert "▶ [3] schedule 09:00" in captured.out
+        assert "Batch: 3 commands, 0 failed" in captured.out
+
+    def test_failures_are_reported_per_line(self, capsys):
+        """A failing line does not stop the batch unless asked to"""
+        _, _, code = self.run_batch("schedule 25:00\nserve\nlist\n")
+        assert code == 1
+        captured = capsys.readouterr()
+        assert "✗ [1] exited with code 1" in captured.out
+        assert "'serve' cannot run inside a batch" in captured.out
+        assert "Batch: 3 commands, 2 failed" in captured.out
+
+        _, agent, code = self.run_batch("schedule 25:00\nlist\n", '--stop-on-error')
+        assert "Batch: 1 commands, 1 failed" in capsys.readouterr().out
+        agent.flush.assert_called_once()
+
+    def test_json_lines(self, capsys):
+        """JSON mode emits one document per line, then the batch summary"""
+        _, _, code = self.run_batch("list\nschedule 9999\n", '--json')
+        documents = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [d['command'] for d in documents] == ['list', 'schedule', 'batch']
+        assert documents[0]['line'] == 1 and documents[0]['schedule'] == ['09:00']
+        assert documents[1]['exit_code'] == 1
+        assert documents[2]['results'][1] == {'line': 2, 'command': 'schedule 9999', 'exit_code': 1}
+        assert code == 1
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
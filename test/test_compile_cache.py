@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Tests for the managed Node compile cache"""
+
+import os
+import pytest
+import sys
+from unittest.mock import patch
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.compile_cache import NODE_COMPILE_CACHE_ENV, CompileCache, is_node_script
+from src.session import SessionManager
+
+
+NODE_SCRIPT = "#!/usr/bin/env node\n"
+
+
+def binary(path, content="x"):
+    path.write_text(content)
+    return str(path)
+
+
+class TestCompileCache:
+    """Test invalidation and LRU trimming"""
+
+    def test_cold_then_warm(self, tmp_path):
+        """The cache is warm once node has written entries for the same binaries"""
+        claude = binary(tmp_path / "claude", NODE_SCRIPT)
+        node = binary(tmp_path / "node")
+        cache = CompileCache(tmp_path / "cache", max_bytes=1024)
+        assert cache.prepare(claude, node) == 'cold'
+        (tmp_path / "cache" / "entry").write_bytes(b"v8")
+        assert cache.prepare(claude, node) == 'warm'
+        assert cache.env() == {NODE_COMPILE_CACHE_ENV: str(tmp_path / "cache")}
+
+    def test_binary_change_invalidates(self, tmp_path):
+        """A different node wipes the cache"""
+        claude = binary(tmp_path / "claude", NODE_SCRIPT)
+        cache = CompileCache(tmp_path / "cache", max_bytes=1024)
+        cache.prepare(claude, binary(tmp_path / "node18"))
+        (tmp_path / "cache" / "entry").write_bytes(b"v8")
+        assert cache.prepare(claude, binary(tmp_path / "node20")) == 'cold'
+        assert not (tmp_path / "cache" / "entry").exists()
+
+    def test_off_without_node(self, tmp_path):
+        """A native claude or a missing node never creates the cache"""
+        cache = CompileCache(tmp_path / "cache", max_bytes=1024)
+        native = binary(tmp_path / "claude-native", "\x7fELF")
+        script = binary(tmp_path / "claude", NODE_SCRIPT)
+        assert not is_node_script(native)
+        assert is_node_script(script)
+        assert is_node_script(binary(tmp_path / "cli.js", "// no shebang"))
+        assert cache.prepare(native, binary(tmp_path / "node")) == 'off'
+        assert cache.prepare(script, None) == 'off'
+        assert not (tmp_path / "cache").exists()
+
+    def test_trim_evicts_least_recently_used(self, tmp_path):
+        """Oldest files go first until the cache fits"""
+        cache = CompileCache(tmp_path / "cache", max_bytes=250)
+        cache.prepare(binary(tmp_path / "claude", NODE_SCRIPT), binary(tmp_path / "node"))
+        sub = tmp_path / "cache" / "v22"
+        sub.mkdir()
+        for age, name in enumerate(["new", "mid", "old"]):
+            path = sub / name
+            path.write_bytes(b"0" * 100)
+            os.utime(path, (1000 - age * 100, 1000 - age * 100))
+
+        assert cache.trim() == 100
+        assert sorted(p.name for p in sub.iterdir()) == ["mid", "new"]
+        assert (tmp_path / "cache" / ".key").exists()
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="Uses a shell script stand-in for claude")
+class TestSessionCompileCache:
+    """Test the cache and latency recording around a spawn"""
+
+    def test_env_and_first_output(self, tmp_path):
+        """The child sees the cache directory and first-output latency is recorded"""
+        claude = tmp_path / "claude"
+        claude.write_text('#!/bin/sh\n'
+                          'echo "{\\"type\\": \\"cache\\", \\"dir\\": \\"$NODE_COMPILE_CACHE\\"}"\n'
+                          'echo \'{"type": "result", "subtype": "success", "is_error": false, "result": "hi"}\'\n')
+        claude.chmod(0o755)
+
+        node_bin = tmp_path / "node-bin"
+        node_bin.mkdir()
+        binary(node_bin / "node")
+
+        manager = SessionManager()
+        manager.session_dir = tmp_path
+        manager.claude_path = str(claude)
+        manager.node_bin = str(node_bin)
+        manager.config.config_dir = tmp_path
+        # A shell stand-in for claude's node script
+        with patch('src.compile_cache.is_node_script', return_value=True), \
+             patch.object(manager, '_check_claude_available', return_value=True), \
+             patch.object(manager, 'create_session_marker'), \
+             patch.object(manager.history, 'record') as record, \
+             patch('os.chdir'):
+            assert manager._start_claude_session(10)
+
+        recorded = record.call_args.kwargs
+        assert recorded['compile_cache'] == 'cold'
+        assert 0 <= recorded['first_output'] <= recorded['duration']
+        assert (tmp_path / "node-compile-cache" / ".key").exists()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
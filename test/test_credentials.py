@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Tests for the credential pre-flight check"""
+
+import pytest
+import sys
+import json
+import time
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.credentials import CredentialChecker
+
+
+class TestCredentialChecker:
+    """Test expiry detection, fallback probe and caching"""
+
+    def _checker(self, tmp_path, credentials=None, ttl=60):
+        claude_dir = tmp_path / ".claude"
+        claude_dir.mkdir(exist_ok=True)
+        if credentials is not None:
+            (claude_dir / ".credentials.json").write_text(json.dumps(credentials))
+        return CredentialChecker(tmp_path / "cache.json", ttl=ttl)
+
+    @pytest.fixture(autouse=True)
+    def _env(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('ANTHROPIC_API_KEY', raising=False)
+        monkeypatch.delenv('CLAUDE_CONFIG_DIR', raising=False)
+        monkeypatch.setattr(Path, 'home', lambda: tmp_path)
+        monkeypatch.setattr('platform.system', lambda: 'Linux')
+
+    def test_valid_token(self, tmp_path):
+        """Unexpired credentials pass"""
+        expires = int((time.time() + 3600) * 1000)
+        checker = self._checker(tmp_path, {"claudeAiOauth": {"expiresAt": expires}})
+        assert checker.check()[0] == 'ok'
+
+    def test_expired_without_refresh_token(self, tmp_path):
+        """Expired credentials with nothing to refresh them are doomed"""
+        expires = int((time.time() - 3600) * 1000)
+        checker = self._checker(tmp_path, {"claudeAiOauth": {"expiresAt": expires}})
+        status, message = checker.check()
+        assert status == 'expired'
+        assert "/login" in message
+
+    def test_expired_with_refresh_token(self, tmp_path):
+        """claude refreshes an expired access token on its own"""
+        expires = int((time.time() - 3600) * 1000)
+        checker = self._checker(tmp_path, {"claudeAiOauth": {"expiresAt": expires, "refreshToken": "r"}})
+        assert checker.check()[0] == 'ok'
+
+    def test_probe_fallback_and_cache(self, tmp_path):
+        """Unreadable credentials fall back to one probe, then the cache"""
+        checker = self._checker(tmp_path)
+        with patch('subprocess.run', return_value=MagicMock(returncode=1)) as mock_run:
+            assert checker.check()[0] == 'unavailable'
+            assert checker.check()[0] == 'unavailable'
+        mock_run.assert_called_once()
+
+    def test_keychain_locked(self, tmp_path, monkeypatch):
+        """A locked keychain on macOS is reported without spawning claude"""
+        monkeypatch.setattr('platform.system', lambda: 'Darwin')
+        checker = self._checker(tmp_path)
+        with patch('subprocess.run', return_value=MagicMock(returncode=36, stdout="")) as mock_run:
+            assert checker.check()[0] == 'locked'
+        assert mock_run.call_args[0][0][0] == 'security'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Tests for usage-limit deferral"""
+
+import pytest
+import sys
+import time
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.deferral import DeferredStart, is_usage_limit, parse_reset_time
+from src.session import FAILURE_USAGE_LIMIT, SessionManager
+
+
+class TestParseResetTime:
+    """Test extraction of the reset time from claude's output"""
+
+    def test_epoch_format(self):
+        """The pipe-delimited epoch is used as is"""
+        text = "Claude AI usage limit reached|1749924000"
+        assert is_usage_limit(text)
+        assert parse_reset_time(text) == 1749924000.0
+
+    def test_clock_format(self):
+        """'resets 3pm' is the next 15:00 after now"""
+        now = datetime(2025, 6, 1, 11, 20).timestamp()
+        reset = parse_reset_time("5-hour limit reached ∙ resets 3pm", now=now)
+        assert datetime.fromtimestamp(reset) == datetime(2025, 6, 1, 15, 0)
+
+        reset = parse_reset_time("Your limit will reset at 9:30am", now=now)
+        assert datetime.fromtimestamp(reset) == datetime(2025, 6, 2, 9, 30)
+
+    def test_timezone(self):
+        """A named timezone is honoured"""
+        now = datetime(2025, 6, 1, 12, 0).timestamp()
+        reset = parse_reset_time("limit reached · resets 3pm (UTC)", now=now)
+        assert datetime.utcfromtimestamp(reset).hour == 15
+
+    def test_unrelated_output(self):
+        """Ordinary responses are not mistaken for the limit message"""
+        assert not is_usage_limit("Session started")
+        assert parse_reset_time("Session started") is None
+
+    def test_rate_limit_is_not_usage_limit(self):
+        """Transient rate-limit and overload errors are not the usage limit"""
+        assert not is_usage_limit("API Error: Request rate limit reached, please retry")
+        assert not is_usage_limit("Concurrency limit reached (overloaded_error)")
+        assert is_usage_limit("5-hour limit reached ∙ resets 3pm")
+
+
+class TestDeferredStart:
+    """Test the persisted one-shot"""
+
+    def test_roundtrip(self, tmp_path):
+        """A deferral survives reloading and can be cleared"""
+        deferred = DeferredStart(tmp_path / "deferred.json")
+        assert deferred.load() is None
+        deferred.save(time.time() + 600, 'usage_limit')
+        assert DeferredStart(tmp_path / "deferred.json").pending_until() is not None
+        deferred.clear()
+        assert deferred.load() is None
+
+    def test_due_is_not_pending(self, tmp_path):
+        """A deferral in the past is due, not pending"""
+        deferred = DeferredStart(tmp_path / "deferred.json")
+        deferred.save(time.time() - 1, 'usage_limit')
+        assert deferred.pending_until() is None
+
+
+class TestSessionDeferral:
+    """Test SessionManager's handling of the usage limit"""
+
+    def setup_method(self):
+        """Setup test environment"""
+        self.manager = SessionManager()
+
+    @pytest.fixture(autouse=True)
+    def _isolate(self, tmp_path):
+        self.manager.deferred = DeferredStart(tmp_path / "deferred.json")
+        with patch.object(self.manager, 'check_credentials', return_value=True), \
+             patch.object(self.manager, '_check_claude_available', return_value=True), \
+             patch.object(self.manager.history, 'record'), \
+             patch('os.chdir'), patch('time.sleep'):
+            yield
+
+    def test_limit_defers_without_retry(self):
+        """The reset time is persisted with a margin and retries stop"""
+        supervisor = MagicMock()
+        supervisor.run.return_value = (1, "Claude AI usage limit reached|2000000000", "")
+        with patch.object(self.manager, '_get_supervisor', return_value=supervisor):
+            assert self.manager.start_session() is False
+
+        assert supervisor.run.call_count == 1
+        assert self.manager.last_failure == FAILURE_USAGE_LIMIT
+        assert self.manager.deferred.load()['at'] == 2000000060
+
+    def test_limit_on_stderr_only(self):
+        """A limit message only on stderr still defers, even with other stdout"""
+        supervisor = MagicMock()
+        supervisor.run.return_value = (1, "Loading configuration...\n", "Claude AI usage limit reached|2000000000")
+        with patch.object(self.manager, '_get_supervisor', return_value=supervisor):
+            assert self.manager.start_session() is False
+
+        assert supervisor.run.call_count == 1
+        assert self.manager.last_failure == FAILURE_USAGE_LIMIT
+        assert self.manager.deferred.load()['at'] == 2000000060
+
+    def test_limit_without_reset_time_is_retried(self):
+        """Without a readable reset time nothing is deferred and retries continue"""
+        supervisor = MagicMock()
+        supervisor.run.return_value = (1, "Claude AI usage limit reached", "")
+        with patch.object(self.manager, '_get_supervisor', return_value=supervisor):
+            assert self.manager.start_session() is False
+
+        assert supervisor.run.call_count == self.manager.max_retries
+        assert self.manager.last_failure != FAILURE_USAGE_LIMIT
+        assert self.manager.deferred.load() is None
+
+    def test_pending_deferral_skips_spawn(self):
+        """Nothing is spawned before the reset time"""
+        self.manager.deferred.save(time.time() + 600, 'usage_limit')
+        with patch.object(self.manager, '_get_supervisor') as get_supervisor:
+            assert self.manager.start_session() is False
+        get_supervisor.assert_not_called()
+        assert self.manager.deferred_until is not None
+
+    def test_due_deferral_is_consumed(self):
+        """A due deferral is cleared by the start it triggers"""
+        self.manager.deferred.save(time.time() - 5, 'usage_limit')
+        supervisor = MagicMock()
+        supervisor.run.return_value = (0, "Hello", "")
+        with patch.object(self.manager, '_get_supervisor', return_value=supervisor), \
+             patch.object(self.manager, 'create_session_marker'):
+            assert self.manager.start_session() is True
+        assert self.manager.deferred.load() is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Tests for run history and adaptive spawn timeouts"""
+
+import pytest
+import sys
+from unittest.mock import patch
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.history import RunHistory, percentile, rolling_means
+from src.session import SessionManager
+
+
+class TestRunHistory:
+    """Test the rolling run history"""
+
+    def test_percentile(self):
+        """Test nearest-rank percentile"""
+        assert percentile([], 95) is None
+        assert percentile([3.0], 95) == 3.0
+        assert percentile(list(range(1, 101)), 95) == 95
+        assert percentile([5, 1, 3], 50) == 3
+
+    def test_record_and_latencies(self, tmp_path):
+        """Only successful durations count as latency samples"""
+        history = RunHistory(tmp_path / "history.jsonl")
+        history.record(ok=True, duration=4.0)
+        history.record(ok=False, duration=None)
+        history.record(ok=True, duration=6.0)
+
+        assert history.latencies() == [4.0, 6.0]
+        assert len(history.load()) == 3
+
+    def test_compaction_keeps_newest(self, tmp_path):
+        """History is trimmed back to the cap once it doubles"""
+        history = RunHistory(tmp_path / "history.jsonl", max_entries=5)
+        for i in range(11):
+            history.record(ok=True, duration=float(i))
+
+        entries = history.load()
+        assert len(entries) == 5
+        assert entries[-1]["duration"] == 10.0
+
+    def test_rolling_means(self):
+        """Fields missing from some entries are averaged over the rest"""
+        entries = [{'user_cpu': 1.0, 'max_rss_mb': 100}, {'user_cpu': 2.0}, {'user_cpu': None}]
+        assert rolling_means(entries, ['user_cpu', 'max_rss_mb', 'system_cpu']) == \
+            {'user_cpu': 1.5, 'max_rss_mb': 100.0, 'system_cpu': None}
+
+    def test_status_shows_resource_averages(self, tmp_path):
+        """status compares the last runs with the ones before them"""
+        from src.simple_cli import _render_status, _resource_summary
+        entries = [{'user_cpu': 1.0, 'system_cpu': 0.2, 'max_rss_mb': 100,
+                    'voluntary_ctx': 10, 'involuntary_ctx': 5}] * 10
+        entries += [dict(entries[0], max_rss_mb=150)] * 10
+        document = {"next_start": None, "deferred_until": None, "session": None,
+                    "resources": _resource_summary(entries)}
+        text = _render_status("✓ Service is loaded", document, tmp_path / "marker")
+        assert "Resources (avg of last 10 runs): CPU 1.00s user / 0.20s system, peak RSS 150 MB" in text
+        assert "vs previous runs: CPU +0%, RSS +50%" in text
+
+
+class TestAdaptiveTimeout:
+    """Test timeout derivation in SessionManager"""
+
+    def setup_method(self):
+        """Setup test environment"""
+        self.manager = SessionManager()
+
+    def _with_settings(self, samples, settings=None):
+        settings = settings or {}
+        self.manager.history = RunHistory(Path("/nonexistent/history.jsonl"))
+        return (
+            patch.object(self.manager.history, 'latencies', return_value=samples),
+            patch.object(self.manager.config, 'get_setting',
+                         side_effect=lambda key, default=None: settings.get(key, default)),
+        )
+
+    def test_default_without_history(self):
+        """Fall back to the default timeout until enough samples exist"""
+        p1, p2 = self._with_settings([5.0, 6.0])
+        with p1, p2:
+            assert self.manager.compute_timeout(1) == 30
+
+    def test_no_backoff_without_history(self):
+        """Retries keep the fixed default until the timeout is history-derived"""
+        p1, p2 = self._with_settings([])
+        with p1, p2:
+            assert [self.manager.compute_timeout(attempt) for attempt in (1, 2, 3)] == [30, 30, 30]
+
+    def test_percentile_multiple_clamped(self):
+        """Timeout is a multiple of the percentile, clamped to floor/ceiling"""
+        p1, p2 = self._with_settings([4.0] * 10)
+        with p1, p2:
+            assert self.manager.compute_timeout(1) == 10  # 8s raised to floor
+            assert self.manager.compute_timeout(2) == 16
+            assert self.manager.compute_timeout(5) == 90  # capped at ceiling
+
+        p1, p2 = self._with_settings([12.0] * 10, {'timeout_multiplier': 1.5})
+        with p1, p2:
+            assert self.manager.compute_timeout(1) == 18
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
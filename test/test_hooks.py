@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Tests for pre/post-start hooks"""
+
+import os
+import pytest
+import sys
+import threading
+import time
+from unittest.mock import patch
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.hooks import Hook, HookRun, load_hooks
+from src.session import SessionManager
+
+
+CALLS = []
+RELEASE = threading.Event()
+
+
+def record_hook(context):
+    CALLS.append(context)
+
+
+def hanging_hook(context):
+    RELEASE.wait(5)
+
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="Uses POSIX shell commands")
+
+
+class TestHook:
+    """Test hook specs"""
+
+    def test_spec_forms(self):
+        """Strings are commands unless they look like module:function"""
+        assert Hook("touch /tmp/x").command == "touch /tmp/x"
+        assert Hook("mypkg.hooks:notify").function == "mypkg.hooks:notify"
+        hook = Hook({"command": "true", "timeout": 2})
+        assert hook.timeout == 2
+        with pytest.raises(ValueError):
+            Hook({"timeout": 1})
+
+    def test_load_hooks_skips_invalid(self):
+        """Bad entries are dropped and the section timeout is the default"""
+        hooks = load_hooks({"timeout": 3, "pre_start": ["true", {"bogus": 1}]}, "pre_start")
+        assert len(hooks) == 1
+        assert hooks[0].timeout == 3
+
+
+class TestHookRun:
+    """Test concurrency and budgets"""
+
+    def test_hooks_run_concurrently(self):
+        """Two slow commands take about as long as one"""
+        run = HookRun('pre_start', [Hook("sleep 0.4"), Hook("sleep 0.4")])
+        started = time.monotonic()
+        counts = run.start().wait()
+        assert counts == {'ok': 2, 'error': 0, 'timeout': 0}
+        assert time.monotonic() - started < 0.75
+
+    def test_budget_bounds_wait(self):
+        """A hanging command is killed and a hanging function abandoned at the budget"""
+        RELEASE.clear()
+        hooks = [Hook({"command": "sleep 30", "timeout": 0.3}),
+                 Hook({"function": "test_hooks:hanging_hook", "timeout": 0.3}),
+                 Hook("false")]
+        started = time.monotonic()
+        counts = HookRun('pre_start', hooks).start().wait()
+        RELEASE.set()
+        assert counts == {'ok': 0, 'error': 1, 'timeout': 2}
+        assert time.monotonic() - started < 2
+
+    def test_function_receives_context(self):
+        """Function hooks get the event and context"""
+        CALLS.clear()
+        HookRun('post_start', [Hook("test_hooks:record_hook")], {"ok": True}).start().wait()
+        assert CALLS == [{"ok": True, "event": "post_start"}]
+
+
+class TestSessionHooks:
+    """Test hooks around start_session"""
+
+    def test_slow_pre_hook_does_not_delay_spawn(self):
+        """The spawn waits at most the hook's budget; post hooks see the outcome"""
+        CALLS.clear()
+        manager = SessionManager()
+        settings = {'hooks': {'pre_start': [{"command": "sleep 30", "timeout": 0.3}],
+                              'post_start': ["test_hooks:record_hook"]}}
+        with patch.object(manager.config, 'get_setting',
+                          side_effect=lambda key, default=None: settings.get(key, default)), \
+             patch.object(manager, '_check_deferral', return_value=True), \
+             patch.object(manager, '_check_claude_available', return_value=True), \
+             patch.object(manager, 'check_credentials', return_value=True), \
+             patch.object(manager, '_start_claude_session', return_value=True):
+            started = time.monotonic()
+            assert manager.start_session()
+        assert time.monotonic() - started < 2
+        assert CALLS == [{"ok": True, "failure": None, "event": "post_start"}]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Tests for the streaming ICS reader and recurrence expansion"""
+
+import pytest
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.ics import expand, iter_events, parse_duration, parse_property, unfold
+
+
+def calendar(*events):
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0"]
+    for event in events:
+        lines += ["BEGIN:VEVENT"] + list(event) + ["END:VEVENT"]
+    return [line + "\r\n" for line in lines + ["END:VCALENDAR"]]
+
+
+def starts(rule, dtstart, until=datetime(2025, 3, 1)):
+    return list(expand(dtstart, dict(part.split('=') for part in rule.split(';')),
+                       dtstart, until))
+
+
+class TestParsing:
+    """Test line unfolding and property parsing"""
+
+    def test_unfold(self):
+        lines = ["SUMMARY:Long\r\n", " er title\r\n", "\tcontinued\r\n", "UID:1\r\n"]
+        assert list(unfold(lines)) == ["SUMMARY:Longer titlecontinued", "UID:1"]
+
+    def test_property_with_quoted_colon(self):
+        name, params, value = parse_property('DTSTART;TZID="Custom:Zone";X=1:20250106T090000')
+        assert name == 'DTSTART'
+        assert params == {'TZID': 'Custom:Zone', 'X': '1'}
+        assert value == '20250106T090000'
+
+    def test_duration(self):
+        assert parse_duration("PT1H30M") == timedelta(minutes=90)
+        assert parse_duration("P1DT2H") == timedelta(hours=26)
+
+    def test_iter_events_skips_nested_components(self):
+        """VALARM properties do not leak into the event"""
+        events = list(iter_events(calendar([
+            "UID:a", "DTSTART:20250106T090000", "DURATION:PT1H",
+            "BEGIN:VALARM", "TRIGGER:-PT15M", "DURATION:PT5M", "END:VALARM",
+        ])))
+        assert len(events) == 1
+        assert events[0].uid == 'a'
+        assert events[0].length == timedelta(hours=1)
+
+    def test_utc_is_converted_to_local(self):
+        event = next(iter_events(calendar(["DTSTART:20250106T090000Z", "DTEND:20250106T100000Z"])))
+        start, end = next(event.occurrences(datetime(2025, 1, 1), datetime(2025, 2, 1)))
+        expected = datetime(2025, 1, 6, 9, tzinfo=timezone.utc).astimezone()
+        assert start == expected.replace(tzinfo=None)
+        assert end - start == timedelta(hours=1)
+
+
+class TestRecurrence:
+    """Test RRULE expansion"""
+
+    def test_weekly_byday(self):
+        result = starts("FREQ=WEEKLY;BYDAY=MO,WE;COUNT=4", datetime(2025, 1, 6, 9))
+        assert [d.day for d in result] == [6, 8, 13, 15]
+
+    def test_daily_interval_until(self):
+        result = starts("FREQ=DAILY;INTERVAL=2;UNTIL=20250110T235959", datetime(2025, 1, 6, 9))
+        assert [d.day for d in result] == [6, 8, 10]
+
+    def test_monthly_nth_weekday(self):
+        """Second Tuesday and last Friday of each month"""
+        result = starts("FREQ=MONTHLY;BYDAY=2TU,-1FR;COUNT=4", datetime(2025, 1, 1, 9))
+        assert [(d.month, d.day) for d in result] == [(1, 14), (1, 31), (2, 11), (2, 28)]
+
+    def test_monthly_skips_missing_days(self):
+        result = starts("FREQ=MONTHLY;COUNT=3", datetime(2025, 1, 31, 9), until=datetime(2025, 6, 1))
+        assert [(d.month, d.day) for d in result] == [(1, 31), (3, 31), (5, 31)]
+
+    def test_open_ended_series_fast_forwards(self):
+        """A series started years ago only yields occurrences near the window"""
+        result = list(expand(datetime(2010, 1, 4, 9), {'FREQ': 'DAILY'},
+                             datetime(2025, 1, 6), datetime(2025, 1, 8)))
+        assert result[-1] == datetime(2025, 1, 7, 9)
+        assert len(result) <= 4
+
+    def test_exdate_and_window(self):
+        event = next(iter_events(calendar([
+            "UID:x", "DTSTART:20250106T090000", "DTEND:20250106T100000",
+            "RRULE:FREQ=DAILY", "EXDATE:20250107T090000",
+        ])))
+        days = [s.day for s, _ in event.occurrences(datetime(2025, 1, 6), datetime(2025, 1, 9))]
+        assert days == [6, 8]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tests for the zipapp launcher"""
+
+import pytest
+import sys
+import subprocess
+import zipfile
+from unittest.mock import patch
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.launcher import build_zipapp, zipapp_command
+from src.launchagent import LaunchAgentManager
+
+
+class TestZipappLauncher:
+    """Test building and running the zipapp"""
+
+    def test_build_contains_bytecode(self, tmp_path):
+        """Every module ships with precompiled bytecode"""
+        archive = build_zipapp(tmp_path / "launcher.pyz")
+
+        names = zipfile.ZipFile(archive).namelist()
+        assert "__main__.py" in names
+        assert "src/simple_cli.pyc" in names
+        assert "src/session.pyc" in names
+
+    def test_runs_with_isolated_interpreter(self, tmp_path):
+        """The archive runs under -I -S"""
+        archive = build_zipapp(tmp_path / "launcher.pyz")
+
+        result = subprocess.run(zipapp_command(archive) + ['help'],
+                                capture_output=True, text=True, timeout=30)
+        assert result.returncode == 0
+        assert "Usage:" in result.stdout
+
+    def test_plist_uses_zipapp(self, tmp_path):
+        """create_plist invokes the zipapp when configured"""
+        manager = LaunchAgentManager()
+        manager.config.config_dir = tmp_path
+        with patch.object(manager.config, 'get_setting',
+                          side_effect=lambda key, default=None: 'zipapp' if key == 'launcher' else default):
+            plist = manager.create_plist(['14:30'])
+
+        args = plist['ProgramArguments']
+        assert args[1:3] == ['-I', '-S']
+        assert args[3] == str(tmp_path / "launcher.pyz")
+        assert args[-1] == 'start'
+        assert Path(args[0]).is_absolute()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Tests for compressed log rotation"""
+
+import pytest
+import sys
+import gzip
+import logging
+import subprocess
+import textwrap
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.logger import CompressedRotatingFileHandler, read_backup_lines
+
+
+def _make_logger(handler, name):
+    logger = logging.getLogger(name)
+    logger.handlers = []
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    return logger
+
+
+class TestCompressedRotation:
+    """Test size and daily rollover with background compression"""
+
+    def test_size_rollover_compresses_backups(self, tmp_path):
+        """Backups are gzipped and readable in order"""
+        log_file = tmp_path / "app.log"
+        handler = CompressedRotatingFileHandler(str(log_file), maxBytes=200, backupCount=10)
+        logger = _make_logger(handler, "test-size-rotation")
+
+        for i in range(40):
+            logger.info(f"line {i:03d}")
+        handler.doRollover()
+        handler._compressor.join()
+        handler.close()
+
+        backups = sorted(p.name for p in tmp_path.iterdir() if p.name.endswith(".gz"))
+        assert backups
+        assert not any(p.name.endswith(".1") for p in tmp_path.iterdir())
+        with gzip.open(tmp_path / "app.log.1.gz", 'rt') as f:
+            assert "line 039" in f.read()
+
+        lines = read_backup_lines(log_file, 40)
+        assert lines == [f"line {i:03d}" for i in range(40)][-len(lines):]
+        assert lines[-1] == "line 039"
+
+    def test_daily_rollover(self, tmp_path):
+        """A record from a later day triggers rollover"""
+        log_file = tmp_path / "app.log"
+        handler = CompressedRotatingFileHandler(str(log_file), backupCount=3, daily=True)
+        logger = _make_logger(handler, "test-daily-rotation")
+
+        logger.info("yesterday")
+        handler.rollover_at = time.time() - 1
+        logger.info("today")
+        handler._compressor.join()
+        handler.close()
+
+        assert log_file.read_text() == "today\n"
+        with gzip.open(tmp_path / "app.log.1.gz", 'rt') as f:
+            assert f.read() == "yesterday\n"
+
+    def test_read_plain_backups(self, tmp_path):
+        """Uncompressed legacy backups are still read"""
+        log_file = tmp_path / "app.log"
+        (tmp_path / "app.log.1").write_text("b1\nb2\n")
+        (tmp_path / "app.log.2").write_text("a1\na2\n")
+
+        assert read_backup_lines(log_file, 3) == ["a2", "b1", "b2"]
+
+
+WRITER = textwrap.dedent("""
+    import logging, sys
+    sys.path.insert(0, sys.argv[1])
+    from src.logger import CompressedRotatingFileHandler
+    handler = CompressedRotatingFileHandler(sys.argv[2], maxBytes=4096, backupCount=1000)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger = logging.getLogger('stress')
+    logger.propagate = False
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    for i in range(int(sys.argv[4])):
+        logger.info('writer %s line %05d ' % (sys.argv[3], i) + 'x' * (i % 37) + ' end')
+    handler.close()
+""")
+
+
+def _all_log_lines(log_file):
+    lines = []
+    for path in log_file.parent.iterdir():
+        if path.name.endswith(".gz"):
+            with gzip.open(path, 'rt') as f:
+                lines += f.read().splitlines()
+        elif path.name == log_file.name or path.name[len(log_file.name) + 1:].isdigit():
+            lines += path.read_text().splitlines()
+    return lines
+
+
+class TestMultiProcessSafety:
+    """Several handlers, and several processes, sharing one log file"""
+
+    def test_rotation_by_another_handler_is_followed(self, tmp_path):
+        """Records go to the new file, not the one rotated away by someone else"""
+        log_file = tmp_path / "app.log"
+        first = CompressedRotatingFileHandler(str(log_file), maxBytes=100, backupCount=5, compress=False)
+        second = CompressedRotatingFileHandler(str(log_file), maxBytes=100, backupCount=5, compress=False)
+        logger_a = _make_logger(first, "test-shared-a")
+        logger_b = _make_logger(second, "test-shared-b")
+
+        logger_b.info("b before")
+        for i in range(8):
+            logger_a.info(f"a line {i:02d} padding")
+        logger_b.info("b after")
+        first.close()
+        second.close()
+
+        backups = "".join(p.read_text() for p in tmp_path.glob("app.log.[0-9]"))
+        assert "b before" in backups
+        assert "b after" not in backups
+        assert log_file.read_text().splitlines()[-1] == "b after"
+
+    def test_concurrent_writers_lose_no_lines(self, tmp_path):
+        """Concurrent processes forcing many rollovers lose or tear no lines"""
+        log_file = tmp_path / "app.log"
+        root = str(Path(__file__).parent.parent)
+        writers, count = 8, 400
+        processes = [
+            subprocess.Popen([sys.executable, "-c", WRITER, root, str(log_file), str(n), str(count)])
+            for n in range(writers)
+        ]
+        assert all(process.wait(timeout=120) == 0 for process in processes)
+
+        lines = _all_log_lines(log_file)
+        expected = {f"writer {n} line {i:05d} " + 'x' * (i % 37) + " end"
+                    for n in range(writers) for i in range(count)}
+        assert len(lines) == len(expected)
+        assert set(lines) == expected
+        assert len(list(tmp_path.glob("app.log.*.gz"))) > 10
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -50,6 +50,24 @@ class TestLaunchAgentCore:
                 {'Hour': 18, 'Minute': 30}
             ]
             assert plist['StartCalendarInterval'] == expected
+    
+    def _status(self, listing):
+        with patch('subprocess.run', return_value=MagicMock(stdout=listing, returncode=0)):
+            return self.manager.status_info()
+    
+    def test_status_ignores_prewarm_and_deferred_jobs(self):
+        """Jobs whose labels extend the main label are not taken for the schedule"""
+        listing = ("PID\tStatus\tLabel\n"
+                   "4242\t0\tcom.claude-code-automation.prewarm\n"
+                   "-\t78\tcom.claude-code-automation.deferred\n")
+        info = self._status(listing)
+        assert not info['loaded']
+        assert info['pid'] is None
+        
+        info = self._status(listing + "-\t0\tcom.claude-code-automation\n")
+        assert info['loaded']
+        assert info['pid'] is None
+        assert info['last_exit_status'] == '0'
 
 
 class TestSessionCore:
@@ -107,7 +125,7 @@ class TestCLICore:
         """Test basic schedule command success"""
         
         with patch('platform.system', return_value='Darwin'):
-            with patch('src.simple_cli.LaunchAgentManager') as MockManager:
+            with patch('src.launchagent.LaunchAgentManager') as MockManager:
                 with patch('src.logger.setup_logger'):
                     mock_manager = MockManager.return_value
                     mock_manager.install.return_value = True
@@ -121,9 +139,9 @@ class TestCLICore:
         assert "✓ Scheduled sessions at: 14:30" in captured.out
     
     def test_schedule_non_macos_error(self, capsys):
-        """Test schedule command on non-macOS"""
+        """Test schedule command without launchd or systemd"""
         
-        with patch('platform.system', return_value='Linux'):
+        with patch('platform.system', return_value='Windows'):
             with patch('sys.argv', ['claude-code-automation', 'schedule', '14:30']):
                 with pytest.raises(SystemExit) as exc_info:
                     main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Tests for --json output and exit codes"""
+
+import json
+import pytest
+import sys
+from unittest.mock import patch
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.output import (
+    CommandOutput, EXIT_AUTH_FAILURE, EXIT_CLAUDE_MISSING, EXIT_NOT_INSTALLED,
+    EXIT_NOT_LOADED, EXIT_TIMEOUT
+)
+from src.session import FAILURE_AUTH, FAILURE_CLAUDE_MISSING, FAILURE_TIMEOUT
+from src.simple_cli import main
+
+
+def run_cli(*args):
+    """Run the CLI, returning the exit code"""
+    with patch('sys.argv', ['claude-code-automation', *args]):
+        try:
+            main()
+        except SystemExit as e:
+            return e.code
+    return 0
+
+
+class TestCommandOutput:
+    """Test the output collector"""
+
+    def test_text_mode(self, capsys):
+        """Text passes straight through and nothing else is printed"""
+        out = CommandOutput('list')
+        out.print("hello")
+        out.update(schedule=['09:00'])
+        out.finish()
+        assert capsys.readouterr().out == "hello\n"
+
+    def test_json_mode(self, capsys):
+        """Text is suppressed and one document is emitted"""
+        out = CommandOutput('list', json_mode=True)
+        out.print("hello")
+        out.update(schedule=['09:00'])
+        out.finish()
+        out.finish()
+        document = json.loads(capsys.readouterr().out)
+        assert document == {"command": "list", "ok": True, "exit_code": 0, "schedule": ['09:00']}
+
+    def test_fail_exits(self, capsys):
+        """fail() reports the error in the document and exits with the code"""
+        out = CommandOutput('start', json_mode=True)
+        with pytest.raises(SystemExit) as exc_info:
+            out.fail("boom", EXIT_TIMEOUT)
+        assert exc_info.value.code == EXIT_TIMEOUT
+        document = json.loads(capsys.readouterr().out)
+        assert document["ok"] is False
+        assert document["error"] == "boom"
+
+
+class TestJsonCommands:
+    """Test --json for the CLI commands"""
+
+    def test_help(self, capsys):
+        """Help is a document too"""
+        assert run_cli('help', '--json') == 0
+        document = json.loads(capsys.readouterr().out)
+        assert document["command"] == "help"
+        assert any("Usage:" in line for line in document["usage"])
+
+    def test_unknown_command(self, capsys):
+        """Unknown commands fail with exit code 1"""
+        assert run_cli('--json', 'bogus') == 1
+        document = json.loads(capsys.readouterr().out)
+        assert document["error"] == "Unknown command 'bogus'"
+
+    def test_list(self, capsys):
+        """list reports the schedule and service state"""
+        with patch('platform.system', return_value='Darwin'), \
+             patch('src.launchagent.LaunchAgentManager') as MockManager:
+            agent = MockManager.return_value
+            agent.status_info.return_value = {"installed": True, "loaded": True, "pid": 12,
+                                              "last_exit_status": 0, "error": None}
+            agent.plist_path.exists.return_value = True
+            agent.get_schedule_times.return_value = ['09:00', '14:00']
+            assert run_cli('list', '--json') == 0
+        document = json.loads(capsys.readouterr().out)
+        assert document["schedule"] == ['09:00', '14:00']
+        assert document["service"]["pid"] == 12
+
+    @pytest.mark.parametrize("failure,code", [
+        (FAILURE_CLAUDE_MISSING, EXIT_CLAUDE_MISSING),
+        (FAILURE_AUTH, EXIT_AUTH_FAILURE),
+        (FAILURE_TIMEOUT, EXIT_TIMEOUT),
+        ('error', 1),
+    ])
+    def test_start_failure_codes(self, failure, code, capsys):
+        """Each failure class has its own exit code"""
+        with patch('src.simple_cli.SessionManager') as MockSessionManager, \
+             patch('src.simple_cli.setup_logger'):
+            session = MockSessionManager.return_value
+            session.start_session.return_value = False
+            session.last_failure = failure
+            assert run_cli('start', '--json') == code
+        document = json.loads(capsys.readouterr().out)
+        assert document["failure"] == failure
+        assert document["started"] is False
+
+    @pytest.mark.parametrize("installed,loaded,code", [
+        (False, False, EXIT_NOT_INSTALLED),
+        (True, False, EXIT_NOT_LOADED),
+        (True, True, 0),
+    ])
+    def test_status_exit_codes(self, installed, loaded, code, capsys, tmp_path):
+        """status distinguishes not installed from not loaded"""
+        with patch('platform.system', return_value='Darwin'), \
+             patch('src.launchagent.LaunchAgentManager') as MockManager, \
+             patch('pathlib.Path.home', return_value=tmp_path):
+            agent = MockManager.return_value
+            agent.status_info.return_value = {"installed": installed, "loaded": loaded, "pid": None,
+                                              "last_exit_status": None, "error": None}
+            agent.get_schedule_times.return_value = ['09:00'] if installed else []
+            assert run_cli('status', '--json') == code
+        document = json.loads(capsys.readouterr().out)
+        assert document["exit_code"] == code
+        assert document["session"] is None
+        assert (document["next_start"] is not None) == installed
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Tests for the page-cache prewarm"""
+
+import json
+import os
+import pytest
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.prewarm import PrewarmState, package_root, prewarm, prewarm_files
+from src.schedule import shift_entry
+
+
+@pytest.fixture
+def install(tmp_path):
+    """A fake npm install: bin/claude -> lib/node_modules/@anthropic-ai/claude-code/cli.js"""
+    package = tmp_path / "lib" / "node_modules" / "@anthropic-ai" / "claude-code"
+    (package / "vendor").mkdir(parents=True)
+    (package / "package.json").write_text(json.dumps({'name': '@anthropic-ai/claude-code'}))
+    (package / "cli.js").write_bytes(b"c" * 3000)
+    (package / "vendor" / "rg").write_bytes(b"r" * 5000)
+    (tmp_path / "bin").mkdir()
+    os.symlink(package / "cli.js", tmp_path / "bin" / "claude")
+    node = tmp_path / "bin" / "node"
+    node.write_bytes(b"n" * 2000)
+    return tmp_path
+
+
+class TestPrewarm:
+    """Test file discovery, the byte cap and the state file"""
+
+    def test_files_entry_and_node_first(self, install):
+        claude = str(install / "bin" / "claude")
+        package = install / "lib" / "node_modules" / "@anthropic-ai" / "claude-code"
+        assert package_root(claude) == package
+        files = list(prewarm_files(claude, str(install / "bin" / "node")))
+        assert files[:2] == [str(package / "cli.js"), str(install / "bin" / "node")]
+        assert sorted(files[2:]) == [str(package / "package.json"), str(package / "vendor" / "rg")]
+
+    def test_native_binary_ignores_stray_package_json(self, tmp_path):
+        """A native install prewarms only its binary, never the home directory"""
+        (tmp_path / "package.json").write_text(json.dumps({'name': 'my-project'}))
+        (tmp_path / "projects").mkdir()
+        (tmp_path / "projects" / "notes.txt").write_text("x")
+        versions = tmp_path / ".local" / "share" / "claude" / "versions"
+        versions.mkdir(parents=True)
+        binary = versions / "1.0.0"
+        binary.write_bytes(b"b" * 100)
+        assert package_root(str(binary)) is None
+        assert list(prewarm_files(str(binary), "/usr/bin/node")) == [str(binary)]
+
+    def test_search_stops_at_node_modules(self, tmp_path):
+        """A package.json above node_modules is never taken for claude's"""
+        (tmp_path / "package.json").write_text(json.dumps({'name': '@anthropic-ai/claude-code'}))
+        script = tmp_path / "node_modules" / "other" / "cli.js"
+        script.parent.mkdir(parents=True)
+        script.write_text("")
+        assert package_root(str(script)) is None
+
+    def test_caps_stop_the_walk(self, install):
+        """Files past the cap are never even listed"""
+        seen = []
+
+        def listed():
+            for path in prewarm_files(str(install / "bin" / "claude"), str(install / "bin" / "node")):
+                seen.append(path)
+                yield path
+
+        result = prewarm(listed(), max_bytes=10 ** 9, method="read", max_files=2)
+        assert result['files'] == 2
+        assert len(seen) == 2
+
+    @pytest.mark.parametrize("method", ["read", "fadvise"])
+    def test_byte_cap(self, install, method):
+        if method == "fadvise" and not hasattr(os, 'posix_fadvise'):
+            pytest.skip("posix_fadvise not available")
+        files = prewarm_files(str(install / "bin" / "claude"), str(install / "bin" / "node"))
+        result = prewarm(files, max_bytes=4000, method=method)
+        assert result['bytes'] == 4000
+        assert result['files'] == 2
+        assert result['method'] == method
+
+    def test_state(self, tmp_path):
+        state = PrewarmState(tmp_path / "prewarm.json")
+        assert state.minutes_since(120) is None
+        state.save({'files': 1, 'bytes': 10, 'seconds': 0.1, 'method': 'read'})
+        assert state.minutes_since(120) == 0
+        data = json.loads((tmp_path / "prewarm.json").read_text())
+        data['at'] = time.time() - 3 * 3600
+        (tmp_path / "prewarm.json").write_text(json.dumps(data))
+        assert state.minutes_since(120) is None
+
+    def test_shift_entry(self):
+        assert shift_entry("09:00", -10) == "08:50"
+        assert shift_entry("00:05", -10) == "23:55"
+        assert shift_entry("2025-01-07 00:05", -10) == "2025-01-06 23:55"
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Tests for the --profile option"""
+
+import pytest
+import sys
+import pstats
+from unittest.mock import patch
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.profiling import PROFILE_ENV, extract_profile_options
+from src.simple_cli import main
+
+
+class TestProfileOptions:
+    """Test option and environment parsing"""
+
+    def test_flags_are_stripped(self, monkeypatch):
+        """Global flags are removed wherever they appear"""
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+        assert extract_profile_options(['list']) == (['list'], None, False)
+        assert extract_profile_options(['--profile', 'status']) == (['status'], '', False)
+        assert extract_profile_options(['start', '--profile=/tmp/x.pstats', '--tracemalloc']) == \
+            (['start'], '/tmp/x.pstats', True)
+
+    def test_environment(self, monkeypatch):
+        """The environment variable enables profiling for launchd runs"""
+        monkeypatch.setenv(PROFILE_ENV, '1')
+        assert extract_profile_options(['start']) == (['start'], '', False)
+        monkeypatch.setenv(PROFILE_ENV, '/tmp/launchd.pstats')
+        assert extract_profile_options(['start'])[1] == '/tmp/launchd.pstats'
+
+
+class TestProfiledCommand:
+    """Test profiling a real command"""
+
+    def test_profile_help(self, tmp_path, capsys, monkeypatch):
+        """A .pstats file and a text summary are written"""
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+        output = tmp_path / "help.pstats"
+        with patch('sys.argv', ['claude-code-automation', f'--profile={output}', '--tracemalloc', 'help']):
+            main()
+
+        captured = capsys.readouterr()
+        assert "Usage:" in captured.out
+        assert str(output) in captured.err
+        pstats.Stats(str(output))
+        summary = (tmp_path / "help.txt").read_text()
+        assert "Wall time" in summary
+        assert "peak" in summary
+
+    def test_profile_written_on_exit(self, tmp_path, monkeypatch):
+        """Commands that exit non-zero are still profiled"""
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+        output = tmp_path / "bad.pstats"
+        with patch('sys.argv', ['claude-code-automation', f'--profile={output}', 'bogus']):
+            with pytest.raises(SystemExit):
+                main()
+        assert output.exists()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
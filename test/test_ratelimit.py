@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Tests for the persistent start rate limiter"""
+
+import pytest
+import sys
+import multiprocessing
+from unittest.mock import MagicMock, patch
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.ratelimit import TokenBucket
+from src.session import FAILURE_RATE_LIMITED, SessionManager
+
+
+def _take(path, results):
+    allowed, _ = TokenBucket(path, rate_per_hour=0.001, burst=5).acquire()
+    results.put(allowed)
+
+
+class TestTokenBucket:
+    """Test refill, burst and cross-process consistency"""
+
+    def test_burst_then_reject(self, tmp_path):
+        """A full bucket admits burst starts, then reports the wait"""
+        bucket = TokenBucket(tmp_path / "bucket.json", rate_per_hour=6, burst=3)
+        assert [bucket.acquire(now=1000)[0] for _ in range(3)] == [True, True, True]
+        allowed, wait = bucket.acquire(now=1000)
+        assert not allowed
+        assert wait == pytest.approx(600)
+
+    def test_refill(self, tmp_path):
+        """Tokens come back at the configured rate and are capped at burst"""
+        bucket = TokenBucket(tmp_path / "bucket.json", rate_per_hour=6, burst=2)
+        bucket.acquire(now=0)
+        bucket.acquire(now=0)
+        assert not bucket.acquire(now=300)[0]
+        assert bucket.acquire(now=900)[0]
+        assert bucket.acquire(now=100000)[0]
+        assert bucket.acquire(now=100000)[0]
+        assert not bucket.acquire(now=100000)[0]
+
+    def test_corrupt_state_starts_full(self, tmp_path):
+        """An unreadable state file does not lock starts out forever"""
+        (tmp_path / "bucket.json").write_text("garbage")
+        assert TokenBucket(tmp_path / "bucket.json", rate_per_hour=1, burst=1).acquire()[0]
+
+    def test_concurrent_processes(self, tmp_path):
+        """Concurrent invocations never take more than burst tokens"""
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_take, args=(tmp_path / "bucket.json", results))
+                   for _ in range(12)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert sum(results.get() for _ in workers) == 5
+
+
+class TestAllowStart:
+    """Test SessionManager's use of the limiter"""
+
+    def test_rejection_sets_failure(self, tmp_path):
+        """A rejected start records the failure class and wait"""
+        manager = SessionManager()
+        manager.config.config_dir = tmp_path
+        settings = {'start_rate_per_hour': 1, 'start_burst': 1}
+        with patch.object(manager.config, 'get_setting',
+                          side_effect=lambda key, default=None: settings.get(key, default)):
+            assert manager.allow_start()
+            assert not manager.allow_start()
+        assert manager.last_failure == FAILURE_RATE_LIMITED
+        assert manager.retry_after > 3000
+
+    def test_stray_deferred_fire_costs_no_token(self, capsys):
+        """'start --deferred' with nothing pending returns before the limiter"""
+        from src.simple_cli import handle_start
+        manager = MagicMock()
+        manager.deferred.load.return_value = None
+        with patch('src.simple_cli._get_session_manager', return_value=manager), \
+             patch('src.simple_cli.setup_logger'):
+            handle_start(['--deferred'])
+        manager.allow_start.assert_not_called()
+        manager.start_session.assert_not_called()
+        assert "No deferred start pending" in capsys.readouterr().out
+
+    def test_pending_deferral_costs_no_token(self, tmp_path):
+        """Starts skipped while a usage-limit deferral is pending leave the bucket alone"""
+        import time
+        from src.deferral import DeferredStart
+        from src.output import EXIT_USAGE_LIMIT
+        from src.simple_cli import handle_start
+        manager = SessionManager()
+        manager.config.config_dir = tmp_path
+        manager.deferred = DeferredStart(tmp_path / "deferred.json")
+        manager.deferred.save(time.time() + 600, 'usage_limit')
+        settings = {'start_rate_per_hour': 1, 'start_burst': 1}
+        with patch.object(manager.config, 'get_setting',
+                          side_effect=lambda key, default=None: settings.get(key, default)), \
+             patch('src.simple_cli._get_session_manager', return_value=manager), \
+             patch('src.simple_cli._get_scheduler', return_value=None), \
+             patch('src.simple_cli.setup_logger'), \
+             patch.object(manager, '_get_supervisor') as get_supervisor:
+            for _ in range(3):
+                with pytest.raises(SystemExit) as exit_info:
+                    handle_start([])
+                assert exit_info.value.code == EXIT_USAGE_LIMIT
+            get_supervisor.assert_not_called()
+            assert manager.allow_start()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
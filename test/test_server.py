@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Tests for the localhost HTTP status endpoint"""
+
+import pytest
+import sys
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.history import RunHistory
+from src.server import StatusServer, StatusState
+
+
+def _make_state(tmp_path):
+    config = SimpleNamespace(config_dir=tmp_path, session_dir=tmp_path / "session")
+    config.session_dir.mkdir()
+    agent = MagicMock()
+    agent.definition_path = tmp_path / "agent.plist"
+    agent.get_schedule_times.return_value = ["09:00", "14:00"]
+    agent.status.return_value = "✓ Service is loaded"
+    return StatusState(config=config, agent=agent), agent
+
+
+class TestStatusState:
+    """Test change-driven state refresh"""
+
+    def test_refresh_only_on_change(self, tmp_path):
+        """Files are re-read only when their stat changes"""
+        state, agent = _make_state(tmp_path)
+        assert state.refresh() is False
+
+        agent.definition_path.write_text("plist")
+        assert state.refresh() is True
+        assert agent.get_schedule_times.call_count == 2
+        assert state.refresh() is False
+
+    def test_history_and_metrics(self, tmp_path):
+        """History changes feed /history and /metrics"""
+        state, _ = _make_state(tmp_path)
+        history = RunHistory(tmp_path / "history.jsonl")
+        history.record(ok=True, duration=4.0, returncode=0, first_output=1.5, compile_cache='warm')
+        history.record(ok=False, duration=None, returncode=None)
+        state.refresh()
+
+        server = StatusServer(state)
+        status, _, body = server.route('/history?since=0')
+        assert status == 200 and len(json.loads(body)) == 2
+
+        _, ctype, body = server.route('/metrics')
+        assert ctype.startswith("text/plain")
+        assert b'cca_start_attempts{outcome="success"} 1' in body
+        assert b'cca_start_attempts{outcome="timeout"} 1' in body
+        assert b'cca_first_output_seconds{compile_cache="warm"} 1.5' in body
+
+        assert server.route('/history?since=abc')[0] == 400
+        assert server.route('/nope')[0] == 404
+
+    def test_rejects_non_loopback(self, tmp_path):
+        """Only loopback addresses may be bound"""
+        state, _ = _make_state(tmp_path)
+        with pytest.raises(ValueError):
+            StatusServer(state, host='0.0.0.0')
+
+
+class TestStatusServer:
+    """Test the HTTP handling over a real socket"""
+
+    def test_keep_alive_requests(self, tmp_path):
+        """Multiple requests are served over one connection"""
+        state, _ = _make_state(tmp_path)
+        server = StatusServer(state)
+
+        async def scenario():
+            srv = await asyncio.start_server(server._handle, '127.0.0.1', 0)
+            port = srv.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            bodies = []
+            for path in ('/status', '/next'):
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+                await writer.drain()
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int([l for l in head.split(b"\r\n") if l.startswith(b"Content-Length")][0].split(b":")[1])
+                bodies.append(json.loads(await reader.readexactly(length)))
+            writer.close()
+            srv.close()
+            await srv.wait_closed()
+            return bodies
+
+        status, nxt = asyncio.run(scenario())
+        assert status["schedule"] == ["09:00", "14:00"]
+        assert isinstance(nxt["next_fire"], float)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Tests for the schedule simulator"""
+
+import pytest
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.simulator import ScheduleSimulator, parse_range
+
+
+class TestScheduleSimulator:
+    """Test virtual-time schedule simulation"""
+
+    def test_parse_range(self):
+        """Ranges are parsed to seconds since midnight"""
+        assert parse_range("09:00-18:00") == (9 * 3600, 18 * 3600)
+        with pytest.raises(ValueError):
+            parse_range("0900")
+
+    def test_full_coverage(self):
+        """Two back-to-back windows cover a 9-18 working day"""
+        result = ScheduleSimulator(['09:00', '14:00'], days=7).run()
+
+        assert result['windows'] == 14
+        assert result['wasted_starts'] == 0
+        assert result['working_coverage'] == 1.0
+        assert result['windows_per_working_day'] == 2.0
+        assert result['quota_availability'] == pytest.approx(1.8)  # 09-14 fully, 14-19 for 4 of 5h
+
+    def test_overlapping_start_is_wasted(self):
+        """A start inside an open window does not open a new one"""
+        result = ScheduleSimulator(['09:00', '10:00'], days=1).run()
+
+        assert result['windows'] == 1
+        assert result['wasted_starts'] == 1
+
+    def test_sleep_defers_and_coalesces(self):
+        """Fires missed while asleep collapse into one start at wake"""
+        result = ScheduleSimulator(['02:00', '05:00', '12:00'], days=3,
+                                   sleep_windows=['01:00-08:00']).run()
+
+        assert result['deferred_by_sleep'] == 3
+        assert result['coalesced'] == 3
+        assert result['windows'] == 3
+        assert result['wasted_starts'] == 3  # 12:00 falls inside the 08-13 window
+
+    def test_failures_exhaust_retries(self):
+        """With certain failure every scheduled start fails after retries"""
+        result = ScheduleSimulator(['09:00'], days=10, failure_probability=1.0,
+                                   max_retries=3).run()
+
+        assert result['attempts'] == 30
+        assert result['failed_starts'] == 10
+        assert result['windows'] == 0
+
+    def test_dated_entries(self):
+        """Calendar-synced dated entries fire once, inside the simulated days only"""
+        result = ScheduleSimulator(['2025-01-06 09:00', '2025-01-07 14:00', '2025-03-01 09:00'],
+                                   days=7, start_date=date(2025, 1, 6)).run()
+
+        assert result['scheduled'] == 2
+        assert result['windows'] == 2
+
+    @pytest.mark.slow
+    def test_year_is_fast(self):
+        """A year of events simulates well under a second"""
+        started = time.perf_counter()
+        ScheduleSimulator(['06:00', '11:00', '16:00', '21:00'], days=365,
+                          failure_probability=0.1, sleep_windows=['00:30-07:30'], seed=1).run()
+        assert time.perf_counter() - started < 1.0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
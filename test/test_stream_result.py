@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Tests for structured result capture"""
+
+import json
+import pytest
+import sys
+import subprocess
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.session import FAILURE_AUTH, FAILURE_ERROR, SessionManager, parse_session_marker
+from src.stream_result import StreamResult
+from src.supervisor import ProcessSupervisor
+
+
+INIT = {"type": "system", "subtype": "init", "session_id": "abc-123", "model": "claude-sonnet"}
+SUCCESS = {"type": "result", "subtype": "success", "is_error": False, "duration_ms": 2100,
+           "duration_api_ms": 1800, "num_turns": 1, "result": "Hello!", "session_id": "abc-123",
+           "total_cost_usd": 0.0123, "usage": {"input_tokens": 4, "output_tokens": 9}}
+
+
+def stream(*events):
+    return "".join(json.dumps(event) + "\n" for event in events)
+
+
+class TestStreamResult:
+    """Test incremental parsing of stream-json events"""
+
+    def test_success(self):
+        """Session id, timings, cost and usage are picked up"""
+        result = StreamResult()
+        for line in ["not json\n"] + stream(INIT, {"type": "assistant"}, SUCCESS).splitlines(True):
+            result.feed(line)
+        assert result.complete and not result.is_error
+        assert result.text == "Hello!"
+        summary = result.summary()
+        assert summary["session_id"] == "abc-123"
+        assert summary["model"] == "claude-sonnet"
+        assert summary["cost_usd"] == 0.0123
+        assert summary["output_tokens"] == 9
+        assert "error_type" not in summary
+
+    def test_error_type(self):
+        """Failed runs report the result subtype"""
+        result = StreamResult()
+        result.feed(json.dumps({"type": "result", "subtype": "error_max_turns", "is_error": True}))
+        assert result.is_error
+        assert result.error_type == "error_max_turns"
+
+    def test_incomplete(self):
+        """Without a result event only the session id is known"""
+        result = StreamResult()
+        result.feed(json.dumps(INIT))
+        assert not result.complete
+        assert result.summary() == {"session_id": "abc-123"}
+
+
+class TestStreamingSupervisor:
+    """Test line callbacks in ProcessSupervisor.run"""
+
+    def test_lines_arrive_in_order(self):
+        """Every stdout line reaches the callback and the output is still returned"""
+        lines = []
+        returncode, stdout, stderr = ProcessSupervisor().run(
+            ['sh', '-c', 'echo one; echo two; echo err >&2'], timeout=5, on_line=lines.append,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        assert returncode == 0
+        assert lines == ["one\n", "two\n"]
+        assert stdout == "one\ntwo\n"
+        assert stderr == "err\n"
+
+    def test_timeout_keeps_partial_output(self):
+        """Output seen before a timeout is attached to the exception"""
+        lines = []
+        with pytest.raises(subprocess.TimeoutExpired) as exc_info:
+            ProcessSupervisor(grace_period=1).run(
+                ['sh', '-c', 'echo early; sleep 10'], timeout=0.5, on_line=lines.append,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            )
+        assert lines == ["early\n"]
+        assert exc_info.value.output == "early\n"
+
+
+class TestSessionResult:
+    """Test SessionManager's use of the structured result"""
+
+    def setup_method(self):
+        """Setup test environment"""
+        self.manager = SessionManager()
+
+    def _run(self, tmp_path, returncode, stdout, stderr=""):
+        self.manager.session_dir = tmp_path
+        supervisor = MagicMock()
+        supervisor.run.return_value = (returncode, stdout, stderr)
+        with patch.object(self.manager, '_check_claude_available', return_value=True), \
+             patch.object(self.manager, '_get_supervisor', return_value=supervisor), \
+             patch.object(self.manager.history, 'record') as record, \
+             patch('os.chdir'):
+            ok = self.manager._start_claude_session(10)
+        return ok, record.call_args.kwargs
+
+    def test_success_details_in_marker_and_history(self, tmp_path):
+        """Result details are recorded and appended to the marker"""
+        ok, recorded = self._run(tmp_path, 0, stream(INIT, SUCCESS))
+        assert ok
+        assert recorded["session_id"] == "abc-123"
+        assert recorded["cost_usd"] == 0.0123
+
+        fields = parse_session_marker((tmp_path / ".claude_session_marker").read_text())
+        assert "Session started at" in fields
+        assert fields["Session ID"] == "abc-123"
+        assert fields["Output tokens"] == "9"
+
+    def test_error_result_with_zero_exit(self, tmp_path):
+        """An error result fails the start even when claude exits 0"""
+        error = {"type": "result", "subtype": "error_during_execution", "is_error": True,
+                 "result": "something broke"}
+        ok, recorded = self._run(tmp_path, 0, stream(INIT, error))
+        assert not ok
+        assert self.manager.last_failure == FAILURE_ERROR
+        assert recorded["ok"] is False
+        assert recorded["error_type"] == "error_during_execution"
+
+    def test_auth_error_status(self, tmp_path):
+        """API 401 responses are classified as auth failures"""
+        error = {"type": "result", "subtype": "success", "is_error": True,
+                 "api_error_status": 401, "result": "Failed to authenticate"}
+        ok, _ = self._run(tmp_path, 1, stream(error))
+        assert not ok
+        assert self.manager.last_failure == FAILURE_AUTH
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
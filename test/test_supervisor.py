@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Tests for the process-group supervisor"""
+
+import pytest
+import sys
+import os
+import subprocess
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.supervisor import ProcessSupervisor
+
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="Requires POSIX process groups")
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+class TestProcessSupervisor:
+    """Test spawning, timeouts and reaping"""
+
+    def test_run_success(self):
+        """Output and return code are passed through"""
+        supervisor = ProcessSupervisor()
+        returncode, stdout, _ = supervisor.run(
+            ['sh', '-c', 'echo hello; exit 3'], timeout=5,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        assert returncode == 3
+        assert stdout.strip() == "hello"
+
+    def test_timeout_kills_whole_group(self, tmp_path):
+        """Grandchildren are terminated together with the leader"""
+        pid_file = tmp_path / "child.pid"
+        supervisor = ProcessSupervisor(grace_period=1)
+        script = f'sleep 30 & echo $! > {pid_file}; wait'
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            supervisor.run(['sh', '-c', script], timeout=0.5,
+                           stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+        child_pid = int(pid_file.read_text())
+        deadline = time.time() + 2
+        while _alive(child_pid) and time.time() < deadline:
+            time.sleep(0.05)
+        assert not _alive(child_pid)
+
+    def test_sigterm_ignored_escalates_to_sigkill(self):
+        """A leader that traps SIGTERM is still killed and reaped"""
+        supervisor = ProcessSupervisor(grace_period=0.3)
+        started = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired):
+            supervisor.run(['sh', '-c', 'trap "" TERM; sleep 30'], timeout=0.3,
+                           stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        assert time.monotonic() - started < 5
+
+    def test_rlimits_applied_without_preexec_fn(self):
+        """Limits reach the command through the exec shim, which keeps the pid"""
+        supervisor = ProcessSupervisor(rlimit_as_mb=2048, rlimit_cpu_seconds=60)
+        with patch('subprocess.Popen', wraps=subprocess.Popen) as popen:
+            process = supervisor.spawn(['sh', '-c', 'echo $$; ulimit -t; ulimit -v'],
+                                       stdout=subprocess.PIPE, text=True)
+            stdout, _ = process.communicate(timeout=10)
+        assert 'preexec_fn' not in popen.call_args.kwargs
+        assert process.returncode == 0
+        assert stdout.split() == [str(process.pid), '60', str(2048 * 1024)]
+
+
+class TestResourceUsage:
+    """Test rusage capture when streaming"""
+
+    def test_usage_of_reaped_child(self):
+        """CPU time and peak RSS of the child are kept after a streamed run"""
+        supervisor = ProcessSupervisor()
+        lines = []
+        returncode, stdout, _ = supervisor.run(
+            [sys.executable, '-c', 'x = bytearray(64 * 1024 * 1024); sum(range(3000000)); print("done")'],
+            timeout=30, on_line=lines.append,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        assert returncode == 0 and lines == ["done\n"]
+        usage = supervisor.last_usage
+        assert usage['user_cpu'] + usage['system_cpu'] > 0
+        assert usage['max_rss_mb'] >= 64
+        assert usage['voluntary_ctx'] >= 0 and usage['involuntary_ctx'] >= 0
+
+    def test_exit_status_through_reaper(self):
+        """Exit codes and signals come back as Popen would report them"""
+        supervisor = ProcessSupervisor()
+        returncode, _, _ = supervisor.run(['sh', '-c', 'exit 7'], timeout=5, on_line=lambda line: None,
+                                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        assert returncode == 7
+        returncode, _, _ = supervisor.run(['sh', '-c', 'kill -9 $$'], timeout=5, on_line=lambda line: None,
+                                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        assert returncode == -9
+
+    def test_usage_after_timeout(self):
+        """A killed child is reaped once and its usage still recorded"""
+        supervisor = ProcessSupervisor(grace_period=0.3)
+        with pytest.raises(subprocess.TimeoutExpired):
+            supervisor.run(['sh', '-c', 'sleep 30'], timeout=0.3, on_line=lambda line: None,
+                           stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        assert supervisor.last_usage is not None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Tests for the systemd user timer backend"""
+
+import pytest
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.scheduler import SchedulerBackend, get_scheduler
+from src.systemd import SystemdTimerManager
+
+
+class FakeSystemctl:
+    """Records systemctl calls and answers from a table"""
+
+    def __init__(self, responses=None):
+        self.calls = []
+        self.responses = responses or {}
+
+    def __call__(self, args):
+        self.calls.append(args[2:])
+        stdout, returncode = self.responses.get(args[2], ("", 0))
+        return subprocess.CompletedProcess(args, returncode, stdout=stdout, stderr="")
+
+    def verbs(self):
+        return [call[0] for call in self.calls]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    runner = FakeSystemctl()
+    manager = SystemdTimerManager(runner=runner, unit_dir=tmp_path)
+    with patch.object(manager, '_program_arguments', return_value=['/usr/bin/claude-code-automation']), \
+         patch.object(manager.config, 'get_setting', return_value=None):
+        yield manager
+
+
+class TestSystemdTimerManager:
+    """Test unit generation, incremental install and status parsing"""
+
+    def test_units(self, manager, tmp_path):
+        """Timer has one OnCalendar per time, 1s accuracy and persistence"""
+        assert manager.install(['09:00', '1430'])
+        timer = (tmp_path / "claude-code-automation.timer").read_text()
+        assert "OnCalendar=*-*-* 09:00:00\nOnCalendar=*-*-* 14:30:00\n" in timer
+        assert "AccuracySec=1s" in timer
+        assert "Persistent=true" in timer
+        service = (tmp_path / "claude-code-automation.service").read_text()
+        assert "ExecStart=/usr/bin/claude-code-automation start" in service
+        assert manager.get_schedule_times() == ['09:00', '14:30']
+
+    def test_dated_entries(self, manager, tmp_path):
+        """Calendar-derived entries become absolute OnCalendar dates"""
+        assert manager.install(['2025-01-07 09:00', '14:00'])
+        timer = (tmp_path / "claude-code-automation.timer").read_text()
+        assert "OnCalendar=2025-01-07 09:00:00\nOnCalendar=*-*-* 14:00:00\n" in timer
+        assert manager.get_schedule_times() == ['2025-01-07 09:00', '14:00']
+
+    def test_incremental_install(self, manager):
+        """Reinstalling the same schedule neither rewrites units nor reloads systemd"""
+        manager.install(['09:00'])
+        assert manager.runner.verbs() == ['daemon-reload', 'enable', 'restart']
+        manager.runner.calls.clear()
+
+        mtime = manager.timer_path.stat().st_mtime_ns
+        manager.install(['09:00'])
+        assert manager.runner.verbs() == ['is-active']
+        assert manager.timer_path.stat().st_mtime_ns == mtime
+
+        manager.runner.calls.clear()
+        manager.install(['10:00'])
+        assert manager.runner.verbs()[0] == 'daemon-reload'
+
+    def test_prewarm_timer(self, manager, tmp_path):
+        """A lead time adds a prewarm timer that is removed again when unset"""
+        with patch.object(manager.config, 'get_setting',
+                          side_effect=lambda key, default=None: 10 if key == 'prewarm_lead_minutes' else None):
+            assert manager.install(['09:00', '00:05'])
+        timer = (tmp_path / "claude-code-automation-prewarm.timer").read_text()
+        assert "OnCalendar=*-*-* 08:50:00\nOnCalendar=*-*-* 23:55:00\n" in timer
+        assert "prewarm" in (tmp_path / "claude-code-automation-prewarm.service").read_text()
+        assert ['restart', 'claude-code-automation-prewarm.timer'] in manager.runner.calls
+        assert manager.get_schedule_times() == ['09:00', '00:05']
+
+        assert manager.install(['09:00', '00:05'])
+        assert not (tmp_path / "claude-code-automation-prewarm.timer").exists()
+
+    def test_backend_factory(self):
+        """One factory picks the backend; the base class cannot be instantiated"""
+        with pytest.raises(TypeError):
+            SchedulerBackend()
+        with patch('platform.system', return_value='Linux'):
+            assert isinstance(get_scheduler(), SystemdTimerManager)
+        with patch('platform.system', return_value='Windows'):
+            assert get_scheduler() is None
+
+    def test_deferred_reload(self, manager):
+        """Inside a batch, several installs cost one reload at flush()"""
+        manager.defer_reload()
+        manager.install(['09:00'])
+        manager.install(['10:00'])
+        assert manager.runner.calls == []
+        assert manager.flush()
+        assert manager.runner.verbs() == ['daemon-reload', 'enable', 'restart']
+        manager.runner.calls.clear()
+        assert manager.flush()
+        assert manager.runner.calls == []
+
+    def test_uninstall(self, manager, tmp_path):
+        """Units are disabled and removed"""
+        manager.install(['09:00'])
+        assert manager.uninstall()
+        assert ['disable', '--now', 'claude-code-automation.timer'] in manager.runner.calls
+        assert list(tmp_path.iterdir()) == []
+
+    def test_status_info(self, manager):
+        """Timer and service properties map onto the status fields"""
+        manager.install(['09:00'])
+        manager.runner.responses = {'show': ("ActiveState=active\nMainPID=0\nExecMainStatus=0\n"
+                                             "ExecMainStartTimestamp=Mon 2025-01-06 09:00:00 UTC\n", 0)}
+        info = manager.status_info()
+        assert info['installed'] and info['loaded']
+        assert info['pid'] is None
+        assert info['last_exit_status'] == '0'
+        assert manager.describe_status(info).startswith("✗ Service is loaded but not running")
+
+    def test_status_error(self, manager):
+        """A failing systemctl is reported, not raised"""
+        manager.runner.responses = {'show': ("", 1)}
+        info = manager.status_info()
+        assert info['error']
+        assert manager.describe_status(info) == "✗ Unable to check service status"
+
+    def test_deferred_start(self, manager, tmp_path):
+        """The one-shot timer fires on an absolute date and is removed again"""
+        at = time.mktime((2030, 5, 17, 15, 1, 0, 0, 0, -1))
+        assert manager.install_deferred(at)
+        timer = (tmp_path / "claude-code-automation-deferred.timer").read_text()
+        assert "OnCalendar=2030-05-17 15:01:00" in timer
+        service = (tmp_path / "claude-code-automation-deferred.service").read_text()
+        assert "start --deferred" in service
+
+        manager.remove_deferred()
+        assert not (tmp_path / "claude-code-automation-deferred.timer").exists()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
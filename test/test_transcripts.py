@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Tests for automation transcript retention"""
+
+import pytest
+import sys
+import os
+import lzma
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.transcripts import TranscriptStore, project_dir_name
+
+
+DAY = 86400
+
+
+class TestTranscriptStore:
+    """Test retention policy application"""
+
+    def setup_method(self):
+        """Setup test environment"""
+        self.now = time.time()
+
+    def _make(self, directory, name, age_days, size=100):
+        path = directory / name
+        path.write_bytes(b'{"type":"user"}\n' * (size // 16 + 1))
+        mtime = self.now - age_days * DAY
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def _layout(self, tmp_path):
+        session_dir = tmp_path / "session"
+        session_dir.mkdir()
+        projects = tmp_path / "projects"
+        own = projects / project_dir_name(session_dir.resolve())
+        other = projects / project_dir_name(tmp_path / "real-project")
+        own.mkdir(parents=True)
+        other.mkdir(parents=True)
+        return session_dir, projects, own, other
+
+    def test_project_dir_name(self):
+        """Non-alphanumerics map to dashes like Claude Code does"""
+        assert project_dir_name(Path("/Users/me/.config/x")) == "-Users-me--config-x"
+
+    def test_compress_and_expire(self, tmp_path):
+        """Old transcripts are compressed, expired ones deleted"""
+        session_dir, projects, own, _ = self._layout(tmp_path)
+        fresh = self._make(own, "a.jsonl", 0)
+        old = self._make(own, "b.jsonl", 3)
+        expired = self._make(own, "c.jsonl", 40)
+
+        stats = TranscriptStore(session_dir, projects).collect()
+
+        assert fresh.exists()
+        assert not old.exists()
+        compressed = own / "b.jsonl.xz"
+        assert compressed.exists()
+        assert lzma.decompress(compressed.read_bytes()).startswith(b'{"type"')
+        assert not expired.exists()
+        assert stats["compressed"] == 1 and stats["deleted"] == 1 and stats["kept"] == 2
+
+    def test_count_cap_and_isolation(self, tmp_path):
+        """Count cap keeps the newest; other projects are never touched"""
+        session_dir, projects, own, other = self._layout(tmp_path)
+        for i in range(5):
+            self._make(own, f"{i}.jsonl", i * 0.1)
+        foreign = self._make(other, "mine.jsonl", 100)
+
+        TranscriptStore(session_dir, projects).collect({"max_count": 2})
+
+        assert sorted(p.name for p in own.iterdir()) == ["0.jsonl", "1.jsonl"]
+        assert foreign.exists()
+
+    def test_dry_run(self, tmp_path):
+        """Dry run reports without modifying anything"""
+        session_dir, projects, own, _ = self._layout(tmp_path)
+        expired = self._make(own, "c.jsonl", 40)
+
+        stats = TranscriptStore(session_dir, projects).collect(dry_run=True)
+
+        assert stats["deleted"] == 1
+        assert expired.exists()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
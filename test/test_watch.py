@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Tests for stat/inotify based change detection"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.watch import FileWatcher
+
+
+class TestFileWatcher:
+    """Test change detection with both backends"""
+
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_detects_change(self, tmp_path, use_inotify):
+        """A write to a watched file is reported, an idle wait times out"""
+        watched = tmp_path / "marker"
+        watched.write_text("a")
+        watcher = FileWatcher([watched, tmp_path / "missing"], poll_interval=0.05)
+        if not use_inotify:
+            watcher.close()
+        elif not watcher.uses_inotify:
+            pytest.skip("inotify not available")
+
+        timer = threading.Timer(0.1, lambda: watched.write_text("bb"))
+        timer.start()
+        assert watcher.wait(5) == {watched}
+        timer.join()
+        # The write may be seen mid-way (truncate, then data); let it settle
+        time.sleep(0.05)
+        watcher.changed()
+
+        started = time.monotonic()
+        assert watcher.wait(0.2) == set()
+        assert time.monotonic() - started >= 0.15
+        watcher.close()
+
+    def test_created_file_is_change(self, tmp_path):
+        """A file appearing counts as a change"""
+        watched = tmp_path / "plist"
+        watcher = FileWatcher([watched], poll_interval=0.05)
+        watched.write_text("x")
+        assert watcher.changed() == {watched}
+        assert watcher.changed() == set()
+        watcher.close()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Tests for the resident claude worker"""
+
+import json
+import os
+import pytest
+import sys
+import subprocess
+from unittest.mock import patch
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.session import SessionManager
+from src.worker import ClaudeWorker
+
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="Requires POSIX process groups")
+
+FAKE_CLAUDE = '''
+import json, os, sys, time
+count = 0
+for line in sys.stdin:
+    text = json.loads(line)["message"]["content"]
+    count += 1
+    if text == "die":
+        sys.exit(3)
+    if text == "hang":
+        time.sleep(60)
+    print(json.dumps({"type": "assistant", "n": count}), flush=True)
+    print(json.dumps({"type": "result", "subtype": "success", "is_error": False,
+                      "result": f"{os.getpid()}:{count}", "session_id": "s1"}), flush=True)
+'''
+
+
+def result_of(stdout):
+    return json.loads(stdout.splitlines()[-1])["result"].split(":")
+
+
+@pytest.fixture
+def worker_args(tmp_path):
+    script = tmp_path / "fake_claude.py"
+    script.write_text(FAKE_CLAUDE)
+    return [sys.executable, str(script)]
+
+
+class TestClaudeWorker:
+    """Test message exchange, respawn and recycling"""
+
+    def test_process_is_reused(self, worker_args):
+        """Consecutive messages go to the same process"""
+        worker = ClaudeWorker(worker_args, grace_period=1)
+        lines = []
+        try:
+            rc, stdout, _ = worker.send("hi", timeout=10, on_line=lines.append)
+            assert rc == 0 and len(lines) == 2
+            pid, count = result_of(stdout)
+            rc, stdout, _ = worker.send("again", timeout=10)
+            assert result_of(stdout) == [pid, "2"]
+            assert worker.spawns == 1
+        finally:
+            worker.stop()
+
+    def test_dead_worker_is_respawned(self, worker_args):
+        """A worker that dies mid-message reports its exit code and is replaced"""
+        worker = ClaudeWorker(worker_args, grace_period=1)
+        try:
+            rc, _, _ = worker.send("die", timeout=10)
+            assert rc == 3
+            rc, stdout, _ = worker.send("hi", timeout=10)
+            assert rc == 0 and result_of(stdout)[1] == "1"
+            assert worker.spawns == 2
+        finally:
+            worker.stop()
+
+    def test_wedged_worker_is_killed(self, worker_args):
+        """Missing the reply deadline kills the worker and raises TimeoutExpired"""
+        worker = ClaudeWorker(worker_args, grace_period=0.5)
+        try:
+            with pytest.raises(subprocess.TimeoutExpired):
+                worker.send("hang", timeout=0.5)
+            assert worker.process is None
+            assert worker.send("hi", timeout=10)[0] == 0
+        finally:
+            worker.stop()
+
+    def test_recycle_after_max_messages(self, worker_args):
+        """The worker is replaced once it has handled max_messages"""
+        worker = ClaudeWorker(worker_args, max_messages=2, grace_period=1)
+        try:
+            pids = [result_of(worker.send("hi", timeout=10)[1])[0] for _ in range(3)]
+            assert pids[0] == pids[1] != pids[2]
+        finally:
+            worker.stop()
+
+
+class TestSessionWorker:
+    """Test SessionManager in worker mode"""
+
+    def test_start_through_worker(self, worker_args, tmp_path):
+        """Starts use the resident worker and record its result"""
+        manager = SessionManager()
+        manager.use_worker = True
+        manager.session_dir = tmp_path
+        manager._worker = ClaudeWorker(worker_args, grace_period=1)
+        try:
+            with patch.object(manager, '_check_claude_available', return_value=True), \
+                 patch.object(manager, '_prepare_compile_cache', return_value=(None, 'off')), \
+                 patch.object(manager, 'create_session_marker'), \
+                 patch.object(manager.history, 'record') as record, \
+                 patch('os.chdir'):
+                assert manager._start_claude_session(10)
+                assert manager._start_claude_session(10)
+            assert record.call_args.kwargs['session_id'] == "s1"
+            assert manager._worker.spawns == 1
+        finally:
+            manager.close_worker()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])